@@ -0,0 +1,250 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config.logger import create_logger
+from app.config.pools import pool_settings
+
+logger = create_logger(__name__)
+
+# Requests holding a Postgres connection at once; beyond the pool size they would only queue on checkout
+ADMISSION_MAX_IN_FLIGHT = int(
+    os.getenv("ADMISSION_MAX_IN_FLIGHT", str(pool_settings.postgres_pool_size + pool_settings.postgres_max_overflow))
+)
+
+# Share of that capacity only priority lanes (auth) may use, so they get through while heavy routes are saturated
+ADMISSION_PRIORITY_RESERVE = float(os.getenv("ADMISSION_PRIORITY_RESERVE", "0.2"))
+
+# Recent hold times kept per lane, for Retry-After estimates and stats
+HOLD_SAMPLES = 256
+
+
+class Overloaded(Exception):
+    def __init__(self, status_code: int, retry_after: int, message: str):
+        super().__init__(message)
+        self.status_code: int = status_code
+        self.retry_after: int = retry_after
+
+
+@dataclass
+class Lane:
+    """Concurrency limit and queue budget of one class of routes."""
+    name: str
+    limit: int
+    max_queue: int
+    queue_timeout: float
+    priority: bool = False
+    # Counts toward ADMISSION_MAX_IN_FLIGHT (holds a database session)
+    pooled: bool = True
+
+    in_flight: int = 0
+    waiters: deque[asyncio.Future[None]] = field(default_factory=deque)
+    admitted: int = 0
+    rejected_queue_full: int = 0
+    rejected_timeout: int = 0
+    holds: deque[float] = field(default_factory=lambda: deque(maxlen=HOLD_SAMPLES))
+
+    def retry_after(self) -> int:
+        """Whole seconds until a slot is likely free: the typical hold time."""
+        if not self.holds:
+            return 1
+        return max(1, math.ceil(sorted(self.holds)[len(self.holds) // 2]))
+
+
+def _lane(name: str, limit: int, max_queue: int, queue_timeout: float, **kwargs: Any) -> Lane:
+    """Lane whose limits can be overridden with ADMISSION_<NAME>_CONCURRENCY, _QUEUE and _QUEUE_TIMEOUT."""
+    prefix = f"ADMISSION_{name.upper()}"
+    return Lane(
+        name=name,
+        limit=int(os.getenv(f"{prefix}_CONCURRENCY", str(limit))),
+        max_queue=int(os.getenv(f"{prefix}_QUEUE", str(max_queue))),
+        queue_timeout=float(os.getenv(f"{prefix}_QUEUE_TIMEOUT", str(queue_timeout))),
+        **kwargs,
+    )
+
+
+def default_lanes() -> dict[str, Lane]:
+    lanes = [
+        _lane("auth", limit=16, max_queue=64, queue_timeout=5.0, priority=True),
+        # A chat stream holds its session until the answer is complete
+        _lane("chat", limit=6, max_queue=12, queue_timeout=2.0),
+        # Search-as-you-type results are stale after a moment, so they do not wait long
+        _lane("search", limit=12, max_queue=24, queue_timeout=0.5),
+        # Status streams hold no session and cost next to nothing while idle; the cap only guards
+        # against runaway clients, far above the thousands of dashboards a process should hold
+        _lane("stream", limit=10000, max_queue=0, queue_timeout=0.0, pooled=False),
+        _lane("default", limit=8, max_queue=32, queue_timeout=1.0),
+    ]
+    return {lane.name: lane for lane in lanes}
+
+
+def route_lane(method: str, path: str) -> str | None:
+    """Lane of a request; None for health checks, metrics and preflights, which are never limited."""
+    if method == "OPTIONS" or path in ("/", "/metrics") or path.startswith("/health"):
+        return None
+    if path.startswith("/auth/"):
+        return "auth"
+    if method == "POST" and path == "/rms/chat":
+        return "chat"
+    if path.startswith(("/rms/suggest", "/rms/search")):
+        return "search"
+    if path == "/rms/status/stream":
+        return "stream"
+    return "default"
+
+
+class AdmissionController:
+    """
+    Per-lane bulkheads in front of the route handlers.
+
+    A request enters its lane while the lane is under its concurrency
+    limit and, for lanes that use the database, while fewer than
+    `max_in_flight` requests hold a session. Non-priority lanes stop at
+    `1 - priority_reserve` of that, keeping connections free for auth.
+    Otherwise the request waits in the lane's FIFO queue for at most
+    `queue_timeout` seconds. A full queue is rejected at once with 429,
+    an expired budget with 503; both carry `Retry-After`. Freed slots
+    go to priority lanes first.
+    """
+
+    def __init__(
+        self,
+        lanes: dict[str, Lane] | None = None,
+        max_in_flight: int = ADMISSION_MAX_IN_FLIGHT,
+        priority_reserve: float = ADMISSION_PRIORITY_RESERVE,
+    ):
+        self.lanes: dict[str, Lane] = lanes or default_lanes()
+        self.max_in_flight: int = max(max_in_flight, 1)
+        self.shared_limit: int = max(1, math.floor(self.max_in_flight * (1 - priority_reserve)))
+        self.pooled_in_flight: int = 0
+        # Lanes in the order freed slots are offered
+        self._wake_order: list[Lane] = sorted(self.lanes.values(), key=lambda lane: not lane.priority)
+
+    def _can_enter(self, lane: Lane) -> bool:
+        if lane.in_flight >= lane.limit:
+            return False
+        if not lane.pooled:
+            return True
+        return self.pooled_in_flight < (self.max_in_flight if lane.priority else self.shared_limit)
+
+    def _enter(self, lane: Lane) -> None:
+        lane.in_flight += 1
+        lane.admitted += 1
+        if lane.pooled:
+            self.pooled_in_flight += 1
+
+    async def acquire(self, lane: Lane) -> float:
+        """Take a slot in `lane`, returning the seconds spent queued, or raise `Overloaded`."""
+        if not lane.waiters and self._can_enter(lane):
+            self._enter(lane)
+            return 0.0
+        if len(lane.waiters) >= lane.max_queue:
+            lane.rejected_queue_full += 1
+            raise Overloaded(429, lane.retry_after(), f"Too many {lane.name} requests, please retry later.")
+
+        queued_at = time.monotonic()
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        lane.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=lane.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait ended
+                if isinstance(e, asyncio.TimeoutError):
+                    return time.monotonic() - queued_at
+                self.release(lane, 0.0)
+            else:
+                _ = waiter.cancel()
+                lane.waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            lane.rejected_timeout += 1
+            raise Overloaded(503, lane.retry_after(), f"Server busy with {lane.name} requests, please retry later.")
+        return time.monotonic() - queued_at
+
+    def release(self, lane: Lane, held: float) -> None:
+        lane.in_flight -= 1
+        if lane.pooled:
+            self.pooled_in_flight -= 1
+        lane.holds.append(held)
+        self._hand_over()
+
+    def _hand_over(self) -> None:
+        """Give free slots to queued requests, priority lanes first. The slot is taken on their behalf."""
+        for lane in self._wake_order:
+            while lane.waiters and self._can_enter(lane):
+                waiter = lane.waiters.popleft()
+                if waiter.done():
+                    continue
+                self._enter(lane)
+                waiter.set_result(None)
+
+    def stats(self) -> dict[str, Any]:
+        """In-flight requests, queue depth and rejections per lane."""
+        return {
+            "pooled_in_flight": self.pooled_in_flight,
+            "max_in_flight": self.max_in_flight,
+            "shared_limit": self.shared_limit,
+            "lanes": {
+                lane.name: {
+                    "in_flight": lane.in_flight,
+                    "limit": lane.limit,
+                    "queue_depth": len(lane.waiters),
+                    "max_queue": lane.max_queue,
+                    "queue_timeout": lane.queue_timeout,
+                    "admitted": lane.admitted,
+                    "rejected_queue_full": lane.rejected_queue_full,
+                    "rejected_timeout": lane.rejected_timeout,
+                    "retry_after": lane.retry_after(),
+                }
+                for lane in self.lanes.values()
+            },
+        }
+
+
+admission_controller = AdmissionController()
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying `admission_controller`; a slot is held until the response (or stream) ends."""
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController | None = None):
+        self.app: ASGIApp = app
+        self.controller: AdmissionController = controller or admission_controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = route_lane(scope["method"], scope["path"])
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        lane = self.controller.lanes[name]
+        try:
+            waited = await self.controller.acquire(lane)
+        except Overloaded as e:
+            logger.warning("Shed %s %s with %d (%s lane saturated)", scope["method"], scope["path"], e.status_code, lane.name)
+            response = JSONResponse(
+                status_code=e.status_code,
+                content={"code": e.status_code, "success": False, "message": str(e), "response": None},
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        if waited > 0.5:
+            logger.info("%s %s queued %.2fs in the %s lane", scope["method"], scope["path"], waited, lane.name)
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(lane, time.monotonic() - started)
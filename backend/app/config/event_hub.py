@@ -0,0 +1,239 @@
+import asyncio
+import json
+import os
+from collections.abc import AsyncIterator, Callable, Mapping, Sequence
+from contextlib import asynccontextmanager
+from typing import Any
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.logger import create_logger
+from app.utils.db_utils import db_url
+
+logger = create_logger(__name__)
+
+# Postgres channel carrying file status transitions from every process
+STATUS_CHANNEL = "rms_status"
+
+# Postgres channel carrying invalidations of per-process caches (see `EventHub.on`)
+CACHE_CHANNEL = "rms_cache"
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+# Events buffered per subscriber; a subscriber that falls further behind is told to resync
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("STATUS_SUBSCRIBER_QUEUE_SIZE", "256"))
+
+RECONNECT_DELAY_MAX = 30.0
+
+
+def _payloads(events: Sequence[Mapping[str, Any]]) -> list[str]:
+    """JSON arrays of events, each under the NOTIFY size limit."""
+    payloads: list[str] = []
+    batch: list[str] = []
+    size = 2
+    for event in events:
+        encoded = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+        if len(encoded.encode()) + 2 > NOTIFY_PAYLOAD_LIMIT:
+            logger.warning("Dropping oversized event for %s", event.get("id"))
+            continue
+        if batch and size + len(encoded.encode()) + 1 > NOTIFY_PAYLOAD_LIMIT:
+            payloads.append(f"[{','.join(batch)}]")
+            batch, size = [], 2
+        batch.append(encoded)
+        size += len(encoded.encode()) + 1
+    if batch:
+        payloads.append(f"[{','.join(batch)}]")
+    return payloads
+
+
+async def publish(session: AsyncSession, events: Sequence[Mapping[str, Any]]) -> None:
+    """
+    Send status events to every process's event hub.
+
+    NOTIFY is transactional: the events go out when the session commits,
+    and not at all if it rolls back. Each event needs a `workspace`.
+    """
+    for payload in _payloads(events):
+        _ = await session.execute(select(func.pg_notify(STATUS_CHANNEL, payload)))
+
+
+class Subscription:
+    """Bounded event buffer of one stream."""
+
+    def __init__(self, workspace: str, size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.workspace: str = workspace
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=size)
+        self.overflowed: bool = False
+
+    def push(self, event: dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Dropping events silently would leave stale statuses on screen
+            self.overflowed = True
+
+    def drain(self) -> list[dict[str, Any]]:
+        """Everything buffered right now, without waiting."""
+        events: list[dict[str, Any]] = []
+        while not self.queue.empty():
+            events.append(self.queue.get_nowait())
+        return events
+
+
+class EventHub:
+    """
+    Fans Postgres notifications out to in-process subscribers.
+
+    The process holds a single LISTEN connection, opened on the first
+    subscription, however many streams are open. Each notification is
+    parsed once and pushed onto the bounded queues of that workspace's
+    subscribers. An idle stream is one waiting coroutine and an empty
+    queue. If the connection drops it is re-established with backoff;
+    subscribers are told to resync since events may have been missed.
+
+    Other channels get a handler each (`on`), called with every event;
+    the same connection sends them with `broadcast`.
+    """
+
+    def __init__(self, channel: str = STATUS_CHANNEL):
+        self.channel: str = channel
+        self.subscribers: dict[str, set[Subscription]] = {}
+        # channel -> [(called with each event, called when events may have been missed)]
+        self.handlers: dict[str, list[tuple[Callable[[dict[str, Any]], None], Callable[[], None]]]] = {}
+        self._listener: asyncio.Task[None] | None = None
+        self._connection: asyncpg.Connection | None = None
+        # One connection cannot run two statements at once
+        self._send_lock: asyncio.Lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self.subscribers.values())
+
+    @asynccontextmanager
+    async def subscribe(self, workspace: str) -> AsyncIterator[Subscription]:
+        subscription = Subscription(workspace)
+        self.subscribers.setdefault(workspace, set()).add(subscription)
+        self.start()
+        try:
+            yield subscription
+        finally:
+            subscriptions = self.subscribers.get(workspace)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscribers[workspace]
+
+    def on(self, channel: str, handler: Callable[[dict[str, Any]], None], resync: Callable[[], None]) -> None:
+        """
+        Call `handler` with each event broadcast on `channel` by any process,
+        this one included, and `resync` whenever events may have been missed.
+        Handlers run on the event loop and must not block.
+        """
+        first_on_channel = channel not in self.handlers
+        self.handlers.setdefault(channel, []).append((handler, resync))
+        connection = self._connection
+        if first_on_channel and connection is not None and not connection.is_closed():
+            _ = asyncio.create_task(connection.add_listener(channel, self._on_notification))
+
+    def start(self) -> None:
+        """Open the LISTEN connection in the background unless it is open already."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def broadcast(self, channel: str, events: Sequence[Mapping[str, Any]]) -> bool:
+        """
+        Send events to every process right away, outside any transaction.
+
+        Returns False if the hub is not connected; the caller's own
+        process has to be updated directly either way.
+        """
+        connection = self._connection
+        if connection is None or connection.is_closed():
+            logger.warning("Event hub not connected, %d events on %s not broadcast", len(events), channel)
+            return False
+        try:
+            async with self._send_lock:
+                for payload in _payloads(events):
+                    _ = await connection.execute("SELECT pg_notify($1, $2)", channel, payload)
+        except Exception as _:
+            logger.warning("Failed to broadcast %d events on %s", len(events), channel, exc_info=True)
+            return False
+        return True
+
+    def _on_notification(self, _connection: asyncpg.Connection, _pid: int, channel: str, payload: str) -> None:
+        self.dispatch(payload, channel)
+
+    def dispatch(self, payload: str, channel: str | None = None) -> None:
+        channel = channel or self.channel
+        try:
+            events = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed notification on %s", channel)
+            return
+        events = events if isinstance(events, list) else [events]
+        if channel != self.channel:
+            for event in events:
+                for handler, _ in self.handlers.get(channel, ()):
+                    try:
+                        handler(event)
+                    except Exception as _:
+                        logger.warning("Handler for %s failed", channel, exc_info=True)
+            return
+        for event in events:
+            for subscription in self.subscribers.get(event.get("workspace"), ()):
+                subscription.push(event)
+
+    def _resync_all(self, streams: bool = True) -> None:
+        if streams:
+            for subscriptions in self.subscribers.values():
+                for subscription in subscriptions:
+                    subscription.overflowed = True
+        for handlers in self.handlers.values():
+            for _, resync in handlers:
+                resync()
+
+    async def _listen(self) -> None:
+        delay = 1.0
+        first = True
+        while True:
+            connection: asyncpg.Connection | None = None
+            try:
+                # LISTEN holds its connection for good, so it does not come from the pool
+                connection = await asyncpg.connect(db_url().replace("postgresql+asyncpg://", "postgresql://"))
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                for channel in (self.channel, *self.handlers):
+                    await connection.add_listener(channel, self._on_notification)
+                self._connection = connection
+                logger.info(f"Listening for events on {', '.join((self.channel, *self.handlers))}")
+                # Handlers may have cached state before the first connection; streams only miss events after a drop
+                self._resync_all(streams=not first)
+                first = False
+                delay = 1.0
+                await closed.wait()
+                logger.warning("Event hub connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as _:
+                logger.warning(f"Event hub listener failed, retrying in {delay:.0f}s", exc_info=True)
+                self._resync_all()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_DELAY_MAX)
+            finally:
+                self._connection = None
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            _ = self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+event_hub = EventHub()
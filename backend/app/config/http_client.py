@@ -1,32 +1,70 @@
+import time
 from contextlib import asynccontextmanager
-from enum import Enum
+from typing import Any
 
 import httpx
 
+from app.config.pools import pool_settings, pools
 
-class HttpConfig(Enum):
-    NUM_CONN_POOL = 200
-    EXPIRE_CONN_POOL = 60
 
-    TIMEOUT_TOTAL = 180.0
-    TIMEOUT_CONNECT = 20.0
+class ObservedTransport(httpx.AsyncHTTPTransport):
+    """
+    Transport reporting its pool in `pools["http"]`.
+
+    httpcore emits its first trace event (connecting, or sending headers
+    on a kept-alive connection) once the pool has handed out a
+    connection, so the time until then is the checkout wait.
+    """
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        pool = self._pool
+        pools["http"].bind(
+            lambda: (
+                sum(1 for connection in pool.connections if not connection.is_idle() and not connection.is_closed()),
+                sum(1 for connection in pool.connections if connection.is_idle()),
+            )
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        observed = False
+        previous_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal observed
+            if not observed:
+                observed = True
+                pools["http"].observe_wait(time.perf_counter() - started)
+            if previous_trace is not None:
+                await previous_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        try:
+            return await super().handle_async_request(request)
+        except httpx.PoolTimeout:
+            pools["http"].observe_timeout()
+            raise
 
 
 @asynccontextmanager
 async def create_httpx_client():
+    limits = httpx.Limits(
+        max_connections=pool_settings.http_pool_size,  # default 100
+        max_keepalive_connections=pool_settings.http_pool_size,  # default 20
+        keepalive_expiry=pool_settings.http_keepalive_expiry,  # default 5
+    )
     http_client = httpx.AsyncClient(
         timeout=httpx.Timeout(
-            timeout=HttpConfig.TIMEOUT_TOTAL.value,
-            connect=HttpConfig.TIMEOUT_CONNECT.value,
-        ),
-        limits=httpx.Limits(
-            max_connections=HttpConfig.NUM_CONN_POOL.value,  # default 100
-            max_keepalive_connections=HttpConfig.NUM_CONN_POOL.value,  # default 20
-            keepalive_expiry=HttpConfig.EXPIRE_CONN_POOL.value,  # default 5
+            timeout=pool_settings.http_timeout,
+            connect=pool_settings.http_connect_timeout,
+            pool=pool_settings.http_pool_timeout,
         ),
+        limits=limits,
+        transport=ObservedTransport(limits=limits),
     )
 
     try:
         yield http_client
     finally:
-        await http_client.aclose()
\ No newline at end of file
+        await http_client.aclose()
@@ -3,28 +3,38 @@ import os
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import cast
+from typing import TYPE_CHECKING, cast
 import httpx
+from app.config.event_hub import event_hub
 from app.config.http_client import create_httpx_client
 from app.config.logger import create_logger
 from app.config.postgres_manager import PostgresManager
-from app.config.opensearch_manager import OpenSearchManager
+from app.config.readiness import readiness
+from app.config.search_backend import SearchBackend, create_search_backend
 from app.config.update_app_status import update_app_status
 from fastapi import FastAPI, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from opensearchpy import AsyncOpenSearch
-import openai
+
+# Imported when used: opensearchpy only with the OpenSearch backend, openai only with an API key
+if TYPE_CHECKING:
+    import openai
+    from opensearchpy import AsyncOpenSearch
 
 logger = create_logger(__name__)
 
+# Run the job worker inside the API process; only for single-process development.
+# Jobs are otherwise run by `python -m app.worker`, off the API event loop
+JOB_WORKER_IN_API = os.getenv("JOB_WORKER_IN_API", "false").lower() == "true"
+
 
 @dataclass
 class Context:
     """Context available to request handlers."""
     http_client: httpx.AsyncClient
     db_session: AsyncSession
-    os_client: AsyncOpenSearch
-    openai_client: openai.AsyncOpenAI | None
+    os_client: "AsyncOpenSearch | None"
+    search_backend: SearchBackend
+    openai_client: "openai.AsyncOpenAI | None"
 
 
 @dataclass
@@ -32,48 +42,68 @@ class InternalContext:
     """Internal context stored in app state."""
     http_client: httpx.AsyncClient
     db_manager: PostgresManager
-    os_manager: OpenSearchManager
-    openai_client: openai.AsyncOpenAI | None
+    os_manager: SearchBackend
+    openai_client: "openai.AsyncOpenAI | None"
 
 
-async def get_ctx_from_request(request: Request) -> AsyncGenerator[Context, None]:
-    """Get context for request handlers with both database session and OpenSearch client."""
-    internal_ctx = cast(InternalContext, request.state.context)
-    
+async def open_context(internal_ctx: InternalContext) -> AsyncGenerator[Context, None]:
+    """Context with its own database session, for request handlers and background jobs."""
     # Get database session
     async for session in internal_ctx.db_manager.get_session():
-        # Get OpenSearch client
-        async for os_client in internal_ctx.os_manager.get_client():
-            ctx = Context(
+        # Only OpenSearchManager hands out clients
+        get_client = getattr(internal_ctx.os_manager, "get_client", None)
+        if get_client is not None:
+            # Get OpenSearch client
+            async for os_client in get_client():
+                yield Context(
+                    http_client=internal_ctx.http_client,
+                    db_session=session,
+                    os_client=os_client,
+                    search_backend=internal_ctx.os_manager,
+                    openai_client=internal_ctx.openai_client
+                )
+        else:
+            # In-process backend has no client to hand out
+            yield Context(
                 http_client=internal_ctx.http_client,
                 db_session=session,
-                os_client=os_client,
+                os_client=None,
+                search_backend=internal_ctx.os_manager,
                 openai_client=internal_ctx.openai_client
             )
-            yield ctx
+
+
+async def get_ctx_from_request(request: Request) -> AsyncGenerator[Context, None]:
+    """Get context for request handlers with both database session and OpenSearch client."""
+    internal_ctx = cast(InternalContext, request.state.context)
+    async for ctx in open_context(internal_ctx):
+        yield ctx
 
 @asynccontextmanager
-async def lifespan(
-    app: FastAPI | None,  # pyright: ignore[reportUnusedParameter]
-):
+async def app_resources() -> AsyncGenerator[InternalContext, None]:
     """
-    A lifespan handler for dealing with code that needs to run 
-    before the application starts up or when the application is shutting down.
+    Open the shared Postgres, search backend, httpx and OpenAI resources.
+
+    Used by the API lifespan and by the standalone worker (`python -m app.worker`),
+    so both processes are configured identically.
     """
     status_task = None
     db_manager = None
     os_manager = None
     
     try:
-        status_task = asyncio.create_task(update_app_status())
+        status_task = asyncio.create_task(update_app_status(readiness))
         logger.info("Setting application context...")
         
         # Initialize PostgreSQL
         db_manager = PostgresManager()
         await db_manager.initialize()
+
+        # Cache invalidations from other processes arrive through the event hub
+        event_hub.start()
         
-        # Initialize OpenSearch
-        os_manager = OpenSearchManager()
+        # Initialize search backend (OpenSearch unless SEARCH_BACKEND=local)
+        os_manager = create_search_backend()
         await os_manager.initialize()
         
         async with create_httpx_client() as http_client:
@@ -81,22 +111,28 @@ async def lifespan(
             openai_client = None
             api_key = os.getenv("OPENAI_API_KEY")
             if api_key:
+                import openai
+
                 openai_client = openai.AsyncOpenAI(
                     api_key=api_key,
                     http_client=http_client
                 )
             
-            ctx = InternalContext(
-                http_client=http_client,
-                db_manager=db_manager,
-                os_manager=os_manager,
-                openai_client=openai_client,
-            )
-            
-            yield {"context": ctx}
+            readiness.attach({"postgres": db_manager.ping, "search": os_manager.ping})
+            try:
+                yield InternalContext(
+                    http_client=http_client,
+                    db_manager=db_manager,
+                    os_manager=os_manager,
+                    openai_client=openai_client,
+                )
+            finally:
+                readiness.detach()
             
     finally:
-        # Cleanup OpenSearch
+        await event_hub.close()
+
+        # Cleanup search backend
         if os_manager:
             await os_manager.close()
         
@@ -110,4 +146,28 @@ async def lifespan(
             try:
                 await status_task
             except asyncio.CancelledError:
-                pass
\ No newline at end of file
+                pass
+
+
+@asynccontextmanager
+async def lifespan(
+    app: FastAPI | None,  # pyright: ignore[reportUnusedParameter]
+):
+    """
+    A lifespan handler for dealing with code that needs to run 
+    before the application starts up or when the application is shutting down.
+    """
+    async with app_resources() as ctx:
+        job_worker_stop = asyncio.Event()
+        job_worker_task = None
+        if JOB_WORKER_IN_API:
+            # Imported here, the job handlers depend on this module
+            from app.services.job_worker import JobWorker
+            job_worker_task = asyncio.create_task(JobWorker(ctx).run(job_worker_stop))
+
+        try:
+            yield {"context": ctx}
+        finally:
+            if job_worker_task is not None:
+                job_worker_stop.set()
+                await job_worker_task
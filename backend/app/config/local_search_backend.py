@@ -0,0 +1,757 @@
+import asyncio
+import bisect
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import uuid
+from collections import Counter
+from collections.abc import AsyncIterator, Mapping, Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+from app.config.logger import create_logger
+from app.config.search_backend import (
+    DEFAULT_EMBEDDING_DIMENSION,
+    DEFAULT_NUMBER_OF_SHARDS,
+    IndexNotFoundError,
+    SearchBackend,
+    SearchHit,
+)
+
+logger = create_logger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+INITIAL_CAPACITY = 1024
+
+
+Filters = Mapping[str, Any]
+
+
+def _tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _filters_from_query(query: Mapping[str, Any] | None) -> dict[str, Any]:
+    """Convert the term/terms/bool.filter subset of the query DSL used by alias filters."""
+    if not query:
+        return {}
+    if "term" in query:
+        field, value = next(iter(query["term"].items()))
+        return {field: value.get("value") if isinstance(value, Mapping) else value}
+    if "terms" in query:
+        field, values = next(iter(query["terms"].items()))
+        return {field: list(values)}
+    if "bool" in query and set(query["bool"]) <= {"filter", "must"}:
+        merged: dict[str, Any] = {}
+        for clause in [*query["bool"].get("filter", []), *query["bool"].get("must", [])]:
+            merged.update(_filters_from_query(clause))
+        return merged
+    raise ValueError(f"Unsupported alias filter for local search backend: {query}")
+
+
+# Per-chunk positional metadata, never used as a filter and unique per chunk
+_UNINDEXED_METADATA = frozenset({"char_start", "char_end", "page_start", "page_end", "chunk_index", "doc_version"})
+
+
+class _LocalIndex:
+    """
+    One chunk index held in process.
+
+    Vectors live in a float32 matrix that is memory-mapped from
+    `vectors.f32` when the index is persisted, documents are appended to
+    `docs.jsonl` and deletions are written as tombstones. Keyword fields
+    (`doc_id` and scalar `metadata` values) are kept in an inverted index so
+    filters never scan every document.
+    """
+
+    def __init__(self, name: str, dimension: int, path: str | None, meta: Mapping[str, Any] | None = None):
+        self.name: str = name
+        self.dimension: int = dimension
+        self.path: str | None = path
+        self.meta: dict[str, Any] = dict(meta or {})
+        self.lock: threading.RLock = threading.RLock()
+
+        self.size: int = 0
+        self.ids: list[str] = []
+        self.id_to_row: dict[str, int] = {}
+        self.docs: list[dict[str, Any]] = []
+        self.alive: np.ndarray = np.zeros(0, dtype=bool)
+        self.vectors: np.ndarray = np.zeros((0, dimension), dtype=np.float32)
+        self.sq_norms: np.ndarray = np.zeros(0, dtype=np.float32)
+
+        self.postings: dict[str, dict[int, int]] = {}
+        self.doc_lengths: np.ndarray = np.zeros(0, dtype=np.float32)
+        self.total_length: float = 0.0
+        self.alive_count: int = 0
+
+        self.keywords: dict[str, dict[Any, set[int]]] = {}
+
+    # Storage
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.path or "", "vectors.f32")
+
+    @property
+    def _docs_path(self) -> str:
+        return os.path.join(self.path or "", "docs.jsonl")
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.path or "", "meta.json")
+
+    def _grow(self, capacity: int) -> None:
+        if self.path is None:
+            grown = np.zeros((capacity, self.dimension), dtype=np.float32)
+            grown[: self.size] = self.vectors[: self.size]
+            self.vectors = grown
+        else:
+            if isinstance(self.vectors, np.memmap):
+                self.vectors.flush()
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(capacity * self.dimension * 4)
+            self.vectors = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension)
+            )
+
+        for attr, dtype in (("alive", bool), ("sq_norms", np.float32), ("doc_lengths", np.float32)):
+            current = getattr(self, attr)
+            grown_arr = np.zeros(capacity, dtype=dtype)
+            grown_arr[: self.size] = current[: self.size]
+            setattr(self, attr, grown_arr)
+
+    def _ensure_capacity(self, extra: int) -> None:
+        capacity = self.vectors.shape[0]
+        if self.size + extra <= capacity:
+            return
+        new_capacity = max(INITIAL_CAPACITY, capacity)
+        while new_capacity < self.size + extra:
+            new_capacity *= 2
+        self._grow(new_capacity)
+
+    @classmethod
+    def create(
+        cls, name: str, dimension: int, path: str | None, meta: Mapping[str, Any] | None = None
+    ) -> "_LocalIndex":
+        index = cls(name, dimension, path, meta)
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            with open(index._meta_path, "w") as f:
+                json.dump({"dimension": dimension, "meta": index.meta}, f)
+            open(index._docs_path, "a").close()
+        index._grow(INITIAL_CAPACITY)
+        return index
+
+    @classmethod
+    def load(cls, name: str, path: str) -> "_LocalIndex":
+        with open(os.path.join(path, "meta.json")) as f:
+            stored = json.load(f)
+
+        index = cls(name, int(stored["dimension"]), path, stored.get("meta"))
+        dimension = index.dimension
+        rows: list[dict[str, Any]] = []
+        deleted_rows: list[int] = []
+        with open(index._docs_path) as f:
+            for line in f:
+                record = json.loads(line)
+                if "_deleted_row" in record:
+                    deleted_rows.append(record["_deleted_row"])
+                else:
+                    rows.append(record)
+
+        capacity = max(INITIAL_CAPACITY, os.path.getsize(index._vectors_path) // (dimension * 4))
+        index._grow(capacity)
+        vectors = np.asarray(index.vectors[: len(rows)])
+        index.sq_norms[: len(rows)] = np.einsum("ij,ij->i", vectors, vectors)
+        for row, record in enumerate(rows):
+            index._register(row, record)
+        index.size = len(rows)
+        for row in deleted_rows:
+            index._unregister(row)
+        return index
+
+    def _append_log(self, records: list[dict[str, Any]]) -> None:
+        if self.path is None or not records:
+            return
+        with open(self._docs_path, "a") as f:
+            f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        if isinstance(self.vectors, np.memmap):
+            self.vectors.flush()
+
+    # Bookkeeping
+
+    def _register(self, row: int, record: dict[str, Any]) -> None:
+        self.ids.append(record["id"])
+        self.docs.append(record)
+        self.id_to_row[record["id"]] = row
+        self.alive[row] = True
+        self.alive_count += 1
+
+        term_counts = Counter(_tokenize(record.get("text", "")))
+        length = float(sum(term_counts.values()))
+        self.doc_lengths[row] = length
+        self.total_length += length
+        for term, tf in term_counts.items():
+            self.postings.setdefault(term, {})[row] = tf
+
+        for field, value in self._keyword_values(record):
+            self.keywords.setdefault(field, {}).setdefault(value, set()).add(row)
+
+    def _unregister(self, row: int) -> None:
+        if not self.alive[row]:
+            return
+        record = self.docs[row]
+        self.alive[row] = False
+        self.alive_count -= 1
+        self.total_length -= float(self.doc_lengths[row])
+        if self.id_to_row.get(record["id"]) == row:
+            del self.id_to_row[record["id"]]
+
+        for term in set(_tokenize(record.get("text", ""))):
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(row, None)
+                if not posting:
+                    del self.postings[term]
+
+        for field, value in self._keyword_values(record):
+            rows = self.keywords.get(field, {}).get(value)
+            if rows is not None:
+                rows.discard(row)
+
+    @staticmethod
+    def _keyword_values(record: Mapping[str, Any]) -> list[tuple[str, Any]]:
+        values: list[tuple[str, Any]] = []
+        doc_ids = record.get("doc_id")
+        for doc_id in doc_ids if isinstance(doc_ids, list) else [doc_ids]:
+            if doc_id is not None:
+                values.append(("doc_id", doc_id))
+        for key, value in (record.get("metadata") or {}).items():
+            if key in _UNINDEXED_METADATA:
+                continue
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, (str, int, bool)):
+                    values.append((f"metadata.{key}", item))
+        return values
+
+    # Operations
+
+    def upsert(self, chunks: Sequence[Mapping[str, Any]], overwrite: bool = True) -> int:
+        with self.lock:
+            self._ensure_capacity(len(chunks))
+            log: list[dict[str, Any]] = []
+            written = 0
+            for chunk in chunks:
+                vector = np.asarray(chunk["chunk_vector"], dtype=np.float32)
+                if vector.shape != (self.dimension,):
+                    raise ValueError(
+                        f"Vector dimension {vector.shape} does not match index {self.name} ({self.dimension})"
+                    )
+
+                chunk_id = str(chunk.get("id") or uuid.uuid4())
+                previous = self.id_to_row.get(chunk_id)
+                if previous is not None and not overwrite:
+                    continue
+                if previous is not None:
+                    self._unregister(previous)
+                    log.append({"_deleted_row": previous})
+
+                record = {
+                    "id": chunk_id,
+                    "doc_id": chunk.get("doc_id", ""),
+                    "text": chunk.get("text", ""),
+                    "metadata": dict(chunk.get("metadata") or {}),
+                    "created_at": chunk.get("created_at") or datetime.now(timezone.utc).isoformat(),
+                }
+                row = self.size
+                self.vectors[row] = vector
+                self.sq_norms[row] = float(vector @ vector)
+                self._register(row, record)
+                self.size += 1
+                written += 1
+                log.append(record)
+            self._append_log(log)
+            return written
+
+    def matching_rows(self, alias_filters: Filters | None = None) -> list[int]:
+        with self.lock:
+            return np.flatnonzero(self._mask(alias_filters)).tolist()
+
+    def hits(self, rows: Sequence[int]) -> list[SearchHit]:
+        with self.lock:
+            return [self._hit(row, 0.0, False) for row in rows if self.alive[row]]
+
+    def delete_doc_ids(self, doc_ids: Sequence[str], alias_filters: Filters | None = None) -> int:
+        with self.lock:
+            if self.size == 0:
+                return 0
+            rows = np.flatnonzero(self._mask({"doc_id": list(doc_ids)}, alias_filters)).tolist()
+            for row in rows:
+                self._unregister(row)
+            self._append_log([{"_deleted_row": row} for row in rows])
+            return len(rows)
+
+    def doc_versions(self, doc_ids: Sequence[str], alias_filters: Filters | None = None) -> dict[str, int | None]:
+        with self.lock:
+            versions: dict[str, int | None] = {}
+            if self.size == 0:
+                return versions
+            for row in np.flatnonzero(self._mask({"doc_id": list(doc_ids)}, alias_filters)).tolist():
+                record = self.docs[row]
+                version = record["metadata"].get("doc_version")
+                current = versions.get(record["doc_id"])
+                if current is None or (version is not None and version > current):
+                    versions[record["doc_id"]] = version
+            return versions
+
+    def existing_ids(self, ids: Sequence[str]) -> set[str]:
+        with self.lock:
+            return {chunk_id for chunk_id in ids if chunk_id in self.id_to_row}
+
+    def delete_ids(self, ids: Sequence[str]) -> int:
+        with self.lock:
+            rows = [self.id_to_row[chunk_id] for chunk_id in ids if chunk_id in self.id_to_row]
+            for row in rows:
+                self._unregister(row)
+            self._append_log([{"_deleted_row": row} for row in rows])
+            return len(rows)
+
+    def _mask(self, *filter_sets: Filters | None) -> np.ndarray:
+        mask = self.alive[: self.size].copy()
+        for field, value in (item for filters in filter_sets for item in (filters or {}).items()):
+            accepted = value if isinstance(value, (list, tuple, set)) else [value]
+            field_mask = np.zeros(self.size, dtype=bool)
+            postings = self.keywords.get(field, {})
+            for item in accepted:
+                rows = postings.get(item)
+                if rows:
+                    field_mask[np.fromiter(rows, dtype=np.int64, count=len(rows))] = True
+            mask &= field_mask
+        return mask
+
+    def _hit(self, row: int, score: float, include_vector: bool) -> SearchHit:
+        record = self.docs[row]
+        return SearchHit(
+            id=record["id"],
+            score=score,
+            doc_id=record["doc_id"],
+            text=record["text"],
+            metadata=record["metadata"],
+            created_at=record["created_at"],
+            vector=self.vectors[row].tolist() if include_vector else None,
+        )
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        if k >= scores.shape[0]:
+            return np.argsort(-scores)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])]
+
+    def knn(
+        self,
+        vector: Sequence[float],
+        k: int,
+        filters: Filters | None,
+        include_vectors: bool,
+        alias_filters: Filters | None = None,
+    ) -> list[SearchHit]:
+        with self.lock:
+            if self.size == 0 or k <= 0:
+                return []
+            query = np.asarray(vector, dtype=np.float32)
+            mask = self._mask(filters, alias_filters)
+            candidates = np.flatnonzero(mask)
+            if candidates.size == 0:
+                return []
+
+            if candidates.size == self.size:
+                dots = self.vectors[: self.size] @ query
+                norms = self.sq_norms[: self.size]
+            else:
+                dots = self.vectors[candidates] @ query
+                norms = self.sq_norms[candidates]
+
+            # Same scoring as OpenSearch's l2 space: 1 / (1 + squared distance)
+            distances = np.maximum(norms - 2.0 * dots + float(query @ query), 0.0)
+            scores = 1.0 / (1.0 + distances)
+            top = self._top_k(scores, k)
+            rows = candidates[top] if candidates.size != self.size else top
+            return [self._hit(int(row), float(scores[i]), include_vectors) for row, i in zip(rows, top)]
+
+    def bm25(
+        self, query: str, k: int, filters: Filters | None, alias_filters: Filters | None = None
+    ) -> list[SearchHit]:
+        with self.lock:
+            if self.alive_count == 0 or k <= 0:
+                return []
+            avg_length = self.total_length / self.alive_count or 1.0
+            lengths = self.doc_lengths[: self.size]
+            scores = np.zeros(self.size, dtype=np.float32)
+            matched = np.zeros(self.size, dtype=bool)
+
+            for term in set(_tokenize(query)):
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                rows = np.fromiter(posting.keys(), dtype=np.int64, count=len(posting))
+                tf = np.fromiter(posting.values(), dtype=np.float32, count=len(posting))
+                idf = math.log(1.0 + (self.alive_count - len(posting) + 0.5) / (len(posting) + 0.5))
+                norm = BM25_K1 * (1.0 - BM25_B + BM25_B * lengths[rows] / avg_length)
+                scores[rows] += idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+                matched[rows] = True
+
+            candidates = np.flatnonzero(matched & self._mask(filters, alias_filters))
+            if candidates.size == 0:
+                return []
+            top = self._top_k(scores[candidates], k)
+            return [self._hit(int(candidates[i]), float(scores[candidates[i]]), False) for i in top]
+
+
+class _LocalSuggestIndex:
+    """
+    Prefix lookup over file names and titles.
+
+    Keeps a sorted list of `(word, entry id)` pairs so each query word is
+    resolved with two binary searches. The list is rebuilt lazily after
+    writes, which are rare compared to keystroke-driven reads.
+    """
+
+    def __init__(self, path: str | None):
+        self.path: str | None = path
+        self.lock: threading.Lock = threading.Lock()
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._words: list[tuple[str, str]] = []
+        self._names: dict[str, str] = {}
+        self._dirty: bool = False
+
+    @property
+    def _log_path(self) -> str:
+        return os.path.join(self.path or "", "suggestions.jsonl")
+
+    @classmethod
+    def create(cls, path: str | None) -> "_LocalSuggestIndex":
+        index = cls(path)
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            if os.path.exists(index._log_path):
+                with open(index._log_path) as f:
+                    for line in f:
+                        record = json.loads(line)
+                        if "_deleted" in record:
+                            index.entries.pop(record["_deleted"], None)
+                        else:
+                            index.entries[record["id"]] = record
+            index._dirty = True
+        return index
+
+    def _append_log(self, records: list[dict[str, Any]]) -> None:
+        if self.path is None or not records:
+            return
+        with open(self._log_path, "a") as f:
+            f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+    def upsert(self, entries: Sequence[Mapping[str, Any]]) -> int:
+        with self.lock:
+            records = [dict(entry) for entry in entries]
+            for record in records:
+                self.entries[str(record["id"])] = record
+            self._append_log(records)
+            self._dirty = True
+            return len(records)
+
+    def delete(self, ids: Sequence[str]) -> int:
+        with self.lock:
+            removed = [entry_id for entry_id in ids if self.entries.pop(entry_id, None) is not None]
+            self._append_log([{"_deleted": entry_id} for entry_id in removed])
+            self._dirty = True
+            return len(removed)
+
+    def _rebuild(self) -> None:
+        words = {
+            (word, entry_id)
+            for entry_id, entry in self.entries.items()
+            for word in _tokenize(f"{entry.get('name', '')} {entry.get('title') or ''}")
+        }
+        self._words = sorted(words)
+        self._names = {entry_id: entry.get("name", "").lower() for entry_id, entry in self.entries.items()}
+        self._dirty = False
+
+    def _ids_with_prefix(self, prefix: str) -> set[str]:
+        start = bisect.bisect_left(self._words, (prefix, ""))
+        end = bisect.bisect_left(self._words, (prefix + "\uffff", ""))
+        return {entry_id for _, entry_id in self._words[start:end]}
+
+    def suggest(self, prefix: str, k: int, filters: Filters | None) -> list[dict[str, Any]]:
+        with self.lock:
+            if self._dirty:
+                self._rebuild()
+            query_words = _tokenize(prefix)
+            if not query_words:
+                return []
+
+            ids = self._ids_with_prefix(query_words[0])
+            for word in query_words[1:]:
+                ids &= self._ids_with_prefix(word)
+
+            for field, value in (filters or {}).items():
+                accepted = value if isinstance(value, (list, tuple, set)) else [value]
+                ids = {entry_id for entry_id in ids if self.entries[entry_id].get(field) in accepted}
+
+            # Names starting with the whole phrase first, then shorter names
+            phrase = prefix.lower().strip()
+            names = self._names
+            best = heapq.nsmallest(
+                k, ids, key=lambda entry_id: (not names[entry_id].startswith(phrase), len(names[entry_id]))
+            )
+            return [dict(self.entries[entry_id]) for entry_id in best]
+
+
+class LocalSearchBackend(SearchBackend):
+    """
+    In-process search backend for tests and small single-user deployments.
+
+    Exact (brute-force) kNN runs as one matrix-vector product over the
+    memory-mapped vectors and BM25 is scored from an in-memory inverted index.
+    Indexes are loaded lazily on first use, so startup does no I/O beyond
+    creating the storage directory. Without `root_path` nothing is persisted.
+
+    Aliases are supported with their filters; routing values are accepted
+    and ignored since there is only one shard.
+    """
+
+    def __init__(self, root_path: str | None = None):
+        self.root_path: str | None = root_path
+        self.indexes: dict[str, _LocalIndex] = {}
+        # alias -> index -> alias filters
+        self.aliases: dict[str, dict[str, dict[str, Any]]] = {}
+        self.suggest_indexes: dict[str, _LocalSuggestIndex] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def _aliases_path(self) -> str | None:
+        return os.path.join(self.root_path, "aliases.json") if self.root_path else None
+
+    async def initialize(self) -> None:
+        if self.root_path:
+            os.makedirs(self.root_path, exist_ok=True)
+            if self._aliases_path and os.path.exists(self._aliases_path):
+                with open(self._aliases_path) as f:
+                    self.aliases = json.load(f)
+        logger.info(f"Local search backend initialized (path={self.root_path or 'memory'})")
+
+    async def close(self) -> None:
+        for index in self.indexes.values():
+            if isinstance(index.vectors, np.memmap):
+                index.vectors.flush()
+        self.indexes.clear()
+        logger.info("Local search backend closed")
+
+    def _index_path(self, index: str) -> str | None:
+        return os.path.join(self.root_path, index) if self.root_path else None
+
+    def _get_index(self, index: str) -> _LocalIndex:
+        with self._lock:
+            local_index = self.indexes.get(index)
+            if local_index is None:
+                path = self._index_path(index)
+                if path is None or not os.path.exists(os.path.join(path, "meta.json")):
+                    raise IndexNotFoundError(f"Index {index} does not exist")
+                local_index = _LocalIndex.load(index, path)
+                self.indexes[index] = local_index
+            return local_index
+
+    def _resolve(self, name: str) -> list[tuple[_LocalIndex, dict[str, Any]]]:
+        """Resolve an index or alias name to indexes and their alias filters."""
+        targets = self.aliases.get(name)
+        if targets is None:
+            return [(self._get_index(name), {})]
+        return [(self._get_index(index), filters) for index, filters in targets.items()]
+
+    def _save_aliases(self) -> None:
+        if self._aliases_path:
+            with open(self._aliases_path, "w") as f:
+                json.dump(self.aliases, f)
+
+    async def create_index(
+        self,
+        index: str,
+        embedding_dimension: int = DEFAULT_EMBEDDING_DIMENSION,
+        number_of_shards: int = DEFAULT_NUMBER_OF_SHARDS,
+        meta: Mapping[str, Any] | None = None,
+    ) -> None:
+        if await self.index_exists(index):
+            return
+        with self._lock:
+            self.indexes[index] = _LocalIndex.create(index, embedding_dimension, self._index_path(index), meta)
+        logger.info(f"Created local index {index} (dimension={embedding_dimension})")
+
+    async def get_index_meta(self, index: str) -> dict[str, Any]:
+        targets = self._resolve(index)
+        if not targets:
+            raise IndexNotFoundError(index)
+        return dict(targets[0][0].meta)
+
+    async def delete_index(self, index: str) -> None:
+        with self._lock:
+            self.indexes.pop(index, None)
+            path = self._index_path(index)
+            if path and os.path.isdir(path):
+                for name in os.listdir(path):
+                    os.remove(os.path.join(path, name))
+                os.rmdir(path)
+            for alias in list(self.aliases):
+                self.aliases[alias].pop(index, None)
+                if not self.aliases[alias]:
+                    del self.aliases[alias]
+            self._save_aliases()
+
+    async def index_exists(self, index: str) -> bool:
+        if index in self.indexes:
+            return True
+        path = self._index_path(index)
+        return bool(path) and os.path.exists(os.path.join(path, "meta.json"))
+
+    async def update_aliases(self, actions: Sequence[Mapping[str, Any]]) -> None:
+        updated = {alias: dict(targets) for alias, targets in self.aliases.items()}
+        for action in actions:
+            if "add" in action:
+                spec = action["add"]
+                if not await self.index_exists(spec["index"]):
+                    raise IndexNotFoundError(f"Index {spec['index']} does not exist")
+                updated.setdefault(spec["alias"], {})[spec["index"]] = _filters_from_query(spec.get("filter"))
+            elif "remove" in action:
+                spec = action["remove"]
+                updated.get(spec["alias"], {}).pop(spec["index"], None)
+                if not updated.get(spec["alias"]):
+                    updated.pop(spec["alias"], None)
+            else:
+                raise ValueError(f"Unsupported alias action: {action}")
+
+        # Swap in one assignment so readers never see a half-applied update
+        self.aliases = updated
+        self._save_aliases()
+
+    async def get_alias_indices(self, alias: str) -> list[str]:
+        return sorted(self.aliases.get(alias, {}))
+
+    async def index_chunks(
+        self, index: str, chunks: Sequence[Mapping[str, Any]], overwrite: bool = True
+    ) -> int:
+        if not chunks:
+            return 0
+        targets = self._resolve(index)
+        if len(targets) != 1:
+            raise ValueError(f"Alias {index} points to {len(targets)} indices and cannot be written to")
+        return await asyncio.to_thread(targets[0][0].upsert, chunks, overwrite)
+
+    @staticmethod
+    def _merge(results: list[list[SearchHit]], k: int) -> list[SearchHit]:
+        if len(results) == 1:
+            return results[0]
+        return sorted((hit for hits in results for hit in hits), key=lambda hit: hit.score, reverse=True)[:k]
+
+    async def knn_search(
+        self,
+        index: str,
+        vector: Sequence[float],
+        k: int = 10,
+        filters: Mapping[str, Any] | None = None,
+        include_vectors: bool = False,
+    ) -> list[SearchHit]:
+        results = [
+            await asyncio.to_thread(local_index.knn, vector, k, filters, include_vectors, alias_filters)
+            for local_index, alias_filters in self._resolve(index)
+        ]
+        return self._merge(results, k)
+
+    async def text_search(
+        self,
+        index: str,
+        query: str,
+        k: int = 10,
+        filters: Mapping[str, Any] | None = None,
+    ) -> list[SearchHit]:
+        results = [
+            await asyncio.to_thread(local_index.bm25, query, k, filters, alias_filters)
+            for local_index, alias_filters in self._resolve(index)
+        ]
+        return self._merge(results, k)
+
+    async def delete_by_doc_ids(self, index: str, doc_ids: Sequence[str]) -> int:
+        if not doc_ids:
+            return 0
+        deleted = 0
+        for local_index, alias_filters in self._resolve(index):
+            deleted += await asyncio.to_thread(local_index.delete_doc_ids, doc_ids, alias_filters)
+        return deleted
+
+    async def doc_versions(self, index: str, doc_ids: Sequence[str]) -> dict[str, int | None]:
+        versions: dict[str, int | None] = {}
+        for local_index, alias_filters in self._resolve(index):
+            versions.update(local_index.doc_versions(doc_ids, alias_filters))
+        return versions
+
+    async def existing_ids(self, index: str, ids: Sequence[str], routing: str | None = None) -> set[str]:
+        found: set[str] = set()
+        for local_index, _ in self._resolve(index):
+            found |= local_index.existing_ids(ids)
+        return found
+
+    async def delete_by_ids(self, index: str, ids: Sequence[str]) -> int:
+        if not ids:
+            return 0
+        deleted = 0
+        for local_index, _ in self._resolve(index):
+            deleted += await asyncio.to_thread(local_index.delete_ids, ids)
+        return deleted
+
+    async def scan(self, index: str, batch_size: int = 500) -> AsyncIterator[list[SearchHit]]:
+        for local_index, alias_filters in self._resolve(index):
+            rows = local_index.matching_rows(alias_filters)
+            for start in range(0, len(rows), batch_size):
+                yield local_index.hits(rows[start:start + batch_size])
+
+    def _get_suggest_index(self, index: str) -> _LocalSuggestIndex:
+        with self._lock:
+            suggest_index = self.suggest_indexes.get(index)
+            if suggest_index is None:
+                path = self._index_path(index)
+                if path is None or not os.path.isdir(path):
+                    raise KeyError(f"Suggestion index {index} does not exist")
+                suggest_index = _LocalSuggestIndex.create(path)
+                self.suggest_indexes[index] = suggest_index
+            return suggest_index
+
+    async def create_suggest_index(self, index: str) -> None:
+        with self._lock:
+            if index not in self.suggest_indexes:
+                self.suggest_indexes[index] = _LocalSuggestIndex.create(self._index_path(index))
+
+    async def upsert_suggestions(self, index: str, entries: Sequence[Mapping[str, Any]]) -> int:
+        if not entries:
+            return 0
+        return self._get_suggest_index(index).upsert(entries)
+
+    async def delete_suggestions(self, index: str, ids: Sequence[str]) -> int:
+        if not ids:
+            return 0
+        return self._get_suggest_index(index).delete(ids)
+
+    async def suggest(
+        self,
+        index: str,
+        prefix: str,
+        k: int = 10,
+        filters: Mapping[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        return self._get_suggest_index(index).suggest(prefix, k, filters)
@@ -1,18 +1,30 @@
+import atexit
 import datetime
 import json
 import logging
 import os
+import queue
 import sys
+import threading
+from collections.abc import Sequence
 from logging.config import dictConfig
+from logging.handlers import QueueHandler
 from types import FrameType
-from typing import cast
-import loguru
-import stackprinter
+from typing import Any, TextIO, cast
 from pydantic import BaseModel
 
+from app.config.request_context import log_context
+
 env = os.getenv("ENV", "development")
 host_name = os.getenv("HOSTNAME", "")
 
+# Records buffered for the background log writer; when full, new records are dropped and counted
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# At most LOG_SAMPLE_BURST records per message template every LOG_SAMPLE_WINDOW seconds (0 disables sampling)
+LOG_SAMPLE_BURST = int(os.getenv("LOG_SAMPLE_BURST", "20"))
+LOG_SAMPLE_WINDOW = float(os.getenv("LOG_SAMPLE_WINDOW", "10"))
+
 LEVEL_TO_NAME = {
     logging.CRITICAL: "CRITICAL",
     logging.ERROR: "ERROR",
@@ -39,6 +51,22 @@ class LogFilter(logging.Filter):
         return True
 
 
+class RequestContextFilter(logging.Filter):
+    """
+    Copies the current request's id, path, elapsed time and timing
+    breakdown onto every record. Installed once on the handlers; fields
+    already on the record (from `extra` or a `LoggerAdapter`) are kept.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = log_context()
+        if context is not None:
+            for key, value in context.items():
+                if value is not None and not hasattr(record, key):
+                    setattr(record, key, value)
+        return True
+
+
 class BaseJsonLogSchema(BaseModel):
     """
     Main log in JSON format
@@ -56,6 +84,7 @@ class BaseJsonLogSchema(BaseModel):
     task_id: str | None = None
     exceptions: str | list[str] | None = None
     duration: float | int | None = None
+    timings: dict | None = None
     host_name: str | None = None
 
     class Config:
@@ -63,10 +92,17 @@ class BaseJsonLogSchema(BaseModel):
 
 
 class ConsoleLogger(logging.Handler):
+    def __init__(self, level: int = logging.NOTSET):
+        super().__init__(level)
+        # Imported here: only the development console uses loguru
+        import loguru
+
+        self.loguru_logger: Any = loguru.logger
+
     def emit(self, record: CustomLogRecord) -> None:  # pragma: no cover
         # Get corresponding Loguru level if it exists
         try:
-            level = loguru.logger.level(record.levelname).name
+            level = self.loguru_logger.level(record.levelname).name
         except ValueError:
             level = str(record.levelno)
 
@@ -76,15 +112,26 @@ class ConsoleLogger(logging.Handler):
             frame = cast(FrameType, frame.f_back)
             depth += 1
 
-        loguru.logger.opt(depth=depth, exception=record.exc_info).log(
+        message = record.getMessage()
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            message = f"[{request_id}] {message}"
+        suppressed = getattr(record, "suppressed", None)
+        if suppressed:
+            message = f"{message} (+{suppressed} similar suppressed)"
+
+        self.loguru_logger.opt(depth=depth, exception=record.exc_info).log(
             level,
-            record.getMessage(),
+            message,
         )
 
 
 class JSONLogFormatter(logging.Formatter):
     """
     Custom class-formatter for writing logs to json
+
+    Builds the `BaseJsonLogSchema` fields as a plain dict, in schema
+    order; validating a model per line cost more than the write itself.
     """
 
     def format(self, record: CustomLogRecord, *args, **kwargs) -> str:
@@ -94,46 +141,29 @@ class JSONLogFormatter(logging.Formatter):
         :return: json string
         """
         log_object: dict = self._format_log_object(record)
-        return json.dumps(log_object, ensure_ascii=False)
+        return json.dumps(log_object, ensure_ascii=False, default=str)
 
     @staticmethod
     def _format_log_object(record: CustomLogRecord) -> dict:
-        now = (
-            datetime.datetime.fromtimestamp(record.created)
-            .astimezone()
-            .replace(microsecond=0)
-            .isoformat()
-        )
-        message = record.getMessage()
-        duration = getattr(record, "duration", record.msecs)
-        
-        # Get request_id and path from record attributes if they exist
-        request_id = getattr(record, "request_id", "")
-        path = getattr(record, "path", None)
-        
-        # Get task_id from record attributes if it exists
-        task_id = getattr(record, "task_id", "")
-
-        json_log_fields = BaseJsonLogSchema(
-            time=now,
-            level=LEVEL_TO_NAME[record.levelno],
-            message=message,
-            source_log=record.name,
-            duration=duration,
-            app="linq-search",
-            component="fastapi_boilerplate",
-            env=env,
-            request_id=request_id,
-            path=path,
-            task_id=task_id,
-            host_name=host_name,
-        )
-
-        if hasattr(record, "props") and record.props:
-            json_log_fields.props = record.props
+        log_object = {
+            "level": LEVEL_TO_NAME.get(record.levelno, record.levelname),
+            "message": record.getMessage(),
+            "source_log": record.name,
+            "time": _iso_time(record.created),
+            "app": "linq-search",
+            "component": "fastapi_boilerplate",
+            "env": env,
+            # Set by RequestContextFilter inside a request or job
+            "request_id": getattr(record, "request_id", ""),
+            "path": getattr(record, "path", None),
+            "task_id": getattr(record, "task_id", ""),
+        }
 
         if record.exc_info:
-            json_log_fields.exceptions = stackprinter.format(
+            # Imported on the first exception, on the writer thread
+            import stackprinter
+
+            log_object["exceptions"] = stackprinter.format(
                 record.exc_info,
                 suppressed_paths=[
                     r"lib/python.*/site-packages/starlette.*",
@@ -141,19 +171,178 @@ class JSONLogFormatter(logging.Formatter):
                 add_summary=False,
             ).split("\n")
         elif record.exc_text:
-            json_log_fields.exceptions = record.exc_text
+            log_object["exceptions"] = record.exc_text
 
-        # Pydantic to dict
-        json_log_object = json_log_fields.dict(
-            exclude_unset=True,
-            by_alias=True,
-        )
+        log_object["duration"] = getattr(record, "duration", None)
+        timings = getattr(record, "timings", None)
+        if timings:
+            log_object["timings"] = timings
+        log_object["host_name"] = host_name
+
+        suppressed = getattr(record, "suppressed", None)
+        if suppressed:
+            log_object["suppressed"] = suppressed
+
+        if hasattr(record, "props") and record.props:
+            log_object["props"] = record.props
 
         # getting additional fields
         if hasattr(record, "request_json_fields") and record.request_json_fields:
-            json_log_object.update(record.request_json_fields)
+            log_object.update(record.request_json_fields)
+
+        return log_object
+
+
+_last_second: tuple[int, str] = (-1, "")
+
+
+def _iso_time(created: float) -> str:
+    """Local ISO time to the second, reused for records within the same second."""
+    global _last_second
+    second = int(created)
+    if _last_second[0] != second:
+        _last_second = (second, datetime.datetime.fromtimestamp(second).astimezone().isoformat())
+    return _last_second[1]
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Lets through at most `burst` records per logger, level and message
+    template in each `window` of seconds; the first record of the next
+    window carries how many were suppressed. Errors are never sampled,
+    and neither are `exempt` loggers. Templates only repeat when the
+    message is logged with %-style arguments, not an f-string.
+    """
+
+    def __init__(self, burst: int = LOG_SAMPLE_BURST, window: float = LOG_SAMPLE_WINDOW, exempt: Sequence[str] = ()):
+        super().__init__()
+        self.burst: int = burst
+        self.window: float = window
+        self.exempt: frozenset[str] = frozenset(exempt)
+        self._window_start: float = 0.0
+        self._counts: dict[tuple[str, int, Any], int] = {}
+        # Records dropped per key in the previous window
+        self._suppressed: dict[tuple[str, int, Any], int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR or self.burst <= 0 or record.name in self.exempt:
+            return True
+        if record.created - self._window_start >= self.window:
+            self._suppressed = {key: count - self.burst for key, count in self._counts.items() if count > self.burst}
+            self._counts = {}
+            self._window_start = record.created
+
+        key = (record.name, record.levelno, record.msg if isinstance(record.msg, str) else id(type(record.msg)))
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+        if count > self.burst:
+            return False
+        if count == 1 and self._suppressed:
+            suppressed = self._suppressed.pop(key, 0)
+            if suppressed:
+                record.suppressed = suppressed
+        return True
+
+
+class LogWriter:
+    """
+    Background thread formatting queued records and writing them to a stream.
+
+    Callers only enqueue; formatting and the blocking write happen on
+    the thread, a batch of records per flush. When the queue is full,
+    records are dropped rather than stalling the event loop, and the
+    count is written once the writer catches up.
+    """
+
+    _stop = object()
+
+    def __init__(self, formatter: logging.Formatter, stream: TextIO, size: int = LOG_QUEUE_SIZE, batch: int = 256):
+        self.formatter: logging.Formatter = formatter
+        self.stream: TextIO = stream
+        self.queue: queue.Queue[Any] = queue.Queue(size)
+        self.batch: int = batch
+        self.dropped: int = 0
+        self._reported: int = 0
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+            _ = atexit.register(self.stop)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write what is queued and stop the thread."""
+        if self._thread is not None:
+            self.queue.put(self._stop)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            records = [self.queue.get()]
+            while len(records) < self.batch:
+                try:
+                    records.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = records[-1] is self._stop
+            lines: list[str] = []
+            for record in records:
+                if record is self._stop:
+                    continue
+                try:
+                    lines.append(self.formatter.format(record))
+                except Exception as _:
+                    lines.append(self._notice(logging.ERROR, "Failed to format a record from %s", record.name))
+            if self.dropped != self._reported:
+                dropped, self._reported = self.dropped - self._reported, self.dropped
+                lines.append(self._notice(logging.WARNING, "Log queue full, dropped %d records", dropped))
+            if lines:
+                try:
+                    _ = self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                except Exception as _:
+                    # Nowhere left to report it
+                    pass
+            if stopping:
+                return
+
+    def _notice(self, level: int, msg: str, *args: Any) -> str:
+        record = logging.makeLogRecord({"name": __name__, "levelno": level, "levelname": logging.getLevelName(level), "msg": msg, "args": args})
+        return self.formatter.format(record)
+
+
+class QueueLogHandler(QueueHandler):
+    """Enqueues records for a `LogWriter`; filters (context, sampling) still run on the calling thread."""
+
+    def __init__(self, writer: LogWriter):
+        super().__init__(writer.queue)
+        self.writer: LogWriter = writer
+        writer.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Arguments are merged now since they may change once the call returns; the rest is formatted by the writer
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.writer.dropped += 1
 
-        return json_log_object
+
+_json_writer: LogWriter | None = None
+
+
+def queued_json_handler() -> QueueLogHandler:
+    """JSON lines on stdout through the shared background writer."""
+    global _json_writer
+    if _json_writer is None:
+        _json_writer = LogWriter(JSONLogFormatter(), sys.stdout)
+    return QueueLogHandler(_json_writer)
 
 
 def handlers():
@@ -165,6 +354,18 @@ def handlers():
 LOG_HANDLER = handlers()
 LOGGING_LEVEL = logging.INFO
 
+HANDLERS = {
+    "json": {
+        "()": queued_json_handler,
+        "filters": ["sample", "request_context"],
+    },
+    # Synchronous: loguru reports the calling frame, which a writer thread would not see
+    "intercept": {
+        "()": ConsoleLogger,
+        "filters": ["sample", "request_context"],
+    },
+}
+
 LOG_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -172,22 +373,22 @@ LOG_CONFIG = {
         "ignore_endpoints": {
             "()": LogFilter,
         },
+        "request_context": {
+            "()": RequestContextFilter,
+        },
+        "sample": {
+            "()": SamplingFilter,
+            # One line per request by design
+            "exempt": ["uvicorn.access"],
+        },
     },
     "formatters": {
         "json": {
             "()": JSONLogFormatter,
         },
     },
-    "handlers": {
-        "json": {
-            "formatter": "json",
-            "class": "logging.StreamHandler",
-            "stream": sys.stdout,
-        },
-        "intercept": {
-            "()": ConsoleLogger,
-        },
-    },
+    # dictConfig builds every handler listed, so only the ones in use are
+    "handlers": {name: HANDLERS[name] for name in LOG_HANDLER},
     "loggers": {
         "": {
             "handlers": LOG_HANDLER,
@@ -220,17 +421,23 @@ LOG_CONFIG = {
             "level": "WARNING",
             "propagate": False,
         },
-        "celery.worker.consumer.mingle": {
-            "handlers": LOG_HANDLER,
-            "level": "WARNING",
-            "propagate": False,
-        },
     },
 }
 
 
+_configured = False
+
+
+def configure_logging() -> None:
+    """Apply LOG_CONFIG once per process; handlers, the log writer and sampling state are built once."""
+    global _configured
+    if not _configured:
+        dictConfig(LOG_CONFIG)
+        _configured = True
+
+
 def create_logger(name: str) -> logging.Logger:
-    dictConfig(LOG_CONFIG)
+    configure_logging()
     logger = logging.getLogger(name)
     return logger
 
@@ -239,22 +446,14 @@ def create_logger(name: str) -> logging.Logger:
 def add_request_context(logger, request_id=None, path=None, task_id=None):
     """
     Helper function to add context information to logger
-    
+
+    Returns an adapter; the shared logger itself is left untouched.
+    Inside a request the id and path are added to records already.
+
     Usage:
         logger = create_logger(__name__)
         logger = add_request_context(logger, request_id="123", path="/api/users")
         logger.info("Processing request")
     """
-    class ContextFilter(logging.Filter):
-        def filter(self, record):
-            if request_id:
-                record.request_id = request_id
-            if path:
-                record.path = path
-            if task_id:
-                record.task_id = task_id
-            return True
-    
-    context_filter = ContextFilter()
-    logger.addFilter(context_filter)
-    return logger
\ No newline at end of file
+    context = {"request_id": request_id, "path": path, "task_id": task_id}
+    return logging.LoggerAdapter(logger, {key: value for key, value in context.items() if value})
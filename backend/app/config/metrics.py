@@ -0,0 +1,197 @@
+import functools
+import inspect
+import os
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any, ParamSpec, TypeVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+from prometheus_client.registry import Collector
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.pools import pool_stats
+from app.config.request_context import enter_span, exit_span, record_span
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Bucket bounds in seconds; dependency calls are mostly milliseconds, completions and streams seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to the end of its response (whole stream for SSE), by route template.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REPOSITORY_LATENCY = Histogram(
+    "db_repository_duration_seconds",
+    "Postgres time per repository method call.",
+    ["repository", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+OPENSEARCH_LATENCY = Histogram(
+    "opensearch_request_duration_seconds",
+    "OpenSearch request time per operation.",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+OPENAI_LATENCY = Histogram(
+    "openai_request_duration_seconds",
+    "OpenAI request time per operation; for streamed completions, until the stream opens.",
+    ["operation", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+OPENAI_TOKENS = Counter(
+    "openai_tokens",
+    "Tokens reported by OpenAI per operation.",
+    ["operation", "model", "kind"],
+)
+OAUTH_LATENCY = Histogram(
+    "oauth_request_duration_seconds",
+    "OAuth provider call time per operation.",
+    ["provider", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def timed(histogram: Any, span: str | None = None) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """
+    Observe the duration of every call of a coroutine function, failures
+    included, in a labelled histogram, and as a `span` of the current
+    request's timing breakdown.
+    """
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            started = time.perf_counter()
+            token = enter_span(span) if span else None
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - started
+                histogram.observe(seconds)
+                if token is not None:
+                    exit_span(span, token, seconds)  # pyright: ignore[reportArgumentType]
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_repository(cls: type) -> None:
+    """Time the public coroutine methods of a repository class, inherited ones included, under its own name."""
+    for name in dir(cls):
+        if name.startswith("_"):
+            continue
+        method = getattr(cls, name)
+        if not inspect.iscoroutinefunction(method):
+            continue
+        # Inherited methods were already wrapped for the parent's label
+        if getattr(method, "_repository_timed", False):
+            method = method.__wrapped__
+        wrapper = timed(REPOSITORY_LATENCY.labels(cls.__name__, name), span="postgres")(method)
+        wrapper._repository_timed = True  # pyright: ignore[reportFunctionMemberAccess]
+        setattr(cls, name, wrapper)
+
+
+_opensearch_children: dict[str, Any] = {}
+
+
+def opensearch_operation(method: str, url: str) -> str:
+    """`search`, `bulk`, `delete_by_query`, ... from the first `_` path segment; index-level calls by HTTP method."""
+    for segment in url.split("?", 1)[0].split("/"):
+        if segment.startswith("_"):
+            return segment[1:]
+    return f"index_{method.lower()}"
+
+
+def observe_opensearch(operation: str, seconds: float) -> None:
+    child = _opensearch_children.get(operation)
+    if child is None:
+        child = _opensearch_children[operation] = OPENSEARCH_LATENCY.labels(operation)
+    child.observe(seconds)
+    record_span("opensearch", seconds)
+
+
+def observe_openai(operation: str, model: str, seconds: float | None = None, usage: Any = None) -> None:
+    """Record an OpenAI call's latency and/or the usage it reported (`prompt_tokens`, `completion_tokens`)."""
+    if seconds is not None:
+        OPENAI_LATENCY.labels(operation, model).observe(seconds)
+        record_span("openai", seconds)
+    if usage is not None:
+        OPENAI_TOKENS.labels(operation, model, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+        OPENAI_TOKENS.labels(operation, model, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+class PoolCollector(Collector):
+    """Exports `pools` (in use, idle, checkout waits, timeouts) at scrape time."""
+
+    def collect(self) -> Iterator[Any]:
+        in_use = GaugeMetricFamily("pool_connections_in_use", "Connections checked out.", labels=["pool"])
+        idle = GaugeMetricFamily("pool_connections_idle", "Open connections waiting in the pool.", labels=["pool"])
+        size = GaugeMetricFamily("pool_connections_max", "Pool capacity.", labels=["pool"])
+        timeouts = CounterMetricFamily("pool_checkout_timeouts", "Checkouts that timed out.", labels=["pool"])
+        waits = HistogramMetricFamily("pool_checkout_wait_seconds", "Time to obtain a connection.", labels=["pool"])
+        for name, stats in pool_stats()["pools"].items():
+            in_use.add_metric([name], stats["in_use"])
+            idle.add_metric([name], stats["idle"])
+            size.add_metric([name], stats["size"])
+            timeouts.add_metric([name], stats["timeouts"])
+            waits.add_metric([name], list(stats["wait_seconds_buckets"].items()), stats["wait_seconds_sum"])
+        yield from (in_use, idle, size, timeouts, waits)
+
+
+REGISTRY.register(PoolCollector())
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Exposition of this process, or of all worker processes when PROMETHEUS_MULTIPROC_DIR is set."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """Request latency per route template; unmatched paths share one label to bound cardinality."""
+
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+        self._children: dict[tuple[str, str, int], Any] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            key = (scope["method"], getattr(route, "path", "unmatched"), status)
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = REQUEST_LATENCY.labels(*key)
+            child.observe(time.perf_counter() - started)
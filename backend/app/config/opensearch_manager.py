@@ -1,15 +1,74 @@
 import os
-from collections.abc import AsyncGenerator
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Mapping, Sequence
+from types import SimpleNamespace
 from typing import Any
-from opensearchpy import AsyncOpenSearch
+import aiohttp
+from opensearchpy import AIOHttpConnection, AsyncOpenSearch, ConnectionTimeout, NotFoundError
+from opensearchpy.helpers import async_bulk, async_scan
 from dotenv import load_dotenv
 from app.config.logger import create_logger
+from app.config.metrics import observe_opensearch, opensearch_operation
+from app.config.pools import pool_settings, pools
+from app.config.search_backend import (
+    DEFAULT_EMBEDDING_DIMENSION,
+    DEFAULT_NUMBER_OF_SHARDS,
+    IndexNotFoundError,
+    SearchBackend,
+    SearchHit,
+)
 
 _ = load_dotenv()
 logger = create_logger(__name__)
 
 
-class OpenSearchManager:
+def _checkout_trace() -> aiohttp.TraceConfig:
+    """Time from requesting a connection to getting one, including waits on a full pool."""
+
+    async def on_queued(_session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: Any) -> None:
+        ctx.queued_at = time.perf_counter()
+
+    async def on_checkout(_session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: Any) -> None:
+        queued_at = getattr(ctx, "queued_at", None)
+        pools["opensearch"].observe_wait(0.0 if queued_at is None else time.perf_counter() - queued_at)
+
+    trace = aiohttp.TraceConfig()
+    trace.on_connection_queued_start.append(on_queued)
+    trace.on_connection_reuseconn.append(on_checkout)
+    trace.on_connection_create_start.append(on_checkout)
+    trace.freeze()
+    return trace
+
+
+class ObservedAIOHttpConnection(AIOHttpConnection):
+    """aiohttp connection reporting its pool in `pools["opensearch"]` and request time per operation in /metrics."""
+
+    async def _create_aiohttp_session(self) -> None:
+        await super()._create_aiohttp_session()
+        assert self.session is not None
+        # The session reads this list on every request
+        self.session.trace_configs.append(_checkout_trace())
+        connector = self.session.connector
+        # aiohttp keeps these counts private; read defensively
+        pools["opensearch"].bind(
+            lambda: (
+                len(getattr(connector, "_acquired", ())),
+                sum(len(idle) for idle in getattr(connector, "_conns", {}).values()),
+            )
+        )
+
+    async def perform_request(self, method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await super().perform_request(method, url, *args, **kwargs)
+        except ConnectionTimeout:
+            pools["opensearch"].observe_timeout()
+            raise
+        finally:
+            observe_opensearch(opensearch_operation(method, url), time.perf_counter() - started)
+
+
+class OpenSearchManager(SearchBackend):
     def __init__(self):
         self.client: AsyncOpenSearch | None = None
         self.host: str = os.getenv("OPENSEARCH_HOST", "localhost")
@@ -32,8 +91,9 @@ class OpenSearchManager:
             verify_certs=False,  # For local development
             ssl_assert_hostname=False,
             ssl_show_warn=False,
-            pool_maxsize=100,
-            timeout=30.0,
+            connection_class=ObservedAIOHttpConnection,
+            pool_maxsize=pool_settings.opensearch_pool_size,
+            timeout=pool_settings.opensearch_timeout,
         )
         
         # Test connection
@@ -52,6 +112,14 @@ class OpenSearchManager:
             
         logger.info("OpenSearch client initialized successfully")
     
+    async def ping(self) -> None:
+        """Cluster health; a red cluster cannot serve searches over all shards."""
+        if not self.client:
+            raise Exception("OpenSearch client not initialized")
+        health = await self.client.cluster.health()
+        if health.get("status") == "red":
+            raise Exception("cluster status is red")
+
     async def close(self):
         """Close the OpenSearch client connection."""
         if self.client:
@@ -69,21 +137,28 @@ class OpenSearchManager:
             logger.error(f"Error during OpenSearch operation: {e}")
             raise
     
-    def get_vector_index_settings(self, embedding_dimension: int = 1536) -> dict[str, Any]:
+    def get_vector_index_settings(
+        self,
+        embedding_dimension: int = DEFAULT_EMBEDDING_DIMENSION,
+        number_of_shards: int = DEFAULT_NUMBER_OF_SHARDS,
+        meta: Mapping[str, Any] | None = None,
+    ) -> dict[str, Any]:
         """
         Get default settings for a vector search index.
         
         Args:
             embedding_dimension: Dimension of the embedding vectors
+            number_of_shards: Primary shard count (1 for small dedicated tenant indices)
+            meta: Stored as the mapping `_meta`, e.g. the embedding model
             
         Returns:
             Index configuration with settings and mappings
         """
-        return {
+        settings = {
             "settings": {
                 "index.knn": True,
                 "number_of_replicas": 1,
-                "number_of_shards": 3,
+                "number_of_shards": number_of_shards,
                 "analysis": {
                     "analyzer": {
                         "icu_analyzer": {
@@ -125,7 +200,21 @@ class OpenSearchManager:
                     # Add other fields as needed - these are configurable
                     "metadata": {
                         "type": "object",
-                        "enabled": True
+                        "enabled": True,
+                        "properties": {
+                            # Tenant fields used by alias filters and routing
+                            "workspace": {"type": "keyword"},
+                            "connector": {"type": "keyword"},
+                            # Chunk position within the source document (see app.utils.chunker)
+                            "char_start": {"type": "integer"},
+                            "char_end": {"type": "integer"},
+                            "page_start": {"type": "integer"},
+                            "page_end": {"type": "integer"},
+                            "chunk_index": {"type": "integer"},
+                            "kind": {"type": "keyword"},
+                            "section": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}},
+                            "doc_version": {"type": "long"},
+                        },
                     },
                     "doc_id": {
                         "type": "keyword"
@@ -135,4 +224,334 @@ class OpenSearchManager:
                     }
                 }
             }
-        }
\ No newline at end of file
+        }
+        if meta:
+            settings["mappings"]["_meta"] = dict(meta)
+        return settings
+
+    def _require_client(self) -> AsyncOpenSearch:
+        if not self.client:
+            raise Exception("OpenSearch client not initialized")
+        return self.client
+
+    @staticmethod
+    def _build_filter_clauses(filters: Mapping[str, Any] | None) -> list[dict[str, Any]]:
+        """Translate backend-neutral filters into term/terms clauses."""
+        clauses: list[dict[str, Any]] = []
+        for field, value in (filters or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                clauses.append({"terms": {field: list(value)}})
+            else:
+                clauses.append({"term": {field: value}})
+        return clauses
+
+    @staticmethod
+    def _to_hit(raw: dict[str, Any]) -> SearchHit:
+        source = raw.get("_source", {})
+        return SearchHit(
+            id=raw["_id"],
+            score=float(raw.get("_score") or 0.0),
+            doc_id=source.get("doc_id", ""),
+            text=source.get("text", ""),
+            metadata=source.get("metadata") or {},
+            created_at=source.get("created_at"),
+            vector=source.get("chunk_vector"),
+        )
+
+    async def create_index(
+        self,
+        index: str,
+        embedding_dimension: int = DEFAULT_EMBEDDING_DIMENSION,
+        number_of_shards: int = DEFAULT_NUMBER_OF_SHARDS,
+        meta: Mapping[str, Any] | None = None,
+    ) -> None:
+        client = self._require_client()
+        if await client.indices.exists(index=index):
+            return
+        _ = await client.indices.create(
+            index=index,
+            body=self.get_vector_index_settings(embedding_dimension, number_of_shards, meta),
+        )
+        logger.info(f"Created OpenSearch index {index} (dimension={embedding_dimension}, shards={number_of_shards})")
+
+    async def get_index_meta(self, index: str) -> dict[str, Any]:
+        try:
+            response = await self._require_client().indices.get_mapping(index=index)
+        except NotFoundError as e:
+            raise IndexNotFoundError(index) from e
+        # Resolves aliases too; the response is keyed by the concrete index
+        mapping = next(iter(response.values()), {}).get("mappings", {})
+        return dict(mapping.get("_meta") or {})
+
+    async def delete_index(self, index: str) -> None:
+        client = self._require_client()
+        if await client.indices.exists(index=index):
+            _ = await client.indices.delete(index=index)
+            logger.info(f"Deleted OpenSearch index {index}")
+
+    async def index_exists(self, index: str) -> bool:
+        return bool(await self._require_client().indices.exists(index=index))
+
+    async def update_aliases(self, actions: Sequence[Mapping[str, Any]]) -> None:
+        if not actions:
+            return
+        _ = await self._require_client().indices.update_aliases(body={"actions": list(actions)})
+
+    async def get_alias_indices(self, alias: str) -> list[str]:
+        client = self._require_client()
+        if not await client.indices.exists_alias(name=alias):
+            return []
+        response = await client.indices.get_alias(name=alias)
+        return sorted(response.keys())
+
+    async def index_chunks(
+        self, index: str, chunks: Sequence[Mapping[str, Any]], overwrite: bool = True
+    ) -> int:
+        actions: list[dict[str, Any]] = []
+        for chunk in chunks:
+            source = {key: value for key, value in chunk.items() if key != "id"}
+            action: dict[str, Any] = {
+                "_op_type": "index" if overwrite else "create",
+                "_index": index,
+                "_source": source,
+            }
+            if chunk.get("id"):
+                action["_id"] = chunk["id"]
+            actions.append(action)
+
+        if not actions:
+            return 0
+
+        success, errors = await async_bulk(self._require_client(), actions, raise_on_error=overwrite)
+        # With create semantics a 409 only means the chunk is already there
+        failures = [error for error in errors if next(iter(error.values())).get("status") != 409]
+        if failures:
+            raise Exception(f"Failed to index {len(failures)} chunks into {index}: {failures[:3]}")
+        return int(success)
+
+    async def knn_search(
+        self,
+        index: str,
+        vector: Sequence[float],
+        k: int = 10,
+        filters: Mapping[str, Any] | None = None,
+        include_vectors: bool = False,
+    ) -> list[SearchHit]:
+        knn: dict[str, Any] = {"vector": list(vector), "k": k}
+        clauses = self._build_filter_clauses(filters)
+        if clauses:
+            knn["filter"] = {"bool": {"filter": clauses}}
+
+        body: dict[str, Any] = {
+            "size": k,
+            "query": {"knn": {"chunk_vector": knn}},
+        }
+        if not include_vectors:
+            body["_source"] = {"excludes": ["chunk_vector"]}
+
+        response = await self._require_client().search(index=index, body=body)
+        return [self._to_hit(raw) for raw in response["hits"]["hits"]]
+
+    async def text_search(
+        self,
+        index: str,
+        query: str,
+        k: int = 10,
+        filters: Mapping[str, Any] | None = None,
+    ) -> list[SearchHit]:
+        body: dict[str, Any] = {
+            "size": k,
+            "_source": {"excludes": ["chunk_vector"]},
+            "query": {
+                "bool": {
+                    "must": [
+                        {
+                            "multi_match": {
+                                "query": query,
+                                "fields": ["text", "text.eng", "text.cjk"],
+                            }
+                        }
+                    ],
+                    "filter": self._build_filter_clauses(filters),
+                }
+            },
+        }
+        response = await self._require_client().search(index=index, body=body)
+        return [self._to_hit(raw) for raw in response["hits"]["hits"]]
+
+    async def scan(self, index: str, batch_size: int = 500) -> AsyncIterator[list[SearchHit]]:
+        batch: list[SearchHit] = []
+        async for raw in async_scan(
+            self._require_client(),
+            index=index,
+            query={"query": {"match_all": {}}, "_source": {"excludes": ["chunk_vector"]}},
+            size=batch_size,
+        ):
+            batch.append(self._to_hit(raw))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def delete_by_doc_ids(self, index: str, doc_ids: Sequence[str]) -> int:
+        if not doc_ids:
+            return 0
+        response = await self._require_client().delete_by_query(
+            index=index,
+            body={"query": {"terms": {"doc_id": list(doc_ids)}}},
+            params={"conflicts": "proceed", "refresh": "true"},
+        )
+        return int(response.get("deleted", 0))
+
+    async def doc_versions(self, index: str, doc_ids: Sequence[str]) -> dict[str, int | None]:
+        if not doc_ids:
+            return {}
+        response = await self._require_client().search(
+            index=index,
+            body={
+                "size": 0,
+                "query": {"terms": {"doc_id": list(doc_ids)}},
+                "aggs": {
+                    "docs": {
+                        "terms": {"field": "doc_id", "size": len(doc_ids)},
+                        "aggs": {"version": {"max": {"field": "metadata.doc_version"}}},
+                    }
+                },
+            },
+        )
+        versions: dict[str, int | None] = {}
+        for bucket in response["aggregations"]["docs"]["buckets"]:
+            # Max aggregations report longs as doubles, exact at millisecond timestamps
+            value = bucket["version"]["value"]
+            versions[bucket["key"]] = int(value) if value is not None else None
+        return versions
+
+    async def existing_ids(self, index: str, ids: Sequence[str], routing: str | None = None) -> set[str]:
+        if not ids:
+            return set()
+        # Multi-get is real-time, unlike search
+        docs = [{"_id": chunk_id, **({"routing": routing} if routing else {})} for chunk_id in ids]
+        response = await self._require_client().mget(index=index, body={"docs": docs}, params={"_source": "false"})
+        return {doc["_id"] for doc in response["docs"] if doc.get("found")}
+
+    async def delete_by_ids(self, index: str, ids: Sequence[str]) -> int:
+        if not ids:
+            return 0
+        response = await self._require_client().delete_by_query(
+            index=index,
+            body={"query": {"ids": {"values": list(ids)}}},
+            params={"conflicts": "proceed", "refresh": "true"},
+        )
+        return int(response.get("deleted", 0))
+
+    def get_suggest_index_settings(self) -> dict[str, Any]:
+        """
+        Settings for the search-as-you-type index on file names and titles.
+
+        Names are indexed as edge n-grams so a prefix lookup is a plain term
+        match. The index is tiny (one entry per file), so one shard is enough.
+        """
+        prefix_field = {
+            "type": "text",
+            "analyzer": "standard",
+            "fields": {
+                "prefix": {
+                    "type": "text",
+                    "analyzer": "autocomplete",
+                    "search_analyzer": "autocomplete_search",
+                },
+                "keyword": {"type": "keyword", "ignore_above": 256},
+            },
+        }
+        return {
+            "settings": {
+                "number_of_replicas": 1,
+                "number_of_shards": 1,
+                "analysis": {
+                    "filter": {
+                        "icu_normalization": {"type": "icu_normalizer"},
+                        "autocomplete_edge_ngram": {"type": "edge_ngram", "min_gram": 1, "max_gram": 20},
+                    },
+                    "analyzer": {
+                        "autocomplete": {
+                            "tokenizer": "standard",
+                            "filter": ["lowercase", "icu_normalization", "autocomplete_edge_ngram"],
+                        },
+                        "autocomplete_search": {
+                            "tokenizer": "standard",
+                            "filter": ["lowercase", "icu_normalization"],
+                        },
+                    },
+                },
+            },
+            "mappings": {
+                "properties": {
+                    "name": prefix_field,
+                    "title": prefix_field,
+                    "doc_id": {"type": "keyword"},
+                    "workspace": {"type": "keyword"},
+                    "connector": {"type": "keyword"},
+                    "content_type": {"type": "keyword"},
+                    "updated_at": {"type": "date"},
+                }
+            },
+        }
+
+    async def create_suggest_index(self, index: str) -> None:
+        client = self._require_client()
+        if await client.indices.exists(index=index):
+            return
+        _ = await client.indices.create(index=index, body=self.get_suggest_index_settings())
+        logger.info(f"Created OpenSearch suggestion index {index}")
+
+    async def upsert_suggestions(self, index: str, entries: Sequence[Mapping[str, Any]]) -> int:
+        actions = [
+            {
+                "_op_type": "index",
+                "_index": index,
+                "_id": entry["id"],
+                "_source": {key: value for key, value in entry.items() if key != "id"},
+            }
+            for entry in entries
+        ]
+        if not actions:
+            return 0
+        success, _ = await async_bulk(self._require_client(), actions, raise_on_error=True)
+        return int(success)
+
+    async def delete_suggestions(self, index: str, ids: Sequence[str]) -> int:
+        actions = [{"_op_type": "delete", "_index": index, "_id": entry_id} for entry_id in ids]
+        if not actions:
+            return 0
+        success, _ = await async_bulk(self._require_client(), actions, raise_on_error=False)
+        return int(success)
+
+    async def suggest(
+        self,
+        index: str,
+        prefix: str,
+        k: int = 10,
+        filters: Mapping[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        body: dict[str, Any] = {
+            "size": k,
+            "query": {
+                "bool": {
+                    "must": [
+                        {
+                            "multi_match": {
+                                "query": prefix,
+                                "fields": ["name.prefix^3", "title.prefix"],
+                                "operator": "and",
+                            }
+                        }
+                    ],
+                    # Boost names that start with the whole phrase
+                    "should": [{"match_phrase_prefix": {"name": {"query": prefix}}}],
+                    "filter": self._build_filter_clauses(filters),
+                }
+            },
+        }
+        response = await self._require_client().search(index=index, body=body)
+        return [{"id": raw["_id"], **raw["_source"]} for raw in response["hits"]["hits"]]
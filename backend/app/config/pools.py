@@ -0,0 +1,143 @@
+import bisect
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+# Processes of this app sharing the connection budgets below (API workers plus standalone job workers)
+POOL_PROCESSES = max(int(os.getenv("POOL_PROCESSES", os.getenv("WEB_CONCURRENCY", "1"))), 1)
+
+# Checkout wait histogram bucket bounds in seconds (cumulative, Prometheus style)
+WAIT_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+def _per_process(budget: int) -> int:
+    return max(budget // POOL_PROCESSES, 1)
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """
+    Connection pool sizes and timeouts for Postgres, OpenSearch and httpx.
+
+    Each `*_CONNECTION_BUDGET` is what the whole deployment may open to
+    that service; every process gets an equal share, so adding workers
+    does not exhaust `max_connections` on the server. A pool size set
+    explicitly overrides the share.
+    """
+    processes: int
+
+    postgres_pool_size: int
+    postgres_max_overflow: int
+    postgres_pool_timeout: float
+    postgres_pool_recycle: int
+
+    opensearch_pool_size: int
+    opensearch_timeout: float
+
+    http_pool_size: int
+    http_keepalive_expiry: float
+    http_timeout: float
+    http_connect_timeout: float
+    http_pool_timeout: float
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        return cls(
+            processes=POOL_PROCESSES,
+            postgres_pool_size=_env_int("POSTGRES_POOL_SIZE", _per_process(_env_int("POSTGRES_CONNECTION_BUDGET", 20))),
+            postgres_max_overflow=_env_int("POSTGRES_MAX_OVERFLOW", 0),
+            postgres_pool_timeout=_env_float("POSTGRES_POOL_TIMEOUT", 10.0),
+            postgres_pool_recycle=_env_int("POSTGRES_POOL_RECYCLE", 300),
+            opensearch_pool_size=_env_int("OPENSEARCH_POOL_SIZE", _per_process(_env_int("OPENSEARCH_CONNECTION_BUDGET", 100))),
+            opensearch_timeout=_env_float("OPENSEARCH_TIMEOUT", 30.0),
+            http_pool_size=_env_int("HTTP_POOL_SIZE", _per_process(_env_int("HTTP_CONNECTION_BUDGET", 200))),
+            http_keepalive_expiry=_env_float("HTTP_KEEPALIVE_EXPIRY", 60.0),
+            http_timeout=_env_float("HTTP_TIMEOUT", 180.0),
+            http_connect_timeout=_env_float("HTTP_CONNECT_TIMEOUT", 20.0),
+            http_pool_timeout=_env_float("HTTP_POOL_TIMEOUT", 30.0),
+        )
+
+
+pool_settings = PoolSettings.from_env()
+
+
+class PoolStats:
+    """
+    Live counters of one connection pool.
+
+    The pool's owner records each checkout's wait and each checkout
+    timeout, and binds a gauge reading how many connections are in use
+    and idle right now. Recording is a bisect and two increments.
+    """
+
+    def __init__(self, name: str, size: int):
+        self.name: str = name
+        self.size: int = size
+        self.bucket_counts: list[int] = [0] * (len(WAIT_BUCKETS) + 1)
+        self.wait_sum: float = 0.0
+        self.checkouts: int = 0
+        self.timeouts: int = 0
+        self._gauge: Callable[[], tuple[int, int]] | None = None
+
+    def bind(self, gauge: Callable[[], tuple[int, int]], size: int | None = None) -> None:
+        """Read (in use, idle) from the live pool."""
+        self._gauge = gauge
+        if size is not None:
+            self.size = size
+
+    def observe_wait(self, seconds: float) -> None:
+        self.bucket_counts[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+        self.wait_sum += seconds
+        self.checkouts += 1
+
+    def observe_timeout(self) -> None:
+        self.timeouts += 1
+
+    def gauge(self) -> tuple[int, int]:
+        if self._gauge is None:
+            return 0, 0
+        try:
+            return self._gauge()
+        except Exception as _:
+            return 0, 0
+
+    def snapshot(self) -> dict[str, Any]:
+        in_use, idle = self.gauge()
+        cumulative: dict[str, int] = {}
+        total = 0
+        for bound, count in zip([*map(str, WAIT_BUCKETS), "+Inf"], self.bucket_counts):
+            total += count
+            cumulative[bound] = total
+        return {
+            "size": self.size,
+            "in_use": in_use,
+            "idle": idle,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_sum": self.wait_sum,
+            "wait_seconds_buckets": cumulative,
+        }
+
+
+pools: dict[str, PoolStats] = {
+    "postgres": PoolStats("postgres", pool_settings.postgres_pool_size + pool_settings.postgres_max_overflow),
+    "opensearch": PoolStats("opensearch", pool_settings.opensearch_pool_size),
+    "http": PoolStats("http", pool_settings.http_pool_size),
+}
+
+
+def pool_stats() -> dict[str, Any]:
+    """Snapshot of every pool, with the settings they were built from."""
+    return {
+        "processes": pool_settings.processes,
+        "pools": {name: stats.snapshot() for name, stats in pools.items()},
+    }
@@ -1,15 +1,33 @@
 import os
+import time
 from collections.abc import AsyncGenerator
 
 from app.config.logger import create_logger
+from app.config.pools import pool_settings, pools
 from app.utils.db_utils import db_url
-from sqlalchemy import text
+from sqlalchemy import exc, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 logger = create_logger(__name__)
 
 env = os.getenv("ENV", "development")
 
+
+class ObservedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool recording checkout waits and timeouts in `pools["postgres"]`."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            pools["postgres"].observe_timeout()
+            raise
+        pools["postgres"].observe_wait(time.perf_counter() - started)
+        return record
+
+
 class PostgresManager:
     def __init__(self):
         self.engine = None
@@ -20,11 +38,16 @@ class PostgresManager:
         self.engine = create_async_engine(
             self.db_url,
             echo=env == "development",
-            pool_size=20,
-            max_overflow=0,
+            poolclass=ObservedQueuePool,
+            pool_size=pool_settings.postgres_pool_size,
+            max_overflow=pool_settings.postgres_max_overflow,
+            pool_timeout=pool_settings.postgres_pool_timeout,
             pool_pre_ping=True,
-            pool_recycle=300,
+            pool_recycle=pool_settings.postgres_pool_recycle,
         )
+        # Read through the engine, which swaps in a new pool on dispose()
+        engine = self.engine
+        pools["postgres"].bind(lambda: (engine.pool.checkedout(), engine.pool.checkedin()))  # pyright: ignore[reportAttributeAccessIssue]
 
         self.async_session_maker = async_sessionmaker(
             self.engine, class_=AsyncSession, expire_on_commit=False
@@ -42,6 +65,13 @@ class PostgresManager:
 
         logger.info("SQLAlchemy database initialized successfully")
 
+    async def ping(self) -> None:
+        """Round trip on a pooled connection; fails when the pool is exhausted as well as when the server is down."""
+        if not self.engine:
+            raise Exception("Database pool not initialized")
+        async with self.engine.connect() as connection:
+            _ = await connection.execute(text("SELECT 1"))
+
     async def close(self):
         if self.engine:
             await self.engine.dispose()
@@ -0,0 +1,226 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any
+
+from app.config.logger import create_logger
+from app.config.pools import POOL_PROCESSES
+
+logger = create_logger(__name__)
+
+# Account limits for the whole deployment (0 disables a limit); like the connection
+# budgets, every one of the POOL_PROCESSES processes enforces an equal share
+OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", "5000"))
+OPENAI_TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", "2000000"))
+
+# Share of capacity background work may not use, kept free for interactive bursts
+BACKGROUND_RESERVE = float(os.getenv("OPENAI_BACKGROUND_RESERVE", "0.1"))
+
+# Background reserve of standalone job workers, which send only background requests;
+# the part of their share they leave unused is account headroom for the API processes
+WORKER_BACKGROUND_RESERVE = float(os.getenv("OPENAI_WORKER_BACKGROUND_RESERVE", "0.5"))
+
+# Recent waits kept per priority for percentiles
+WAIT_SAMPLES = 1024
+
+
+class Priority(IntEnum):
+    """Lower values are served first."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+@dataclass
+class Permit:
+    priority: Priority
+    tokens: int
+    waited: float
+
+
+def _per_process(limit: int) -> int:
+    return max(limit // POOL_PROCESSES, 1) if limit > 0 else 0
+
+
+class _Bucket:
+    """Token bucket refilled continuously at `per_minute / 60` per second."""
+
+    def __init__(self, per_minute: int):
+        self.capacity: float = float(per_minute)
+        self.rate: float = per_minute / 60.0
+        self.level: float = self.capacity
+        self.updated: float = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def fits(self, amount: float, floor: float) -> bool:
+        return not self.enabled or self.level - amount >= floor * self.capacity
+
+    def delay(self, amount: float, floor: float) -> float:
+        """Seconds until `amount` fits above the floor."""
+        if not self.enabled:
+            return 0.0
+        return max(0.0, (amount + floor * self.capacity - self.level) / self.rate)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: Priority
+    seq: int
+    tokens: int
+    enqueued_at: float
+    future: asyncio.Future[Permit]
+
+
+class RateGovernor:
+    """
+    Process-wide OpenAI rate limiting with priority classes.
+
+    Requests and tokens are drawn from two token buckets sized to this
+    process's share of the account's per-minute limits; processes do not
+    coordinate, so the share is fixed even while other processes are idle. Waiters are served strictly by priority,
+    then arrival, so interactive chat never queues behind a backfill.
+    Background work is also kept out of the last `background_reserve` of
+    each bucket, leaving headroom for the next interactive request.
+
+    Token costs are estimates taken before the call; `settle` corrects the
+    bucket with the usage the API reported.
+    """
+
+    def __init__(
+        self,
+        rpm: int = _per_process(OPENAI_RPM_LIMIT),
+        tpm: int = _per_process(OPENAI_TPM_LIMIT),
+        background_reserve: float = BACKGROUND_RESERVE,
+    ):
+        self.requests: _Bucket = _Bucket(rpm)
+        self.tokens: _Bucket = _Bucket(tpm)
+        self.background_reserve: float = background_reserve
+
+        self._queue: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._dispatcher: asyncio.Task[None] | None = None
+
+        self._waits: dict[Priority, deque[float]] = {priority: deque(maxlen=WAIT_SAMPLES) for priority in Priority}
+        self._granted: dict[Priority, int] = {priority: 0 for priority in Priority}
+
+    def _floor(self, priority: Priority) -> float:
+        return self.background_reserve if priority is Priority.BACKGROUND else 0.0
+
+    def _cost(self, tokens: int, priority: Priority) -> int:
+        # Oversized requests would otherwise never fit
+        if not self.tokens.enabled:
+            return max(tokens, 1)
+        return max(1, min(tokens, int(self.tokens.capacity * (1 - self._floor(priority)))))
+
+    def _fits(self, tokens: int, priority: Priority) -> bool:
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        floor = self._floor(priority)
+        return self.requests.fits(1, floor) and self.tokens.fits(tokens, floor)
+
+    def _grant(self, tokens: int, priority: Priority, waited: float) -> Permit:
+        self.requests.level -= 1
+        self.tokens.level -= tokens
+        self._granted[priority] += 1
+        self._waits[priority].append(waited)
+        return Permit(priority=priority, tokens=tokens, waited=waited)
+
+    async def acquire(self, tokens: int, priority: Priority = Priority.INTERACTIVE) -> Permit:
+        """Wait until one request of about `tokens` tokens may be sent."""
+        tokens = self._cost(tokens, priority)
+        if not self._queue and self._fits(tokens, priority):
+            return self._grant(tokens, priority, 0.0)
+
+        waiter = _Waiter(priority, next(self._seq), tokens, time.monotonic(), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, waiter)
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        try:
+            permit = await waiter.future
+        except asyncio.CancelledError:
+            # Granted just before the caller was cancelled
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(waiter.future.result())
+            raise
+        if permit.waited > 1.0:
+            logger.info("Waited %.2fs for OpenAI capacity (%s)", permit.waited, priority.name.lower())
+        return permit
+
+    async def _dispatch(self) -> None:
+        while self._queue:
+            head = self._queue[0]
+            if head.future.cancelled():
+                _ = heapq.heappop(self._queue)
+                continue
+
+            if self._fits(head.tokens, head.priority):
+                _ = heapq.heappop(self._queue)
+                head.future.set_result(self._grant(head.tokens, head.priority, time.monotonic() - head.enqueued_at))
+                continue
+
+            floor = self._floor(head.priority)
+            delay = max(self.requests.delay(1, floor), self.tokens.delay(head.tokens, floor), 0.001)
+            # A higher-priority arrival becomes the new head and wakes us early
+            self._wakeup.clear()
+            try:
+                _ = await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def settle(self, permit: Permit, used_tokens: int | None) -> None:
+        """Replace the estimated token cost with the usage reported by the API."""
+        if used_tokens is not None:
+            self.tokens.level += permit.tokens - used_tokens
+
+    def release(self, permit: Permit) -> None:
+        """Return a permit whose request was never sent."""
+        self.requests.level += 1
+        self.tokens.level += permit.tokens
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth, wait times and remaining capacity per priority."""
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+
+        queued = {priority: 0 for priority in Priority}
+        oldest = {priority: 0.0 for priority in Priority}
+        for waiter in self._queue:
+            if not waiter.future.done():
+                queued[waiter.priority] += 1
+                oldest[waiter.priority] = max(oldest[waiter.priority], now - waiter.enqueued_at)
+
+        priorities: dict[str, Any] = {}
+        for priority in Priority:
+            waits = sorted(self._waits[priority])
+            priorities[priority.name.lower()] = {
+                "queue_depth": queued[priority],
+                "oldest_wait_seconds": oldest[priority],
+                "granted": self._granted[priority],
+                "wait_seconds_p50": waits[len(waits) // 2] if waits else 0.0,
+                "wait_seconds_p95": waits[int(len(waits) * 0.95)] if waits else 0.0,
+                "wait_seconds_max": waits[-1] if waits else 0.0,
+            }
+        return {
+            "requests_available": self.requests.level if self.requests.enabled else None,
+            "tokens_available": self.tokens.level if self.tokens.enabled else None,
+            "priorities": priorities,
+        }
+
+
+rate_governor = RateGovernor()
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from app.config.admission_control import AdmissionController, admission_controller
+from app.config.logger import create_logger
+from app.config.pools import pools
+from app.config.rate_governor import rate_governor
+
+logger = create_logger(__name__)
+
+# Seconds between dependency probes, and how long one probe may take
+READINESS_PROBE_INTERVAL = float(os.getenv("READINESS_PROBE_INTERVAL", "5"))
+READINESS_PROBE_TIMEOUT = float(os.getenv("READINESS_PROBE_TIMEOUT", "2"))
+
+# A probe result older than this many intervals counts as failed (the probe loop is stuck)
+READINESS_STALE_INTERVALS = 3
+
+# Share of an admission lane's queue in use at which the worker reports itself overloaded
+READINESS_QUEUE_FILL = float(os.getenv("READINESS_QUEUE_FILL", "0.8"))
+
+
+@dataclass
+class ProbeResult:
+    ok: bool
+    latency: float
+    checked_at: float
+    error: str | None = None
+
+
+class ReadinessMonitor:
+    """
+    Cached answer to "should this worker get traffic".
+
+    A background loop probes each dependency every `interval` seconds;
+    readiness checks only read the cached results together with the
+    in-process pool and queue gauges, so load balancers polling often
+    never reach the databases. The worker is unready while starting or
+    shutting down, when a probe failed or went stale, when a pool timed
+    out a checkout since the last round, or when an admission lane's
+    queue is nearly full.
+    """
+
+    def __init__(
+        self,
+        interval: float = READINESS_PROBE_INTERVAL,
+        timeout: float = READINESS_PROBE_TIMEOUT,
+        queue_fill: float = READINESS_QUEUE_FILL,
+        controller: AdmissionController | None = None,
+    ):
+        self.interval: float = interval
+        self.timeout: float = timeout
+        self.queue_fill: float = queue_fill
+        self.controller: AdmissionController = controller or admission_controller
+        self.probes: dict[str, Callable[[], Awaitable[Any]]] = {}
+        self.results: dict[str, ProbeResult] = {}
+        self.draining: bool = False
+        # Checkout timeouts per pool at the previous round, and how many happened during it
+        self._timeouts_seen: dict[str, int] = {name: stats.timeouts for name, stats in pools.items()}
+        self.recent_timeouts: dict[str, int] = {name: 0 for name in pools}
+        self._wake: asyncio.Event = asyncio.Event()
+
+    def attach(self, probes: dict[str, Callable[[], Awaitable[Any]]]) -> None:
+        """Start probing `probes` (name -> coroutine raising on failure) once the resources are open."""
+        self.probes = probes
+        self.results = {}
+        self.draining = False
+        # Probe right away rather than at the next interval
+        self._wake.set()
+
+    def detach(self) -> None:
+        """Report unready from now on, so traffic drains before the resources close."""
+        self.draining = True
+        self.probes = {}
+
+    async def _probe(self, name: str, probe: Callable[[], Awaitable[Any]]) -> None:
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(probe(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            result = ProbeResult(False, time.monotonic() - started, time.monotonic(), f"timed out after {self.timeout}s")
+        except Exception as e:
+            result = ProbeResult(False, time.monotonic() - started, time.monotonic(), f"{type(e).__name__}: {e}")
+        else:
+            result = ProbeResult(True, time.monotonic() - started, time.monotonic())
+        previous = self.results.get(name)
+        if previous is not None and previous.ok != result.ok:
+            if result.ok:
+                logger.info("Readiness probe %s recovered", name)
+            else:
+                logger.warning("Readiness probe %s failed: %s", name, result.error)
+        self.results[name] = result
+
+    async def probe_all(self) -> None:
+        """One round: every dependency probed concurrently, pool timeouts counted since the last round."""
+        probes = self.probes
+        if probes:
+            _ = await asyncio.gather(*(self._probe(name, probe) for name, probe in probes.items()))
+        for name, stats in pools.items():
+            self.recent_timeouts[name] = stats.timeouts - self._timeouts_seen.get(name, 0)
+            self._timeouts_seen[name] = stats.timeouts
+
+    async def sleep(self) -> None:
+        """Wait until the next round is due, or until `attach` asks for one."""
+        try:
+            _ = await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    def report(self) -> dict[str, Any]:
+        """Readiness with the reasons against it, probe results, pool saturation and queue depth."""
+        now = time.monotonic()
+        reasons: list[str] = []
+        if self.draining:
+            reasons.append("shutting down")
+        elif not self.probes:
+            reasons.append("starting")
+
+        dependencies: dict[str, Any] = {}
+        for name in self.probes:
+            result = self.results.get(name)
+            if result is None:
+                reasons.append(f"{name}: not probed yet")
+                continue
+            age = now - result.checked_at
+            dependencies[name] = {
+                "ok": result.ok,
+                "latency_ms": round(result.latency * 1000, 1),
+                "age_seconds": round(age, 1),
+                "error": result.error,
+            }
+            if not result.ok:
+                reasons.append(f"{name}: {result.error}")
+            elif age > self.interval * READINESS_STALE_INTERVALS:
+                reasons.append(f"{name}: last probe {age:.0f}s ago")
+
+        saturation: dict[str, Any] = {}
+        for name, stats in pools.items():
+            in_use, idle = stats.gauge()
+            saturation[name] = {
+                "in_use": in_use,
+                "idle": idle,
+                "size": stats.size,
+                "saturation": round(in_use / stats.size, 3) if stats.size else 0.0,
+                "recent_timeouts": self.recent_timeouts.get(name, 0),
+            }
+            if self.recent_timeouts.get(name, 0):
+                reasons.append(f"{name} pool: {self.recent_timeouts[name]} checkout timeouts")
+
+        queues: dict[str, Any] = {}
+        for lane in self.controller.lanes.values():
+            queues[lane.name] = {"depth": len(lane.waiters), "max": lane.max_queue, "in_flight": lane.in_flight}
+            if lane.max_queue and len(lane.waiters) >= self.queue_fill * lane.max_queue:
+                reasons.append(f"{lane.name} queue: {len(lane.waiters)}/{lane.max_queue}")
+        llm_queue = sum(priority["queue_depth"] for priority in rate_governor.stats()["priorities"].values())
+
+        return {
+            "ready": not reasons,
+            "reasons": reasons,
+            "dependencies": dependencies,
+            "pools": saturation,
+            "admission_queues": queues,
+            "llm_queue_depth": llm_queue,
+        }
+
+
+readiness = ReadinessMonitor()
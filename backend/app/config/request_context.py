@@ -0,0 +1,93 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any
+
+# Dependencies whose time is broken down per request
+SPAN_KINDS = ("postgres", "opensearch", "openai", "oauth")
+
+
+class RequestTrace:
+    """Identity of one request (or job) and the time it spent in each dependency so far."""
+    __slots__ = ("request_id", "method", "path", "task_id", "started", "spans")
+
+    def __init__(self, request_id: str, method: str | None = None, path: str | None = None, task_id: str | None = None):
+        self.request_id: str = request_id
+        self.method: str | None = method
+        self.path: str | None = path
+        self.task_id: str | None = task_id
+        self.started: float = time.perf_counter()
+        # kind -> [calls, seconds]
+        self.spans: dict[str, list[float]] = {}
+
+    def add(self, kind: str, seconds: float) -> None:
+        entry = self.spans.get(kind)
+        if entry is None:
+            self.spans[kind] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def breakdown(self) -> dict[str, dict[str, float]]:
+        """Calls and milliseconds per dependency. Concurrent calls each count, so the sum can exceed the elapsed time."""
+        return {kind: {"calls": int(calls), "ms": round(seconds * 1000, 1)} for kind, (calls, seconds) in self.spans.items()}
+
+    def summary(self) -> str:
+        """`postgres 12.3ms/4, openai 1830.0ms/1` for log messages."""
+        return ", ".join(f"{kind} {seconds * 1000:.1f}ms/{int(calls)}" for kind, (calls, seconds) in self.spans.items()) or "no dependency calls"
+
+
+_trace: ContextVar[RequestTrace | None] = ContextVar("request_trace", default=None)
+# Kind of the span the current task is inside, so nested calls of the same kind are not counted twice
+_open_span: ContextVar[str | None] = ContextVar("open_span", default=None)
+
+
+def current_trace() -> RequestTrace | None:
+    return _trace.get()
+
+
+@contextmanager
+def traced(trace: RequestTrace) -> Iterator[RequestTrace]:
+    """Make `trace` current for the enclosed code and the tasks it starts."""
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+def record_span(kind: str, seconds: float) -> None:
+    """Add a finished dependency call to the current trace, if any."""
+    trace = _trace.get()
+    if trace is not None:
+        trace.add(kind, seconds)
+
+
+def enter_span(kind: str) -> Token[str | None] | None:
+    """Open a span; None outside a trace or inside a span of the same kind, in which case nothing is recorded."""
+    if _trace.get() is None or _open_span.get() == kind:
+        return None
+    return _open_span.set(kind)
+
+
+def exit_span(kind: str, token: Token[str | None], seconds: float) -> None:
+    _open_span.reset(token)
+    record_span(kind, seconds)
+
+
+def log_context() -> dict[str, Any] | None:
+    """Fields the log filter copies onto records emitted inside a trace."""
+    trace = _trace.get()
+    if trace is None:
+        return None
+    return {
+        "request_id": trace.request_id,
+        "path": trace.path,
+        "task_id": trace.task_id,
+        "duration": round(trace.elapsed() * 1000, 1),
+        "timings": trace.breakdown(),
+    }
@@ -0,0 +1,180 @@
+import os
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+# Dimension of new chunk indexes; below 1536 requests shortened text-embedding-3 vectors
+DEFAULT_EMBEDDING_DIMENSION = int(os.getenv("EMBEDDING_DIMENSION", "1536"))
+DEFAULT_NUMBER_OF_SHARDS = 3
+
+
+class IndexNotFoundError(KeyError):
+    """The index or alias does not exist (yet)."""
+
+
+@dataclass
+class SearchHit:
+    """A single chunk returned by a search backend."""
+    id: str
+    score: float
+    doc_id: str
+    text: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+    created_at: str | None = None
+    vector: Sequence[float] | None = None
+
+
+class SearchBackend(ABC):
+    """
+    Interface shared by every chunk search backend.
+
+    Documents follow the mapping from `get_vector_index_settings()`:
+    `chunk_vector`, `text`, `doc_id`, `metadata` and `created_at`, plus an
+    optional `id` that is used as the document id.
+
+    Filters are a mapping of field path (`doc_id`, `metadata.workspace`, ...)
+    to a value or a list of accepted values.
+
+    Every `index` argument may also be an alias. Aliases follow OpenSearch
+    semantics: an alias filter is applied to reads and an alias routing value
+    pins reads and writes to a single shard.
+    """
+
+    @abstractmethod
+    async def initialize(self) -> None:
+        """Open connections or storage used by the backend."""
+
+    async def ping(self) -> None:
+        """Raise if the backend cannot serve requests; used by the readiness probes."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release connections or storage used by the backend."""
+
+    @abstractmethod
+    async def create_index(
+        self,
+        index: str,
+        embedding_dimension: int = DEFAULT_EMBEDDING_DIMENSION,
+        number_of_shards: int = DEFAULT_NUMBER_OF_SHARDS,
+        meta: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Create a chunk index if it does not exist yet, storing `meta` alongside it."""
+
+    @abstractmethod
+    async def get_index_meta(self, index: str) -> dict[str, Any]:
+        """Return the metadata an index was created with."""
+
+    @abstractmethod
+    async def delete_index(self, index: str) -> None:
+        """Drop a chunk index if it exists."""
+
+    @abstractmethod
+    async def index_exists(self, index: str) -> bool:
+        """Check whether an index exists."""
+
+    @abstractmethod
+    async def update_aliases(self, actions: Sequence[Mapping[str, Any]]) -> None:
+        """
+        Apply alias actions atomically.
+
+        Actions use the OpenSearch `_aliases` format, e.g.
+        `{"add": {"index": ..., "alias": ..., "routing": ..., "filter": ...}}`
+        or `{"remove": {"index": ..., "alias": ...}}`.
+        """
+
+    @abstractmethod
+    async def get_alias_indices(self, alias: str) -> list[str]:
+        """Return the indices an alias points to, or an empty list."""
+
+    @abstractmethod
+    async def index_chunks(
+        self, index: str, chunks: Sequence[Mapping[str, Any]], overwrite: bool = True
+    ) -> int:
+        """
+        Write chunks into an index and return how many were written.
+
+        With `overwrite=False` chunks whose id already exists are skipped
+        instead of replaced.
+        """
+
+    @abstractmethod
+    async def knn_search(
+        self,
+        index: str,
+        vector: Sequence[float],
+        k: int = 10,
+        filters: Mapping[str, Any] | None = None,
+        include_vectors: bool = False,
+    ) -> list[SearchHit]:
+        """Return the k nearest chunks to a query vector."""
+
+    @abstractmethod
+    async def text_search(
+        self,
+        index: str,
+        query: str,
+        k: int = 10,
+        filters: Mapping[str, Any] | None = None,
+    ) -> list[SearchHit]:
+        """Return the k best BM25 matches for a query string."""
+
+    @abstractmethod
+    def scan(self, index: str, batch_size: int = 500) -> AsyncIterator[list[SearchHit]]:
+        """Iterate over every chunk of an index in batches, without vectors."""
+
+    @abstractmethod
+    async def delete_by_doc_ids(self, index: str, doc_ids: Sequence[str]) -> int:
+        """Delete every chunk belonging to the given documents."""
+
+    @abstractmethod
+    async def doc_versions(self, index: str, doc_ids: Sequence[str]) -> dict[str, int | None]:
+        """Latest `metadata.doc_version` of each document; documents without chunks are left out."""
+
+    @abstractmethod
+    async def existing_ids(self, index: str, ids: Sequence[str], routing: str | None = None) -> set[str]:
+        """Return which of the chunk ids are in the index, including writes not yet visible to search."""
+
+    @abstractmethod
+    async def delete_by_ids(self, index: str, ids: Sequence[str]) -> int:
+        """Delete chunks by id."""
+
+    # Suggestion indexes hold one small entry per file: `id`, `name`, an
+    # optional `title` and flat keyword fields such as `workspace`.
+
+    @abstractmethod
+    async def create_suggest_index(self, index: str) -> None:
+        """Create a prefix-matching suggestion index if it does not exist yet."""
+
+    @abstractmethod
+    async def upsert_suggestions(self, index: str, entries: Sequence[Mapping[str, Any]]) -> int:
+        """Insert or replace suggestion entries by id."""
+
+    @abstractmethod
+    async def delete_suggestions(self, index: str, ids: Sequence[str]) -> int:
+        """Remove suggestion entries by id."""
+
+    @abstractmethod
+    async def suggest(
+        self,
+        index: str,
+        prefix: str,
+        k: int = 10,
+        filters: Mapping[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return up to k entries whose name or title words start with every word of `prefix`."""
+
+
+def create_search_backend() -> SearchBackend:
+    """Create the backend selected by the SEARCH_BACKEND environment variable."""
+    backend = os.getenv("SEARCH_BACKEND", "opensearch").lower()
+
+    if backend == "opensearch":
+        from app.config.opensearch_manager import OpenSearchManager
+        return OpenSearchManager()
+    if backend == "local":
+        from app.config.local_search_backend import LocalSearchBackend
+        return LocalSearchBackend(root_path=os.getenv("LOCAL_SEARCH_PATH") or None)
+
+    raise ValueError(f"Unsupported search backend: {backend}")
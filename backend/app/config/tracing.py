@@ -0,0 +1,96 @@
+import os
+import re
+import time
+from collections import deque
+from typing import Any
+from uuid import uuid4
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.logger import create_logger
+from app.config.request_context import RequestTrace, traced
+
+logger = create_logger(__name__)
+
+# Requests taking longer than this are logged and kept with their timing breakdown
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "2.0"))
+
+# Slow requests kept for /health/slow-requests
+SLOW_REQUEST_SAMPLES = int(os.getenv("SLOW_REQUEST_SAMPLES", "100"))
+
+# Long-lived by design, never reported as slow
+SLOW_REQUEST_EXEMPT = ("/rms/status/stream",)
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# Caller-supplied ids are accepted only if short and plain, since they end up in logs
+_REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+slow_requests: deque[dict[str, Any]] = deque(maxlen=SLOW_REQUEST_SAMPLES)
+
+
+def _request_id(scope: Scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"x-request-id":
+            candidate = value.decode("latin-1")
+            if _REQUEST_ID_PATTERN.fullmatch(candidate):
+                return candidate
+            break
+    return uuid4().hex
+
+
+class RequestContextMiddleware:
+    """
+    Gives each request an id (the caller's `X-Request-ID`, or a new one)
+    and a `RequestTrace` that repository, OpenSearch, OpenAI and OAuth
+    calls add their time to. Log records emitted while handling it carry
+    the id, path and breakdown; the id is echoed in the response, and
+    slow requests are logged and kept in `slow_requests`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(_request_id(scope), scope["method"], scope["path"])
+        status = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, trace.request_id)
+            await send(message)
+
+        with traced(trace):
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                elapsed = trace.elapsed()
+                if elapsed >= SLOW_REQUEST_SECONDS and trace.path not in SLOW_REQUEST_EXEMPT:
+                    _report_slow(trace, status, elapsed)
+
+
+def _report_slow(trace: RequestTrace, status: int, elapsed: float) -> None:
+    slow_requests.append(
+        {
+            "request_id": trace.request_id,
+            "method": trace.method,
+            "path": trace.path,
+            "status": status,
+            "finished_at": time.time(),
+            "duration_ms": round(elapsed * 1000, 1),
+            "timings": trace.breakdown(),
+        }
+    )
+    logger.warning("Slow request %s %s %d took %.2fs (%s)", trace.method, trace.path, status, elapsed, trace.summary())
+
+
+def slow_request_report() -> dict[str, Any]:
+    """Most recent slow requests, newest first."""
+    return {"threshold_seconds": SLOW_REQUEST_SECONDS, "requests": list(reversed(slow_requests))}
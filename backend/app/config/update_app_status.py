@@ -1,15 +1,26 @@
-import asyncio
-
 import aiofiles
 
+from app.config.readiness import ReadinessMonitor
+
 STATUS_FILE_PATH = "/tmp/app.status"
 
 
-async def update_app_status():
+async def update_app_status(monitor: ReadinessMonitor):
+    """
+    Probe dependencies every `monitor.interval` seconds and write the
+    outcome to STATUS_FILE_PATH: "OK" only while the worker is ready,
+    otherwise "NOT READY" followed by the reasons.
+    """
     while True:
+        try:
+            await monitor.probe_all()
+        except Exception as e:
+            print(f"Readiness probes failed: {e}")
+        report = monitor.report()
+        status = "OK\n" if report["ready"] else "NOT READY: " + "; ".join(report["reasons"]) + "\n"
         try:
             async with aiofiles.open(STATUS_FILE_PATH, "w") as f:
-                await f.write("OK\n")
+                await f.write(status)
         except Exception as e:
             print(f"Failed to write status file: {e}")
-        await asyncio.sleep(5)
\ No newline at end of file
+        await monitor.sleep()
@@ -0,0 +1,84 @@
+from collections.abc import AsyncIterator
+from typing import Annotated
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+
+from app.config.lifespan import Context, get_ctx_from_request
+from app.config.logger import create_logger
+from app.repositories.conversation import ConversationRepository
+from app.services.chat_service import ChatService
+from app.dto.base import BaseResponse
+from app.dto.chat import ChatMessageSchema, ChatMessagesResponse, ChatMessagesResponseCore, ChatRequest
+from app.enums.workspace import Workspace
+from app.utils.sse import SSE_HEADERS, format_sse
+
+logger = create_logger(__name__)
+
+api = APIRouter()
+
+CONVERSATION_NOT_FOUND = "Conversation not found."
+
+
+@api.post("/chat")
+async def chat(
+    request: ChatRequest, ctx: Annotated[Context, Depends(get_ctx_from_request)]
+) -> Response:
+    """Stream a RAG answer as Server-Sent Events (citations, token, done, error)."""
+    # Checked up front: once the stream starts, the 200 status has been sent
+    if request.conversation_id is not None:
+        conversation_repository = ConversationRepository(ctx.db_session)
+        if await conversation_repository.find_by(id=request.conversation_id, workspace=request.workspace) is None:
+            return BaseResponse[None](
+                code=404, success=False, message=CONVERSATION_NOT_FOUND, response=None
+            ).render_json(status_code=404)
+
+    chat_service = ChatService(ctx=ctx)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event, data in chat_service.stream_answer(request):
+                yield format_sse(event, data)
+        except Exception as _:
+            logger.error("Failed to stream chat answer.", exc_info=True)
+            yield format_sse("error", {"message": "Failed to generate an answer."})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@api.get("/chat/conversations/{conversation_id}/messages")
+async def get_messages(
+    conversation_id: UUID,
+    ctx: Annotated[Context, Depends(get_ctx_from_request)],
+    workspace: Workspace = Workspace.PERSONAL,
+    before: Annotated[int | None, Query(ge=1)] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50,
+) -> ChatMessagesResponse:
+    """Page backwards through a conversation of the workspace, newest page first."""
+    try:
+        conversation_repository = ConversationRepository(ctx.db_session)
+        if await conversation_repository.find_by(id=conversation_id, workspace=workspace) is None:
+            return ChatMessagesResponse(
+                code=404,
+                success=False,
+                message=CONVERSATION_NOT_FOUND,
+                response=ChatMessagesResponseCore(),
+            ).render_json(status_code=404)
+
+        # One extra row tells whether an older page exists
+        messages = await conversation_repository.messages_before(conversation_id, before, limit + 1)
+        has_more = len(messages) > limit
+        return ChatMessagesResponse(
+            response=ChatMessagesResponseCore(
+                messages=[ChatMessageSchema.model_validate(message) for message in messages[-limit:]],
+                has_more=has_more,
+            )
+        )
+    except Exception as _:
+        logger.error("Failed to get chat messages.", exc_info=True)
+        return ChatMessagesResponse(
+            code=500,
+            success=False,
+            message="Failed to get chat messages.",
+            response=ChatMessagesResponseCore(),
+        )
@@ -0,0 +1,55 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends
+
+from app.config.lifespan import Context, get_ctx_from_request
+from app.config.logger import create_logger
+from app.enums.connector import Connector
+from app.enums.item_type import ItemType
+from app.enums.sync_status import SyncStatus
+from app.services.job_service import JobService
+from app.dto.file import DeleteRequest, OperationResponse, OperationResponseCore, OperationResult
+
+logger = create_logger(__name__)
+
+api = APIRouter()
+
+
+@api.post("/delete")
+async def delete_files(
+    request: DeleteRequest, ctx: Annotated[Context, Depends(get_ctx_from_request)]
+) -> OperationResponse:
+    """
+    Queue files for deletion; progress and failures arrive on the status stream.
+
+    Chunks do not record their folder, so folders are refused rather than
+    queued as a document id that matches nothing.
+    """
+    try:
+        job_service = JobService(ctx)
+
+        by_connector: dict[Connector, list[str]] = {}
+        results: list[OperationResult] = []
+        for item in request.items:
+            if item.item_type is ItemType.CONTAINER:
+                results.append(
+                    OperationResult(
+                        id=item.id,
+                        status=SyncStatus.DELETING_FAILED.value,
+                        error="Folders cannot be deleted, select the files in them instead.",
+                    )
+                )
+                continue
+            by_connector.setdefault(item.source, []).append(item.id)
+            results.append(OperationResult(id=item.id, status=SyncStatus.DELETING.value))
+        for connector, doc_ids in by_connector.items():
+            _ = await job_service.enqueue_delete_documents(request.workspace, connector, doc_ids)
+
+        return OperationResponse(response=OperationResponseCore(results=results))
+    except Exception as _:
+        logger.error("Failed to queue file deletion.", exc_info=True)
+        return OperationResponse(
+            code=500,
+            success=False,
+            message="Failed to queue file deletion.",
+            response=OperationResponseCore(),
+        )
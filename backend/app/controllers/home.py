@@ -1,4 +1,12 @@
 from fastapi import APIRouter, Response
+from fastapi.responses import JSONResponse
+
+from app.config.admission_control import admission_controller
+from app.config.metrics import render_metrics
+from app.config.pools import pool_stats
+from app.config.readiness import readiness
+from app.config.rate_governor import rate_governor
+from app.config.tracing import slow_request_report
 
 api = APIRouter()
 
@@ -9,4 +17,36 @@ async def root():
 
 @api.get("/health", include_in_schema=False)
 async def health():
-    return Response(status_code=200)
\ No newline at end of file
+    return Response(status_code=200)
+
+@api.get("/health/ready", include_in_schema=False)
+async def ready():
+    """Cached dependency probes, pool saturation and queue depth; 503 while this worker should get no traffic."""
+    report = readiness.report()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+@api.get("/health/llm", include_in_schema=False)
+async def llm_health():
+    """OpenAI rate governor queue depth, wait times and remaining capacity."""
+    return rate_governor.stats()
+
+@api.get("/health/admission", include_in_schema=False)
+async def admission_health():
+    """In-flight requests, queue depth and shed requests per route lane."""
+    return admission_controller.stats()
+
+@api.get("/health/pools", include_in_schema=False)
+async def pool_health():
+    """Postgres, OpenSearch and HTTP pools: in use, idle, checkout waits and timeouts."""
+    return pool_stats()
+
+@api.get("/health/slow-requests", include_in_schema=False)
+async def slow_requests():
+    """Recent requests over SLOW_REQUEST_SECONDS with their Postgres, OpenSearch, OpenAI and OAuth time."""
+    return slow_request_report()
+
+@api.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus exposition: route, repository, OpenSearch, OpenAI and OAuth latency, tokens and pools."""
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
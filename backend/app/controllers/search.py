@@ -0,0 +1,52 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query, Response
+
+from app.config.lifespan import Context, get_ctx_from_request
+from app.config.logger import create_logger
+from app.enums.workspace import Workspace
+from app.services.suggest_service import SUGGEST_CACHE_TTL, SuggestService
+from app.dto.search import SuggestResponse, SuggestResponseCore, SuggestionItem
+
+logger = create_logger(__name__)
+
+api = APIRouter()
+
+
+@api.get("/suggest")
+async def suggest(
+    response: Response,
+    ctx: Annotated[Context, Depends(get_ctx_from_request)],
+    q: Annotated[str, Query(max_length=100)],
+    workspace: Workspace = Workspace.PERSONAL,
+    limit: Annotated[int, Query(ge=1, le=20)] = 8,
+) -> SuggestResponse:
+    """Filename completions for search-as-you-type."""
+    try:
+        suggest_service = SuggestService(ctx.search_backend)
+
+        entries = await suggest_service.suggest(workspace, q, limit)
+
+        # Repeated prefixes while typing/backspacing are served by the browser
+        response.headers["Cache-Control"] = f"private, max-age={int(SUGGEST_CACHE_TTL)}"
+        return SuggestResponse(
+            response=SuggestResponseCore(
+                items=[
+                    SuggestionItem(
+                        id=entry["id"],
+                        name=entry.get("name", ""),
+                        title=entry.get("title"),
+                        contentType=entry.get("content_type"),
+                    )
+                    for entry in entries
+                ]
+            )
+        )
+    except Exception as _:
+        logger.error("Failed to get suggestions.", exc_info=True)
+        response.headers["Cache-Control"] = "no-store"
+        return SuggestResponse(
+            code=500,
+            success=False,
+            message="Failed to get suggestions.",
+            response=SuggestResponseCore(items=[]),
+        )
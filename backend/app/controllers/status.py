@@ -0,0 +1,61 @@
+import asyncio
+import os
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.config.event_hub import event_hub
+from app.config.logger import create_logger
+from app.enums.workspace import Workspace
+from app.utils.sse import SSE_HEADERS, SSE_HEARTBEAT, format_sse
+
+logger = create_logger(__name__)
+
+api = APIRouter()
+
+# Seconds between keep-alive comments on an idle status stream
+STATUS_STREAM_HEARTBEAT = float(os.getenv("STATUS_STREAM_HEARTBEAT", "15"))
+
+
+def _latest_per_item(events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Collapse a burst to the last event of each item, in arrival order."""
+    latest: dict[Any, dict[str, Any]] = {}
+    for event in events:
+        _ = latest.pop(event.get("id"), None)
+        latest[event.get("id")] = event
+    return list(latest.values())
+
+
+@api.get("/status/stream")
+async def status_stream(workspace: Workspace = Workspace.PERSONAL) -> StreamingResponse:
+    """
+    Stream file status transitions of a workspace as Server-Sent Events.
+
+    `status` events carry one item each (see `status_event`); `resync`
+    means events were missed and the listing should be refetched. The
+    stream holds no database session; all streams of the process share
+    the event hub's single Postgres connection.
+    """
+
+    async def events() -> AsyncIterator[str]:
+        async with event_hub.subscribe(workspace.value) as subscription:
+            while True:
+                try:
+                    first = await asyncio.wait_for(subscription.queue.get(), timeout=STATUS_STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    first = None
+                # Set on queue overflow and when the hub reconnects after missing notifications
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    _ = subscription.drain()
+                    yield format_sse("resync", {"workspace": workspace.value})
+                elif first is None:
+                    yield SSE_HEARTBEAT
+                else:
+                    # Whatever arrived meanwhile goes out in the same write
+                    burst = _latest_per_item([first, *subscription.drain()])
+                    yield "".join(format_sse("status", event) for event in burst)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
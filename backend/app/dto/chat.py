@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from app.dto.base import BaseDTOModel, BaseRequest, BaseResponse, BaseResponseCore, ModelSchemaBase
+from app.enums.connector import Connector
+from app.enums.message_role import MessageRole
+from app.enums.workspace import Workspace
+
+
+# Domain Models
+class Citation(BaseDTOModel):
+    """A retrieved chunk the answer may cite as [n]"""
+    index: int
+    chunk_id: str
+    doc_id: str
+    name: Optional[str] = None
+    url: Optional[str] = None
+    score: float
+    snippet: str
+
+
+class ChatMessageSchema(ModelSchemaBase):
+    seq: int
+    role: MessageRole
+    content: str
+    citations: Optional[list[Citation]] = None
+    created_at: datetime
+
+
+# Requests
+class ChatRequest(BaseRequest):
+    """Request model for a streamed chat answer."""
+
+    message: str
+    workspace: Workspace = Workspace.PERSONAL
+    connector: Optional[Connector] = None
+    doc_ids: Optional[list[str]] = None  # Restrict retrieval to selected files
+    conversation_id: Optional[UUID] = None  # Continue a conversation; a new one is started when omitted
+
+
+# Response Cores
+class ChatMessagesResponseCore(BaseResponseCore):
+    """Response core for a page of conversation messages."""
+
+    messages: list[ChatMessageSchema] = []
+    has_more: bool = False
+
+
+# Responses
+class ChatMessagesResponse(BaseResponse[ChatMessagesResponseCore]):
+    response: ChatMessagesResponseCore
@@ -0,0 +1,43 @@
+from typing import Optional
+
+from pydantic import Field
+
+from app.dto.base import BaseDTOModel, BaseRequest, BaseResponse, BaseResponseCore
+from app.enums.connector import Connector
+from app.enums.item_type import ItemType
+from app.enums.workspace import Workspace
+
+
+# Domain Models
+class FileItem(BaseDTOModel):
+    """The fields of the frontend's `FileInfo` that operations need"""
+    id: str
+    source: Connector = Connector.GOOGLE_DRIVE
+    item_type: ItemType = Field(default=ItemType.DOCUMENT, alias="itemType")
+
+
+class OperationResult(BaseDTOModel):
+    """Outcome of an operation for one item"""
+    id: str
+    status: str
+    error: Optional[str] = None
+
+
+# Requests
+class DeleteRequest(BaseRequest):
+    """Request model for deleting files from a workspace."""
+
+    items: list[FileItem]
+    workspace: Workspace = Workspace.PERSONAL
+
+
+# Response Cores
+class OperationResponseCore(BaseResponseCore):
+    """Core response for operations on several items."""
+
+    results: list[OperationResult] = []
+
+
+# Response
+class OperationResponse(BaseResponse[OperationResponseCore]):
+    response: OperationResponseCore
@@ -0,0 +1,24 @@
+from typing import Optional
+
+from app.dto.base import BaseDTOModel, BaseResponseCore, BaseResponse
+
+
+# Domain Models
+class SuggestionItem(BaseDTOModel):
+    """A single filename completion"""
+    id: str
+    name: str
+    title: Optional[str] = None
+    contentType: Optional[str] = None
+
+
+# Response Cores
+class SuggestResponseCore(BaseResponseCore):
+    """Core response for filename suggestions."""
+
+    items: list[SuggestionItem] = []
+
+
+# Response
+class SuggestResponse(BaseResponse[SuggestResponseCore]):
+    response: SuggestResponseCore
@@ -0,0 +1,6 @@
+from app.enums.base import BaseStrEnum
+
+class ItemType(BaseStrEnum):
+    """Kind of a browsed item (`ItemType` in the frontend)."""
+    DOCUMENT = "document"
+    CONTAINER = "container"  # Folder; only its documents are indexed
@@ -0,0 +1,5 @@
+from app.enums.base import BaseStrEnum
+
+class JobKind(BaseStrEnum):
+    INDEX_DOCUMENT = "index_document"
+    DELETE_DOCUMENTS = "delete_documents"
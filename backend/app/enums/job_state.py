@@ -0,0 +1,7 @@
+from app.enums.base import BaseStrEnum
+
+class JobState(BaseStrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"  # Out of attempts, kept for inspection and manual retry
@@ -0,0 +1,5 @@
+from app.enums.base import BaseStrEnum
+
+class MessageRole(BaseStrEnum):
+    USER = "user"
+    ASSISTANT = "assistant"
@@ -0,0 +1,9 @@
+from app.enums.base import BaseStrEnum
+
+class SyncStatus(BaseStrEnum):
+    """File status shown in the dashboard (`StatusType` in the frontend)."""
+    SYNCING = "Syncing..."
+    SYNCED = "Synced"
+    SYNCING_FAILED = "Syncing Failed"
+    DELETING = "Deleting..."
+    DELETING_FAILED = "Deleting Failed"
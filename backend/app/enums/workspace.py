@@ -0,0 +1,5 @@
+from app.enums.base import BaseStrEnum
+
+class Workspace(BaseStrEnum):
+    PERSONAL = "personal"
+    ORGANIZATION = "organization"
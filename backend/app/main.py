@@ -1,6 +1,13 @@
+from app.config.admission_control import AdmissionControlMiddleware
+from app.config.metrics import MetricsMiddleware
+from app.config.tracing import RequestContextMiddleware
 from app.config.lifespan import lifespan
 from app.controllers.home import api as home_router
 from app.controllers.auth import api as auth_router
+from app.controllers.search import api as search_router
+from app.controllers.chat import api as chat_router
+from app.controllers.status import api as status_router
+from app.controllers.file import api as file_router
 
 from fastapi import FastAPI
 from fastapi.middleware import Middleware
@@ -11,6 +18,10 @@ def init_routers(app_: FastAPI) -> None:
     # API routes
     app_.include_router(home_router)
     app_.include_router(auth_router, prefix="/auth")
+    app_.include_router(search_router, prefix="/rms")
+    app_.include_router(chat_router, prefix="/rms")
+    app_.include_router(status_router, prefix="/rms")
+    app_.include_router(file_router, prefix="/rms")
 
 
 def make_middleware() -> list[Middleware]:
@@ -25,6 +36,12 @@ def make_middleware() -> list[Middleware]:
             allow_methods=["*"],
             allow_headers=["*"],
         ),
+        # Request id and timing breakdown for everything below, logs of shed requests included
+        Middleware(RequestContextMiddleware),
+        # Outside admission control so shed requests are counted too
+        Middleware(MetricsMiddleware),
+        # Inside CORS so rejections still carry CORS headers
+        Middleware(AdmissionControlMiddleware),
     ]
     return middleware
 
@@ -1,8 +1,13 @@
 from .base import SQLModelBase, SQLModelUUIDBase
 from .connector import ConnectorInfo
+from .conversation import ChatMessage, Conversation
+from .job import Job
 
 __all__ = [
     "SQLModelBase",
     "SQLModelUUIDBase", 
-    "ConnectorInfo"
+    "ConnectorInfo",
+    "Conversation",
+    "ChatMessage",
+    "Job"
 ]
\ No newline at end of file
@@ -0,0 +1,29 @@
+from typing import Any, ClassVar
+from uuid import UUID
+from app.models.base import SQLModelUUIDBase
+from sqlalchemy import JSON, Column, Index, Text
+from sqlmodel import Field
+from app.enums.message_role import MessageRole
+from app.enums.workspace import Workspace
+
+class Conversation(SQLModelUUIDBase, table=True):
+    __tablename__: ClassVar[str] = "conversations"
+
+    workspace: Workspace = Workspace.db_field()
+    title: str = Field(max_length=255, nullable=False)
+    summary: str | None = Field(default=None, sa_column=Column(Text, nullable=True))  # Rolling summary of folded turns
+    summarized_until: int = Field(default=0)  # Messages with seq <= this are covered by the summary
+    message_count: int = Field(default=0)  # Highest message seq
+
+
+class ChatMessage(SQLModelUUIDBase, table=True):
+    __tablename__: ClassVar[str] = "chat_messages"
+    # History windows are read as a range scan over (conversation_id, seq)
+    __table_args__ = (Index("ix_chat_messages_conversation_id_seq", "conversation_id", "seq", unique=True),)
+
+    conversation_id: UUID = Field(foreign_key="conversations.id", ondelete="CASCADE", nullable=False)
+    seq: int = Field(nullable=False)  # 1-based position in the conversation
+    role: MessageRole = MessageRole.db_field()
+    content: str = Field(sa_column=Column(Text, nullable=False))
+    citations: list[dict[str, Any]] | None = Field(default=None, sa_column=Column(JSON, nullable=True))
+    token_count: int = Field(default=0)
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+from typing import Any, ClassVar
+from app.models.base import SQLModelUUIDBase
+from sqlalchemy import JSON, Column, DateTime, Index, Text, text
+from sqlmodel import Field
+from app.enums.job_kind import JobKind
+from app.enums.job_state import JobState
+
+class Job(SQLModelUUIDBase, table=True):
+    __tablename__: ClassVar[str] = "jobs"
+    __table_args__ = (
+        # Claim scans only queued jobs, in priority and due order
+        Index("ix_jobs_queued_priority_run_after", "priority", "run_after", postgresql_where=text("state = 'queued'")),
+        # Leases that ran out are found without touching finished jobs
+        Index("ix_jobs_running_locked_until", "locked_until", postgresql_where=text("state = 'running'")),
+        # Latest job per item, for status lookups
+        Index("ix_jobs_key_created_at", "key", "created_at"),
+    )
+
+    kind: JobKind = JobKind.db_field()
+    key: str | None = Field(default=None, max_length=255, nullable=True)  # Item the job works on, e.g. the doc_id
+    state: JobState = JobState.db_field(default=JobState.QUEUED)
+    payload: dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    priority: int = Field(default=0)  # Lower runs first
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=5)
+    run_after: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False, server_default=text("now()")),
+    )
+    locked_by: str | None = Field(default=None, max_length=255, nullable=True)
+    locked_until: datetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True), nullable=True))
+    finished_at: datetime | None = Field(default=None, sa_column=Column(DateTime(timezone=True), nullable=True))
+    last_error: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
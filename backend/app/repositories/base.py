@@ -8,6 +8,7 @@ from uuid import UUID
 from abc import ABC
 
 from app.config.logger import create_logger
+from app.config.metrics import instrument_repository
 from app.models.base import SQLModelUUIDBase
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -24,6 +25,11 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC
     db: AsyncSession
     model: type[ModelType]
 
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        # Query time per repository method, in /metrics
+        instrument_repository(cls)
+
     def __init__(self, db: AsyncSession):
         self.db = db
 
@@ -0,0 +1,146 @@
+from collections.abc import Sequence
+from typing import Any
+from uuid import UUID
+from app.config.logger import create_logger
+from app.models.conversation import ChatMessage, Conversation
+from app.repositories.base import BaseRepository
+from app.enums.message_role import MessageRole
+from app.enums.workspace import Workspace
+from pydantic import BaseModel
+from sqlalchemy import and_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+logger = create_logger(__name__)
+
+class CreateConversationData(BaseModel):
+    """CRUD model for creating conversations"""
+    workspace: Workspace
+    title: str
+
+class UpdateConversationData(BaseModel):
+    """CRUD model for updating conversations"""
+    title: str | None = None
+
+class CreateChatMessageData(BaseModel):
+    """CRUD model for a message appended to a conversation"""
+    role: MessageRole
+    content: str
+    citations: list[dict[str, Any]] | None = None
+    token_count: int = 0
+
+class UpdateChatMessageData(BaseModel):
+    """Messages are immutable once written"""
+    pass
+
+class ConversationRepository(BaseRepository[Conversation, CreateConversationData, UpdateConversationData]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db)
+        self.model: type[Conversation] = Conversation
+
+    async def load_window(
+        self, conversation_id: UUID, workspace: Workspace, limit: int
+    ) -> tuple[Conversation | None, list[ChatMessage]]:
+        """
+        Load a conversation of the workspace with its latest unsummarized messages in one query.
+
+        The join is a range scan on (conversation_id, seq), so the cost does
+        not grow with the length of the conversation.
+        """
+        try:
+            stmt = (
+                select(Conversation, ChatMessage)
+                .outerjoin(
+                    ChatMessage,
+                    and_(
+                        ChatMessage.conversation_id == Conversation.id,
+                        ChatMessage.seq > Conversation.summarized_until,
+                    ),
+                )
+                .where(Conversation.id == conversation_id, Conversation.workspace == workspace)
+                .order_by(ChatMessage.seq.desc())
+                .limit(limit)
+            )
+            rows = (await self.db.execute(stmt)).all()
+            if not rows:
+                return None, []
+            messages = [message for _, message in rows if message is not None]
+            messages.reverse()
+            return rows[0][0], messages
+        except Exception as e:
+            logger.error(f"Error loading conversation {conversation_id}: {e}")
+            await self.db.rollback()
+            raise e
+
+    async def append_messages(self, conversation_id: UUID, messages: Sequence[CreateChatMessageData]) -> list[ChatMessage]:
+        """Append messages with consecutive seq numbers allocated atomically."""
+        try:
+            stmt = (
+                update(Conversation)
+                .where(Conversation.id == conversation_id)
+                .values(message_count=Conversation.message_count + len(messages))
+                .returning(Conversation.message_count)
+            )
+            last_seq = (await self.db.execute(stmt)).scalar_one()
+            first_seq = last_seq - len(messages) + 1
+
+            instances = [
+                ChatMessage(conversation_id=conversation_id, seq=first_seq + i, **message.model_dump())
+                for i, message in enumerate(messages)
+            ]
+            self.db.add_all(instances)
+            await self.db.commit()
+            return instances
+        except Exception as e:
+            logger.error(f"Error appending messages to conversation {conversation_id}: {e}")
+            await self.db.rollback()
+            raise e
+
+    async def messages_between(self, conversation_id: UUID, after_seq: int, until_seq: int) -> Sequence[ChatMessage]:
+        """Messages with after_seq < seq <= until_seq, in order."""
+        try:
+            stmt = (
+                select(ChatMessage)
+                .where(
+                    ChatMessage.conversation_id == conversation_id,
+                    ChatMessage.seq > after_seq,
+                    ChatMessage.seq <= until_seq,
+                )
+                .order_by(ChatMessage.seq.asc())
+            )
+            return (await self.db.execute(stmt)).scalars().all()
+        except Exception as e:
+            logger.error(f"Error loading messages of conversation {conversation_id}: {e}")
+            await self.db.rollback()
+            raise e
+
+    async def messages_before(self, conversation_id: UUID, before_seq: int | None, limit: int) -> list[ChatMessage]:
+        """Keyset page of messages preceding before_seq (latest page when None), in order."""
+        try:
+            filters = [ChatMessage.conversation_id == conversation_id]
+            if before_seq is not None:
+                filters.append(ChatMessage.seq < before_seq)
+            stmt = select(ChatMessage).where(*filters).order_by(ChatMessage.seq.desc()).limit(limit)
+            messages = list((await self.db.execute(stmt)).scalars().all())
+            messages.reverse()
+            return messages
+        except Exception as e:
+            logger.error(f"Error paging messages of conversation {conversation_id}: {e}")
+            await self.db.rollback()
+            raise e
+
+    async def fold_summary(self, conversation_id: UUID, summary: str, summarized_until: int) -> bool:
+        """Store a summary covering messages up to summarized_until, unless a newer one exists."""
+        try:
+            stmt = (
+                update(Conversation)
+                .where(Conversation.id == conversation_id, Conversation.summarized_until < summarized_until)
+                .values(summary=summary, summarized_until=summarized_until)
+            )
+            result = await self.db.execute(stmt)
+            await self.db.commit()
+            return result.rowcount > 0
+        except Exception as e:
+            logger.error(f"Error storing summary of conversation {conversation_id}: {e}")
+            await self.db.rollback()
+            raise e
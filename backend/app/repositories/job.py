@@ -0,0 +1,247 @@
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import Any
+from app.config.logger import create_logger
+from app.models.job import Job
+from app.repositories.base import BaseRepository
+from app.enums.job_kind import JobKind
+from app.enums.job_state import JobState
+from pydantic import BaseModel
+from sqlalchemy import case, delete, func, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+logger = create_logger(__name__)
+
+class CreateJobData(BaseModel):
+    """CRUD model for enqueuing jobs"""
+    kind: JobKind
+    key: str | None = None
+    payload: dict[str, Any] = {}
+    priority: int = 0
+    max_attempts: int = 5
+
+class UpdateJobData(BaseModel):
+    """Jobs change state only through the queue operations"""
+    pass
+
+class JobRepository(BaseRepository[Job, CreateJobData, UpdateJobData]):
+    """
+    Durable job queue on the `jobs` table.
+
+    Workers claim with `FOR UPDATE SKIP LOCKED`, so concurrent claimers
+    skip each other's rows instead of waiting on them. A claim is a lease
+    identified by (id, attempts) and valid until `locked_until`. Every
+    state change after the claim checks the lease, so a worker whose lease
+    expired and was handed to another worker cannot overwrite the result.
+    """
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(db)
+        self.model: type[Job] = Job
+
+    @staticmethod
+    def _leases(jobs: Sequence[Job]) -> Any:
+        return tuple_(Job.id, Job.attempts).in_([(job.id, job.attempts) for job in jobs])
+
+    async def enqueue_many(self, jobs: Sequence[CreateJobData]) -> list[Job]:
+        try:
+            instances = [Job(**job.model_dump()) for job in jobs]
+            self.db.add_all(instances)
+            await self.db.commit()
+            return instances
+        except Exception as e:
+            logger.error(f"Error enqueuing {len(jobs)} jobs: {e}")
+            await self.db.rollback()
+            raise e
+
+    async def claim(
+        self, kinds: Sequence[JobKind], worker_id: str, limit: int, visibility_timeout: float
+    ) -> list[Job]:
+        """Lease up to `limit` due jobs, highest priority and oldest first."""
+        try:
+            claimable = (
+                select(Job.id)
+                .where(Job.state == JobState.QUEUED, Job.run_after <= func.now(), Job.kind.in_(kinds))
+                .order_by(Job.priority, Job.run_after)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .cte("claimable")
+            )
+            stmt = (
+                update(Job)
+                .where(Job.id.in_(select(claimable.c.id)))
+                .values(
+                    state=JobState.RUNNING,
+                    attempts=Job.attempts + 1,
+                    locked_by=worker_id,
+                    locked_until=func.now() + timedelta(seconds=visibility_timeout),
+                )
+                .returning(Job)
+            )
+            jobs = list((await self.db.execute(stmt)).scalars().all())
+            await self.db.commit()
+            return jobs
+        except Exception as e:
+            logger.error(f"Error claiming jobs for {worker_id}: {e}")
+            await self.db.rollback()
+            raise e
+
+    async def extend(self, jobs: Sequence[Job], worker_id: str, visibility_timeout: float) -> int:
+        """Renew the leases of jobs still running; returns how many were still held."""
+        if not jobs:
+            return 0
+        try:
+            stmt = (
+                update(Job)
+                .where(self._leases(jobs), Job.locked_by == worker_id, Job.state == JobState.RUNNING)
+                .values(locked_until=func.now() + timedelta(seconds=visibility_timeout))
+            )
+            result = await self.db.execute(stmt)
+            await self.db.commit()
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Error extending {len(jobs)} job leases for {worker_id}: {e}")
+            await self.db.rollback()
+            raise e
+
+    async def complete(self, jobs: Sequence[Job], worker_id: str) -> int:
+        if not jobs:
+            return 0
+        try:
+            stmt = (
+                update(Job)
+                .where(self._leases(jobs), Job.locked_by == worker_id, Job.state == JobState.RUNNING)
+                .values(state=JobState.SUCCEEDED, locked_until=None, finished_at=func.now(), last_error=None)
+            )
+            result = await self.db.execute(stmt)
+            await self.db.commit()
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Error completing {len(jobs)} jobs for {worker_id}: {e}")
+            await self.db.rollback()
+            raise e
+
+    async def fail(self, job: Job, worker_id: str, error: str, retry_delay: float) -> JobState | None:
+        """Schedule a retry after `retry_delay`, or dead-letter the job once it is out of attempts."""
+        try:
+            dead = job.attempts >= job.max_attempts
+            state = JobState.DEAD if dead else JobState.QUEUED
+            stmt = (
+                update(Job)
+                .where(self._leases([job]), Job.locked_by == worker_id, Job.state == JobState.RUNNING)
+                .values(
+                    state=state,
+                    locked_by=None,
+                    locked_until=None,
+                    last_error=error,
+                    run_after=func.now() + timedelta(seconds=0 if dead else retry_delay),
+                    finished_at=func.now() if dead else None,
+                )
+            )
+            result = await self.db.execute(stmt)
+            await self.db.commit()
+            return state if result.rowcount else None
+        except Exception as e:
+            logger.error(f"Error failing job {job.id}: {e}")
+            await self.db.rollback()
+            raise e
+
+    async def release(self, jobs: Sequence[Job], worker_id: str) -> int:
+        """Hand jobs back without counting the attempt, e.g. on shutdown."""
+        if not jobs:
+            return 0
+        try:
+            stmt = (
+                update(Job)
+                .where(self._leases(jobs), Job.locked_by == worker_id, Job.state == JobState.RUNNING)
+                .values(state=JobState.QUEUED, attempts=Job.attempts - 1, locked_by=None, locked_until=None)
+            )
+            result = await self.db.execute(stmt)
+            await self.db.commit()
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Error releasing {len(jobs)} jobs for {worker_id}: {e}")
+            await self.db.rollback()
+            raise e
+
+    async def requeue_expired(self) -> list[Job]:
+        """Return jobs whose lease ran out (crashed or stuck worker) to the queue, or dead-letter them."""
+        try:
+            out_of_attempts = Job.attempts >= Job.max_attempts
+            stmt = (
+                update(Job)
+                .where(Job.state == JobState.RUNNING, Job.locked_until < func.now())
+                .values(
+                    state=case((out_of_attempts, JobState.DEAD.value), else_=JobState.QUEUED.value),
+                    finished_at=case((out_of_attempts, func.now()), else_=None),
+                    locked_by=None,
+                    locked_until=None,
+                    last_error="Visibility timeout expired",
+                )
+                .returning(Job)
+            )
+            jobs = list((await self.db.execute(stmt)).scalars().all())
+            await self.db.commit()
+            return jobs
+        except Exception as e:
+            logger.error(f"Error requeuing expired jobs: {e}")
+            await self.db.rollback()
+            raise e
+
+    async def purge_finished(self, older_than: float, limit: int) -> int:
+        """Delete up to `limit` jobs finished more than `older_than` seconds ago."""
+        try:
+            purgeable = (
+                select(Job.id)
+                .where(
+                    Job.state.in_([JobState.SUCCEEDED, JobState.DEAD]),
+                    Job.finished_at < func.now() - timedelta(seconds=older_than),
+                )
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            result = await self.db.execute(delete(Job).where(Job.id.in_(purgeable)))
+            await self.db.commit()
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Error purging finished jobs: {e}")
+            await self.db.rollback()
+            raise e
+
+    async def lock_if_exists(self, job: Job) -> bool:
+        """Lock the job's row until the session's transaction ends. False if the row was deleted."""
+        try:
+            stmt = select(Job.id).where(Job.id == job.id).with_for_update()
+            return (await self.db.execute(stmt)).scalar_one_or_none() is not None
+        except Exception as e:
+            logger.error(f"Error locking job {job.id}: {e}")
+            await self.db.rollback()
+            raise e
+
+    async def delete_by_keys(self, kind: JobKind, keys: Sequence[str], limit: int) -> int:
+        """
+        Delete up to `limit` jobs of `kind` for the given keys, whatever their state.
+
+        Rows locked by `lock_if_exists` are waited for, not skipped; they are
+        locked in id order so concurrent deletions cannot deadlock.
+        """
+        if not keys:
+            return 0
+        try:
+            doomed = (
+                select(Job.id)
+                .where(Job.kind == kind, Job.key.in_(keys))
+                .order_by(Job.id)
+                .limit(limit)
+                .with_for_update()
+                .scalar_subquery()
+            )
+            result = await self.db.execute(delete(Job).where(Job.id.in_(doomed)))
+            await self.db.commit()
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"Error deleting {kind.value} jobs for {len(keys)} keys: {e}")
+            await self.db.rollback()
+            raise e
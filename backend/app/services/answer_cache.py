@@ -0,0 +1,216 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from app.config.event_hub import CACHE_CHANNEL, NOTIFY_PAYLOAD_LIMIT, event_hub
+from app.config.logger import create_logger
+
+logger = create_logger(__name__)
+
+# Minimum cosine similarity between query embeddings for a cached answer to be reused
+CHAT_CACHE_SIMILARITY = float(os.getenv("CHAT_CACHE_SIMILARITY", "0.95"))
+CHAT_CACHE_TTL = float(os.getenv("CHAT_CACHE_TTL", "3600"))
+CHAT_CACHE_SIZE = int(os.getenv("CHAT_CACHE_SIZE", "2048"))
+
+# `cache` field of the invalidation events this cache listens to
+ANSWER_CACHE_EVENT = "answers"
+
+
+@dataclass
+class CachedAnswer:
+    scope: Hashable
+    question: str
+    answer: str
+    citations: list[dict[str, Any]]
+    doc_versions: dict[str, Any]  # doc_id -> version of every cited document
+    expires_at: float
+
+
+class _Partition:
+    """Normalized query vectors of one scope, stacked for a single matrix-vector lookup."""
+
+    def __init__(self):
+        self.keys: list[int] = []
+        self._matrix: np.ndarray | None = None
+        self._rows: list[np.ndarray] = []
+
+    def add(self, key: int, vector: np.ndarray) -> None:
+        self.keys.append(key)
+        self._rows.append(vector)
+        self._matrix = None
+
+    def remove(self, key: int) -> None:
+        i = self.keys.index(key)
+        del self.keys[i]
+        del self._rows[i]
+        self._matrix = None
+
+    def best(self, vector: np.ndarray) -> tuple[int, float] | None:
+        if not self.keys:
+            return None
+        if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+            if any(row.shape != vector.shape for row in self._rows):
+                return None
+            self._matrix = np.stack(self._rows)
+        scores = self._matrix @ vector
+        i = int(np.argmax(scores))
+        return self.keys[i], float(scores[i])
+
+
+class SemanticAnswerCache:
+    """
+    Chat answers reused across near-identical questions.
+
+    An answer is served again when a new question's embedding is within
+    `threshold` cosine similarity of a cached question asked in the same
+    scope (workspace, connector and selected files). Each entry records the
+    version of every document it cited and is dropped as soon as one of them
+    is re-ingested or deleted through `IndexService`; `stale_documents`
+    compares those versions with the index before a hit is served.
+
+    The cache lives in the process; `invalidate_everywhere` reaches the
+    caches of the other processes through the event hub. While the hub is
+    disconnected that falls back to `ttl`, which bounds how stale an answer
+    can be.
+    """
+
+    def __init__(self, threshold: float = CHAT_CACHE_SIMILARITY, ttl: float = CHAT_CACHE_TTL, max_size: int = CHAT_CACHE_SIZE):
+        self.threshold: float = threshold
+        self.ttl: float = ttl
+        self.max_size: int = max_size
+        self._entries: OrderedDict[int, CachedAnswer] = OrderedDict()
+        self._partitions: dict[Hashable, _Partition] = {}
+        self._by_doc: dict[str, set[int]] = {}
+        self._next_key: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        return array / max(float(np.linalg.norm(array)), 1e-12)
+
+    def lookup(self, scope: Hashable, query_vector: Sequence[float]) -> CachedAnswer | None:
+        """Most similar live answer in the scope, if it clears the threshold."""
+        partition = self._partitions.get(scope)
+        if partition is None:
+            return None
+        best = partition.best(self._normalize(query_vector))
+        if best is None or best[1] < self.threshold:
+            return None
+
+        key, similarity = best
+        entry = self._entries[key]
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        logger.debug("Answer cache hit (similarity=%.3f)", similarity)
+        return entry
+
+    def store(
+        self,
+        scope: Hashable,
+        query_vector: Sequence[float],
+        question: str,
+        answer: str,
+        citations: list[dict[str, Any]],
+        doc_versions: Mapping[str, Any],
+    ) -> None:
+        key = self._next_key
+        self._next_key += 1
+
+        self._entries[key] = CachedAnswer(
+            scope=scope,
+            question=question,
+            answer=answer,
+            citations=citations,
+            doc_versions=dict(doc_versions),
+            expires_at=time.monotonic() + self.ttl,
+        )
+        self._partitions.setdefault(scope, _Partition()).add(key, self._normalize(query_vector))
+        for doc_id in doc_versions:
+            self._by_doc.setdefault(doc_id, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    @staticmethod
+    def stale_documents(entry: CachedAnswer, live_versions: Mapping[str, Any]) -> list[str]:
+        """Cited documents whose indexed version is no longer the one the answer was built from."""
+        return [doc_id for doc_id, version in entry.doc_versions.items() if live_versions.get(doc_id) != version]
+
+    def invalidate_documents(self, doc_ids: Iterable[str]) -> int:
+        """Drop every answer citing one of the documents. Returns the number dropped."""
+        keys: set[int] = set()
+        for doc_id in doc_ids:
+            keys |= self._by_doc.get(doc_id, set())
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._partitions.clear()
+        self._by_doc.clear()
+
+    def _remove(self, key: int) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        partition = self._partitions[entry.scope]
+        partition.remove(key)
+        if not partition.keys:
+            del self._partitions[entry.scope]
+        for doc_id in entry.doc_versions:
+            keys = self._by_doc.get(doc_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_doc[doc_id]
+
+
+answer_cache = SemanticAnswerCache()
+
+
+def _on_cache_event(event: dict[str, Any]) -> None:
+    if event.get("cache") == ANSWER_CACHE_EVENT:
+        _ = answer_cache.invalidate_documents(event["doc_ids"])
+
+
+# Documents are written by job workers, answers are cached by the API processes
+event_hub.on(CACHE_CHANNEL, _on_cache_event, answer_cache.clear)
+
+
+def _invalidation_events(doc_ids: Sequence[str]) -> list[dict[str, Any]]:
+    """Group doc_ids into as few events as fit in NOTIFY payloads."""
+    # Envelope of the payload array holding a single event with an empty id list
+    envelope = len(json.dumps([{"cache": ANSWER_CACHE_EVENT, "doc_ids": []}], separators=(",", ":")))
+    events: list[dict[str, Any]] = []
+    batch: list[str] = []
+    size = envelope
+    for doc_id in doc_ids:
+        encoded = len(json.dumps(doc_id, ensure_ascii=False).encode()) + 1
+        if batch and size + encoded > NOTIFY_PAYLOAD_LIMIT:
+            events.append({"cache": ANSWER_CACHE_EVENT, "doc_ids": batch})
+            batch, size = [], envelope
+        batch.append(doc_id)
+        size += encoded
+    if batch:
+        events.append({"cache": ANSWER_CACHE_EVENT, "doc_ids": batch})
+    return events
+
+
+async def invalidate_everywhere(doc_ids: Iterable[str]) -> int:
+    """Drop answers citing the documents in this process and every other one. Returns the number dropped here."""
+    doc_ids = list(doc_ids)
+    dropped = answer_cache.invalidate_documents(doc_ids)
+    _ = await event_hub.broadcast(CACHE_CHANNEL, _invalidation_events(doc_ids))
+    return dropped
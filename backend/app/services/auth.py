@@ -15,7 +15,7 @@ class AuthService:
     def __init__(self, ctx: Context):
         self.ctx: Context = ctx
         self.connector_repo: ConnectorRepository = ConnectorRepository(db=ctx.db_session)
-        self.oauth_service: OAuthService = OAuthService()
+        self.oauth_service: OAuthService = OAuthService(ctx.http_client)
 
     async def get_encrypted_token(self, connector: Connector) -> str | None:
         """Get valid access token (encrypted) for frontend, refreshing if needed"""
@@ -23,7 +23,7 @@ class AuthService:
             # Find the single user connected to this connector
             token_data = await self.connector_repo.get_tokens_by_connector(connector)
             if not token_data or not token_data.get("connected"):
-                logger.info(f"No connected user found for {connector}")
+                logger.info("No connected user found for %s", connector)
                 return None
             
             email = token_data.get("email")
@@ -31,7 +31,7 @@ class AuthService:
             # Decrypt stored token
             encrypted_access_token = token_data.get("access_token")
             if not encrypted_access_token:
-                logger.warning(f"No access token stored for {email} with {connector}")
+                logger.warning("No access token stored for %s with %s", email, connector)
                 return None
 
             access_token = EncryptionService.decrypt(encrypted_access_token)
@@ -44,14 +44,14 @@ class AuthService:
             expiry_date = token_data.get("access_token_expiry_date", 0)
             
             if current_time >= (expiry_date - 60):
-                logger.info(f"Access token expired for {email} with {connector}, attempting refresh")
+                logger.info("Access token expired for %s with %s, attempting refresh", email, connector)
                 
                 # Try to refresh the token
                 refreshed_token_info = await self._refresh_token_if_needed(email, connector, token_data)
                 if refreshed_token_info:
                     access_token = refreshed_token_info.access_token
                 else:
-                    logger.warning(f"Token refresh failed for {email} with {connector}")
+                    logger.warning("Token refresh failed for %s with %s", email, connector)
                     return None
 
             # Encrypt token for frontend response
@@ -0,0 +1,329 @@
+import asyncio
+import os
+import time
+from collections.abc import AsyncIterator, Hashable
+from typing import Any
+
+from app.config.lifespan import Context
+from app.config.logger import create_logger
+from app.config.metrics import observe_openai
+from app.config.rate_governor import Permit, Priority, rate_governor
+from app.config.search_backend import SearchHit
+from app.dto.chat import ChatRequest, Citation
+from app.services.answer_cache import CachedAnswer, answer_cache
+from app.services.embedding_service import EmbeddingService
+from app.services.history_service import HistoryService
+from app.services.index_service import IndexService
+from app.services.search_service import SearchService
+from app.utils.context_packing import ContextBlock, PackedContext, pack_context
+from app.utils.rank_fusion import reciprocal_rank_fusion
+from app.utils.tokens import estimate_tokens
+
+logger = create_logger(__name__)
+
+CHAT_MODEL = os.getenv("CHAT_MODEL", "gpt-4o-mini")
+CHAT_TOP_K = int(os.getenv("CHAT_TOP_K", "16"))
+
+# Rewritten queries searched alongside the original question (0 disables the fan-out)
+CHAT_QUERY_VARIANTS = int(os.getenv("CHAT_QUERY_VARIANTS", "3"))
+
+# Seconds retrieval keeps waiting for query variants once the original question's search is done
+CHAT_RETRIEVAL_DEADLINE = float(os.getenv("CHAT_RETRIEVAL_DEADLINE", "0.3"))
+
+# Token budget for the retrieved sources in the prompt
+CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", "6000"))
+
+# Expected answer length, reserved from the tokens-per-minute budget before streaming
+CHAT_OUTPUT_TOKENS_ESTIMATE = 800
+
+SNIPPET_LENGTH = 240
+
+VARIANTS_PROMPT = (
+    "Rewrite the user's question into {n} different search queries for a document search engine. "
+    "Use synonyms and spell out abbreviations. Reply with one query per line and nothing else."
+)
+
+SYSTEM_PROMPT = (
+    "You answer questions using only the numbered sources provided. "
+    "Cite sources inline as [n]. If the sources do not contain the answer, say so."
+)
+
+
+class ChatService:
+    """Retrieval-augmented chat answers streamed as events."""
+
+    def __init__(self, ctx: Context):
+        self.ctx: Context = ctx
+        self.embedding_service: EmbeddingService = EmbeddingService(ctx.openai_client, priority=Priority.INTERACTIVE)
+        self.index_service: IndexService = IndexService(ctx.search_backend, ctx.openai_client)
+        self.search_service: SearchService = SearchService(ctx)
+        self.history_service: HistoryService = HistoryService(ctx)
+
+    @staticmethod
+    def cache_scope(request: ChatRequest) -> tuple[str, str | None, tuple[str, ...]]:
+        """Answers are only shared between questions searching the same sources."""
+        return (
+            request.workspace.value,
+            request.connector.value if request.connector else None,
+            tuple(sorted(request.doc_ids or ())),
+        )
+
+    async def cached_answer(self, alias: str, scope: Hashable, query_vector: list[float]) -> CachedAnswer | None:
+        """Cached answer for the question, unless a document it cites changed since it was stored."""
+        cached = answer_cache.lookup(scope, query_vector)
+        if cached is None:
+            return None
+        # Invalidation events can be missed while the event hub reconnects
+        live_versions = await self.index_service.doc_versions(alias, list(cached.doc_versions))
+        stale = answer_cache.stale_documents(cached, live_versions)
+        if stale:
+            _ = answer_cache.invalidate_documents(stale)
+            return None
+        return cached
+
+    async def search(self, request: ChatRequest, query_vector: list[float]) -> list[SearchHit]:
+        filters = {"doc_id": request.doc_ids} if request.doc_ids else None
+        return await self.search_service.search_chunks(
+            query_vector,
+            workspace=request.workspace,
+            connector=request.connector,
+            k=CHAT_TOP_K,
+            filters=filters,
+        )
+
+    async def query_variants(self, message: str) -> list[str]:
+        """Alternative phrasings of the question, generated in one short completion."""
+        try:
+            messages = [
+                {"role": "system", "content": VARIANTS_PROMPT.format(n=CHAT_QUERY_VARIANTS)},
+                {"role": "user", "content": message},
+            ]
+            max_tokens = 40 * CHAT_QUERY_VARIANTS
+            permit = await rate_governor.acquire(
+                sum(estimate_tokens(item["content"]) for item in messages) + max_tokens, Priority.INTERACTIVE
+            )
+            started = time.perf_counter()
+            response = await self.ctx.openai_client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=messages,
+                temperature=0,
+                max_tokens=max_tokens,
+            )
+            observe_openai("query_variants", CHAT_MODEL, time.perf_counter() - started, response.usage)
+            rate_governor.settle(permit, response.usage.total_tokens if response.usage else None)
+        except Exception as _:
+            logger.warning("Failed to generate query variants", exc_info=True)
+            return []
+        content = response.choices[0].message.content or ""
+        variants = [line.strip().lstrip("-*0123456789.) ").strip() for line in content.splitlines()]
+        seen = {message.strip().lower()}
+        unique: list[str] = []
+        for variant in variants:
+            if variant and variant.lower() not in seen:
+                seen.add(variant.lower())
+                unique.append(variant)
+        return unique[:CHAT_QUERY_VARIANTS]
+
+    async def retrieve(
+        self,
+        request: ChatRequest,
+        query_vector: list[float],
+        variants: asyncio.Task[list[str]] | None = None,
+    ) -> list[SearchHit]:
+        """
+        Search the question and its rewrites concurrently and fuse the rankings.
+
+        The original question is searched as soon as its embedding is known.
+        Variants are embedded in one batch and searched with `asyncio.gather`.
+        Whatever has not finished `CHAT_RETRIEVAL_DEADLINE` after the original
+        search is dropped, so the rewrite adds at most that much to retrieval.
+        """
+        primary = asyncio.create_task(self.search(request, query_vector))
+        if variants is None:
+            return await primary
+
+        async def search_variants() -> list[list[SearchHit]]:
+            queries = await variants
+            if not queries:
+                return []
+            vectors = await self.embedding_service.embed(queries)
+            return list(await asyncio.gather(*(self.search(request, vector) for vector in vectors)))
+
+        fan_out = asyncio.create_task(search_variants())
+        try:
+            hits = await primary
+        except Exception:
+            _ = fan_out.cancel()
+            raise
+
+        try:
+            extra = await asyncio.wait_for(fan_out, timeout=CHAT_RETRIEVAL_DEADLINE)
+        except asyncio.TimeoutError:
+            logger.warning("Query variants missed the %ss retrieval deadline", CHAT_RETRIEVAL_DEADLINE)
+            extra = []
+        except Exception as _:
+            logger.warning("Query variant retrieval failed, using the original query only", exc_info=True)
+            extra = []
+
+        if not extra:
+            return hits
+        return reciprocal_rank_fusion([hits, *extra], limit=CHAT_TOP_K * 2)
+
+    @staticmethod
+    def render_source(block: ContextBlock) -> str:
+        return f"[{block.index}] {block.metadata.get('name', block.doc_id)}\n{block.text}\n\n"
+
+    def pack(self, hits: list[SearchHit]) -> PackedContext:
+        packed = pack_context(hits, CHAT_CONTEXT_TOKENS, self.render_source)
+        logger.debug(
+            f"Packed {len(hits)} hits into {len(packed.blocks)} sources "
+            f"({packed.tokens} tokens, {packed.dropped} dropped)"
+        )
+        return packed
+
+    @staticmethod
+    def build_citations(packed: PackedContext) -> list[Citation]:
+        return [
+            Citation(
+                index=block.index,
+                chunk_id=block.chunk_ids[0],
+                doc_id=block.doc_id,
+                name=block.metadata.get("name"),
+                url=block.metadata.get("url"),
+                score=block.score,
+                snippet=block.text[:SNIPPET_LENGTH],
+            )
+            for block in packed.blocks
+        ]
+
+    def build_messages(
+        self, request: ChatRequest, packed: PackedContext, history: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        sources = "".join(self.render_source(block) for block in packed.blocks)
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            *history,
+            {"role": "user", "content": f"Sources:\n{sources}Question: {request.message}"},
+        ]
+
+    async def start_completion(self, messages: list[dict[str, Any]]) -> tuple[Permit, Any]:
+        """Open a streamed completion once the rate governor admits it."""
+        permit = await rate_governor.acquire(
+            sum(estimate_tokens(message["content"]) for message in messages) + CHAT_OUTPUT_TOKENS_ESTIMATE,
+            Priority.INTERACTIVE,
+        )
+        started = time.perf_counter()
+        stream = await self.ctx.openai_client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=messages,
+            stream=True,
+            # The last chunk reports usage, used to settle the token estimate
+            stream_options={"include_usage": True},
+        )
+        observe_openai("chat", CHAT_MODEL, time.perf_counter() - started)
+        return permit, stream
+
+    async def stream_answer(self, request: ChatRequest) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Yield `(event, data)` pairs: `conversation`, `citations`, then
+        `token`s, then `done`.
+
+        The turn is stored in the conversation before `done`; folding older
+        turns into the conversation summary happens after it. The opening
+        question of a conversation may be answered from the semantic answer
+        cache without retrieval or a completion call.
+        Otherwise the completion request is started as soon as retrieval
+        returns and citations are emitted while it is in flight, so
+        time-to-first-token is retrieval latency plus model latency.
+        """
+        if not self.ctx.openai_client:
+            yield "error", {"message": "Chat is not configured - set OPENAI_API_KEY"}
+            return
+
+        # Queries must be embedded like the searched index (model and dimension)
+        alias = IndexService.read_alias(request.workspace, request.connector)
+        self.embedding_service = await self.index_service.embedder_for(alias, Priority.INTERACTIVE)
+
+        variants: asyncio.Task[list[str]] | None = None
+        try:
+            query_vector, (conversation, window) = await asyncio.gather(
+                self.embedding_service.embed_query(request.message),
+                self.history_service.start(request),
+            )
+            yield "conversation", {"id": str(conversation.id)}
+
+            history = self.history_service.prompt_messages(conversation, window)
+            # Follow-up questions depend on the conversation, only opening questions are shared
+            cacheable = not history
+            scope = self.cache_scope(request)
+            cached = await self.cached_answer(alias, scope, query_vector) if cacheable else None
+            if cached is not None:
+                yield "citations", cached.citations
+                yield "token", {"text": cached.answer}
+                _ = await self.history_service.record_turn(
+                    conversation.id, request.message, cached.answer, cached.citations
+                )
+                yield "done", {"cached": True}
+                return
+
+            # Rewrites cost a completion call, so they are only requested once the cache missed
+            if CHAT_QUERY_VARIANTS > 0:
+                variants = asyncio.create_task(self.query_variants(request.message))
+            try:
+                hits = await self.retrieve(request, query_vector, variants)
+            except Exception:
+                # The alias may have been swapped to an index with other embedding settings
+                embedder = await self.index_service.refreshed_embedder(alias, self.embedding_service)
+                if embedder is None:
+                    raise
+                self.embedding_service = embedder
+                query_vector = await embedder.embed_query(request.message)
+                hits = await self.retrieve(request, query_vector)
+            packed = self.pack(hits)
+        finally:
+            if variants is not None and not variants.done():
+                _ = variants.cancel()
+
+        completion = asyncio.create_task(self.start_completion(self.build_messages(request, packed, history)))
+
+        stream = None
+        try:
+            citations = [citation.model_dump() for citation in self.build_citations(packed)]
+            yield "citations", citations
+
+            answer: list[str] = []
+            permit, stream = await completion
+            async for chunk in stream:
+                if chunk.usage:
+                    rate_governor.settle(permit, chunk.usage.total_tokens)
+                    observe_openai("chat", CHAT_MODEL, usage=chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    answer.append(chunk.choices[0].delta.content)
+                    yield "token", {"text": chunk.choices[0].delta.content}
+
+            # Answers without sources are not cached, new documents could answer them
+            if cacheable and packed.blocks:
+                answer_cache.store(
+                    scope,
+                    query_vector,
+                    request.message,
+                    "".join(answer),
+                    citations,
+                    {block.doc_id: block.metadata.get("doc_version") for block in packed.blocks},
+                )
+            message_count = await self.history_service.record_turn(
+                conversation.id, request.message, "".join(answer), citations
+            )
+            yield "done", {"cached": False}
+
+            try:
+                _ = await self.history_service.compact(conversation, message_count)
+            except Exception as _:
+                # The next turn retries; the history window is bounded either way
+                logger.warning(f"Failed to summarize conversation {conversation.id}", exc_info=True)
+        finally:
+            # Client went away or the stream failed; don't leave the request running
+            if not completion.done():
+                _ = completion.cancel()
+            if stream is not None:
+                await stream.close()
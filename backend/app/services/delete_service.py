@@ -0,0 +1,102 @@
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from app.config.lifespan import Context
+from app.config.logger import create_logger
+from app.enums.connector import Connector
+from app.enums.job_kind import JobKind
+from app.enums.workspace import Workspace
+from app.repositories.job import JobRepository
+from app.services.index_service import IndexService, Tenant
+from app.services.suggest_service import SuggestService
+
+logger = create_logger(__name__)
+
+# Documents per deletion job; larger requests are split into several jobs
+DELETE_JOB_SIZE = int(os.getenv("DELETE_JOB_SIZE", "500"))
+
+# Documents per OpenSearch delete_by_query
+DELETE_SLICE_SIZE = int(os.getenv("DELETE_SLICE_SIZE", "50"))
+
+# Upper bound on documents removed from the search backend per second, per process
+DELETE_MAX_DOCS_PER_SECOND = float(os.getenv("DELETE_MAX_DOCS_PER_SECOND", "100"))
+
+# Job rows deleted per Postgres statement
+DELETE_DB_BATCH_SIZE = int(os.getenv("DELETE_DB_BATCH_SIZE", "500"))
+
+# Called with the fraction of documents removed from the search backend
+ProgressCallback = Callable[[float], Awaitable[None]]
+
+# Concurrent deletion jobs take turns, so the throttle holds per process
+_slice_lock = asyncio.Lock()
+
+
+class DeleteService:
+    """
+    Removes documents from Postgres and the search backend. Runs in job workers.
+
+    Postgres goes first: the documents' index jobs (whose payloads hold the
+    full text) are deleted in bounded batches, each its own short
+    transaction, which also cancels indexing still queued for them. A
+    running index job locks its row while it writes, so the deletion waits
+    for that write, and a job that has not written yet finds its row gone
+    and stops. Chunks
+    are then deleted with one `delete_by_query` per slice of documents,
+    paced to `max_docs_per_second` so a large folder does not flood the
+    cluster with deletes and refreshes.
+    """
+
+    def __init__(
+        self,
+        ctx: Context,
+        slice_size: int = DELETE_SLICE_SIZE,
+        max_docs_per_second: float = DELETE_MAX_DOCS_PER_SECOND,
+        db_batch_size: int = DELETE_DB_BATCH_SIZE,
+    ):
+        self.ctx: Context = ctx
+        self.index_service: IndexService = IndexService(ctx.search_backend, ctx.openai_client)
+        self.suggest_service: SuggestService = SuggestService(ctx.search_backend)
+        self.job_repository: JobRepository = JobRepository(ctx.db_session)
+        self.slice_size: int = max(slice_size, 1)
+        self.max_docs_per_second: float = max_docs_per_second
+        self.db_batch_size: int = max(db_batch_size, 1)
+
+    async def delete_documents(self, payload: Mapping[str, Any], progress: ProgressCallback | None = None) -> int:
+        """
+        Delete documents with their chunks, suggestions and index jobs.
+
+        Payload: `workspace`, `connector` and `doc_ids`. Idempotent, so a
+        retried job simply finds less left to delete. Returns the number
+        of chunks deleted.
+        """
+        tenant = Tenant(Workspace(payload["workspace"]), Connector(payload["connector"]))
+        doc_ids: list[str] = list(payload["doc_ids"])
+
+        removed_jobs = 0
+        while True:
+            deleted = await self.job_repository.delete_by_keys(JobKind.INDEX_DOCUMENT, doc_ids, self.db_batch_size)
+            removed_jobs += deleted
+            if deleted < self.db_batch_size:
+                break
+
+        min_slice_seconds = self.slice_size / self.max_docs_per_second
+        removed_chunks = 0
+        for start in range(0, len(doc_ids), self.slice_size):
+            doc_slice = doc_ids[start:start + self.slice_size]
+            async with _slice_lock:
+                started = time.monotonic()
+                removed_chunks += await self.index_service.delete_chunks(tenant, doc_slice)
+                _ = await self.suggest_service.delete_files(doc_slice)
+
+                # Throttle deletes
+                elapsed = time.monotonic() - started
+                if elapsed < min_slice_seconds:
+                    await asyncio.sleep(min_slice_seconds - elapsed)
+            if progress is not None:
+                await progress(min(start + self.slice_size, len(doc_ids)) / len(doc_ids))
+
+        logger.info(f"Deleted {len(doc_ids)} documents ({removed_chunks} chunks, {removed_jobs} jobs)")
+        return removed_chunks
@@ -0,0 +1,102 @@
+import os
+import time
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import openai
+
+from app.config.logger import create_logger
+from app.config.metrics import observe_openai
+from app.config.rate_governor import Priority, rate_governor
+from app.config.search_backend import DEFAULT_EMBEDDING_DIMENSION
+from app.utils.tokens import estimate_tokens
+
+logger = create_logger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+
+# Inputs per embeddings request
+EMBEDDING_BATCH_SIZE = 256
+
+# Full output size per model; smaller sizes are requested with the `dimensions` parameter
+NATIVE_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+# Models that accept `dimensions`
+SHORTENABLE_MODELS = {"text-embedding-3-small", "text-embedding-3-large"}
+
+
+class EmbeddingService:
+    """
+    Embeds chunk text and queries with the OpenAI embeddings API.
+
+    Requests go through the rate governor, by default as background work
+    that only uses capacity interactive chat leaves free.
+
+    With `dimensions` below the model's native size, shortened embeddings
+    are requested from the API (text-embedding-3 models only). They are the
+    leading components of the full vector, renormalized, so they stay
+    comparable with each other but not with full-size vectors.
+    """
+
+    def __init__(
+        self,
+        openai_client: "openai.AsyncOpenAI | None",
+        model: str = DEFAULT_EMBEDDING_MODEL,
+        priority: Priority = Priority.BACKGROUND,
+        dimensions: int | None = None,
+    ):
+        self.openai_client: "openai.AsyncOpenAI | None" = openai_client
+        self.model: str = model
+        self.priority: Priority = priority
+        self.dimensions: int | None = dimensions
+        if dimensions is not None and dimensions != NATIVE_DIMENSIONS.get(model):
+            if model not in SHORTENABLE_MODELS:
+                raise ValueError(f"Embedding model {model} does not support {dimensions} dimensions")
+            if dimensions > NATIVE_DIMENSIONS[model]:
+                raise ValueError(f"Embedding model {model} has at most {NATIVE_DIMENSIONS[model]} dimensions")
+
+    @classmethod
+    def for_index(
+        cls,
+        openai_client: "openai.AsyncOpenAI | None",
+        meta: Mapping[str, Any],
+        priority: Priority = Priority.BACKGROUND,
+    ) -> "EmbeddingService":
+        """Embedder producing vectors for an index, from the meta it was created with."""
+        return cls(
+            openai_client,
+            model=meta.get("embedding_model", DEFAULT_EMBEDDING_MODEL),
+            priority=priority,
+            dimensions=int(meta.get("embedding_dimension", DEFAULT_EMBEDDING_DIMENSION)),
+        )
+
+    def _request_options(self) -> dict[str, Any]:
+        # Native size is the API default, and older models reject the parameter
+        if self.dimensions is None or self.dimensions == NATIVE_DIMENSIONS.get(self.model):
+            return {}
+        return {"dimensions": self.dimensions}
+
+    async def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        """Embed texts in request-sized batches, preserving input order."""
+        if not self.openai_client:
+            raise Exception("OpenAI client not configured - set OPENAI_API_KEY")
+
+        options = self._request_options()
+        vectors: list[list[float]] = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            batch = list(texts[start:start + EMBEDDING_BATCH_SIZE])
+            permit = await rate_governor.acquire(sum(estimate_tokens(text) for text in batch), self.priority)
+            started = time.perf_counter()
+            response = await self.openai_client.embeddings.create(input=batch, model=self.model, **options)
+            observe_openai("embeddings", self.model, time.perf_counter() - started, response.usage)
+            rate_governor.settle(permit, response.usage.total_tokens if response.usage else None)
+            vectors.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+        return vectors
+
+    async def embed_query(self, query: str) -> list[float]:
+        return (await self.embed([query]))[0]
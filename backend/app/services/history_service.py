@@ -0,0 +1,133 @@
+import os
+import time
+from typing import Any
+from uuid import UUID
+
+from app.config.lifespan import Context
+from app.config.logger import create_logger
+from app.config.metrics import observe_openai
+from app.config.rate_governor import Priority, rate_governor
+from app.dto.chat import ChatRequest
+from app.enums.message_role import MessageRole
+from app.models.conversation import ChatMessage, Conversation
+from app.repositories.conversation import ConversationRepository, CreateChatMessageData, CreateConversationData
+from app.utils.tokens import count_tokens, estimate_tokens
+
+logger = create_logger(__name__)
+
+SUMMARY_MODEL = os.getenv("CHAT_SUMMARY_MODEL", os.getenv("CHAT_MODEL", "gpt-4o-mini"))
+
+# Most recent messages kept verbatim in the prompt
+CHAT_HISTORY_MESSAGES = int(os.getenv("CHAT_HISTORY_MESSAGES", "8"))
+
+# Older messages are folded into the summary this many at a time
+CHAT_SUMMARY_BATCH = int(os.getenv("CHAT_SUMMARY_BATCH", "6"))
+
+# Token budget for the verbatim history in the prompt
+CHAT_HISTORY_TOKENS = int(os.getenv("CHAT_HISTORY_TOKENS", "2000"))
+
+SUMMARY_MAX_TOKENS = 400
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an assistant "
+    "answering questions about the user's documents. Update the summary with the new messages. "
+    "Keep facts, names, numbers, decisions and open questions; drop pleasantries. "
+    "Reply with the updated summary only."
+)
+
+
+class HistoryService:
+    """
+    Conversation history with a bounded prompt footprint.
+
+    A turn's prompt carries the conversation summary plus at most
+    `CHAT_HISTORY_MESSAGES + CHAT_SUMMARY_BATCH` recent messages, trimmed to
+    `CHAT_HISTORY_TOKENS`. Once more messages than that are unsummarized, the
+    oldest batch is folded into the summary with one short completion, so
+    prompt size stays flat however long the conversation gets.
+    """
+
+    def __init__(self, ctx: Context):
+        self.ctx: Context = ctx
+        self.conversation_repository: ConversationRepository = ConversationRepository(ctx.db_session)
+
+    async def start(self, request: ChatRequest) -> tuple[Conversation, list[ChatMessage]]:
+        """Load the conversation's prompt window, or create a new conversation in the request's workspace."""
+        if request.conversation_id is None:
+            conversation = await self.conversation_repository.create(
+                CreateConversationData(workspace=request.workspace, title=request.message[:255])
+            )
+            return conversation, []
+
+        conversation, messages = await self.conversation_repository.load_window(
+            request.conversation_id, request.workspace, CHAT_HISTORY_MESSAGES + CHAT_SUMMARY_BATCH
+        )
+        if conversation is None:
+            raise Exception(f"Conversation {request.conversation_id} not found")
+        return conversation, messages
+
+    @staticmethod
+    def prompt_messages(conversation: Conversation, messages: list[ChatMessage]) -> list[dict[str, Any]]:
+        """Summary and recent messages as chat completion messages, newest kept first when over budget."""
+        recent: list[dict[str, Any]] = []
+        tokens = 0
+        for message in reversed(messages):
+            tokens += message.token_count
+            if tokens > CHAT_HISTORY_TOKENS and recent:
+                break
+            recent.append({"role": message.role.value, "content": message.content})
+        recent.reverse()
+
+        if conversation.summary:
+            recent.insert(0, {"role": "system", "content": f"Summary of the earlier conversation:\n{conversation.summary}"})
+        return recent
+
+    async def record_turn(
+        self, conversation_id: UUID, question: str, answer: str, citations: list[dict[str, Any]]
+    ) -> int:
+        """Persist a question and its answer; returns the conversation's new message count."""
+        messages = await self.conversation_repository.append_messages(
+            conversation_id,
+            [
+                CreateChatMessageData(role=MessageRole.USER, content=question, token_count=count_tokens(question)),
+                CreateChatMessageData(
+                    role=MessageRole.ASSISTANT, content=answer, citations=citations, token_count=count_tokens(answer)
+                ),
+            ],
+        )
+        return messages[-1].seq
+
+    async def compact(self, conversation: Conversation, message_count: int) -> bool:
+        """Fold the oldest unsummarized messages into the summary once the window overflows."""
+        if message_count - conversation.summarized_until <= CHAT_HISTORY_MESSAGES + CHAT_SUMMARY_BATCH:
+            return False
+        if not self.ctx.openai_client:
+            return False
+
+        until = message_count - CHAT_HISTORY_MESSAGES
+        folded = await self.conversation_repository.messages_between(
+            conversation.id, conversation.summarized_until, until
+        )
+        transcript = "\n\n".join(f"{message.role.value}: {message.content}" for message in folded)
+        prompt = f"Current summary:\n{conversation.summary or '(none)'}\n\nNew messages:\n{transcript}"
+
+        # Summaries are housekeeping and yield to interactive chat
+        permit = await rate_governor.acquire(
+            estimate_tokens(SUMMARY_PROMPT) + estimate_tokens(prompt) + SUMMARY_MAX_TOKENS, Priority.BACKGROUND
+        )
+        started = time.perf_counter()
+        response = await self.ctx.openai_client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0,
+            max_tokens=SUMMARY_MAX_TOKENS,
+        )
+        observe_openai("summary", SUMMARY_MODEL, time.perf_counter() - started, response.usage)
+        rate_governor.settle(permit, response.usage.total_tokens if response.usage else None)
+        summary = (response.choices[0].message.content or "").strip()
+        if not summary:
+            return False
+        return await self.conversation_repository.fold_summary(conversation.id, summary, until)
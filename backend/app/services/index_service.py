@@ -0,0 +1,326 @@
+import os
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import openai
+
+from app.config.event_hub import CACHE_CHANNEL, event_hub
+from app.config.logger import create_logger
+from app.config.rate_governor import Priority
+from app.config.search_backend import DEFAULT_EMBEDDING_DIMENSION, IndexNotFoundError, SearchBackend
+from app.enums.connector import Connector
+from app.enums.workspace import Workspace
+from app.services.answer_cache import invalidate_everywhere
+from app.services.embedding_service import DEFAULT_EMBEDDING_MODEL, EmbeddingService
+
+logger = create_logger(__name__)
+
+CHUNK_INDEX = os.getenv("SEARCH_CHUNK_INDEX", "rms-chunks")
+
+# Alias for the physical index shared by all small tenants
+SHARED_ALIAS = f"{CHUNK_INDEX}-shared"
+
+# Suffix of the alias marking an index that is being rebuilt (see ReindexService)
+STAGING_SUFFIX = "-next"
+
+# How long a staging alias lookup is trusted by the write path
+STAGING_CACHE_TTL = 5.0
+
+# Aliases known to exist, so steady-state writes skip the alias lookup
+_ensured_aliases: set[str] = set()
+
+# alias -> (checked at, staging alias exists)
+_staging_cache: dict[str, tuple[float, bool]] = {}
+
+# alias -> (checked at, embedding meta of the index behind it)
+_embedding_meta_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+
+# Cache invalidation event sent when aliases move to another index
+INDEX_CHANGED_EVENT = {"cache": "index"}
+
+
+def invalidate_index_caches() -> None:
+    """Forget staging aliases and embedding settings looked up so far."""
+    _staging_cache.clear()
+    _embedding_meta_cache.clear()
+
+
+def _on_cache_event(event: dict[str, Any]) -> None:
+    if event.get("cache") == INDEX_CHANGED_EVENT["cache"]:
+        invalidate_index_caches()
+
+
+# Every process drops its lookups when any process moves an alias
+event_hub.on(CACHE_CHANNEL, _on_cache_event, invalidate_index_caches)
+
+
+async def announce_index_change() -> None:
+    """Make every process look up staging aliases and embedding settings again."""
+    invalidate_index_caches()
+    _ = await event_hub.broadcast(CACHE_CHANNEL, [INDEX_CHANGED_EVENT])
+
+
+@dataclass(frozen=True)
+class Tenant:
+    """Unit of index isolation: one connector within one workspace."""
+    workspace: Workspace
+    connector: Connector
+
+    @property
+    def routing(self) -> str:
+        """Custom `_routing` value that keeps a tenant's chunks on one shard."""
+        return f"{self.workspace.value}:{self.connector.value}"
+
+    @property
+    def alias(self) -> str:
+        """Read/write alias for the tenant (index names must be lowercase)."""
+        return f"{CHUNK_INDEX}-{self.workspace.value}-{self.connector.value.lower()}"
+
+    @property
+    def terms(self) -> dict[str, str]:
+        """Tenant fields stamped into every chunk's metadata, as backend-neutral filters."""
+        return {"metadata.workspace": self.workspace.value, "metadata.connector": self.connector.value}
+
+    @property
+    def filter(self) -> dict[str, Any]:
+        return {"bool": {"filter": [{"term": {field: value}} for field, value in self.terms.items()]}}
+
+    @classmethod
+    def all(cls) -> list["Tenant"]:
+        return [cls(workspace, connector) for workspace in Workspace for connector in Connector]
+
+
+def workspace_alias(workspace: Workspace) -> str:
+    """Read-only alias spanning every connector of a workspace."""
+    return f"{CHUNK_INDEX}-{workspace.value}"
+
+
+def staging_alias(alias: str) -> str:
+    return f"{alias}{STAGING_SUFFIX}"
+
+
+def is_shared_index(index: str) -> bool:
+    return index.startswith(f"{SHARED_ALIAS}-v")
+
+
+def next_index_version(index: str) -> str:
+    """`rms-chunks-shared-v3` -> `rms-chunks-shared-v4`."""
+    base, _, version = index.rpartition("-v")
+    return f"{base}-v{int(version) + 1}"
+
+
+def embedding_meta(model: str, dimension: int) -> dict[str, Any]:
+    return {"embedding_model": model, "embedding_dimension": dimension}
+
+
+class IndexService:
+    """
+    Tenant-aware index and alias management.
+
+    Every tenant reads and writes through its own alias. Small tenants share
+    the index behind `SHARED_ALIAS`, where the tenant alias carries a routing
+    value and a filter, so a query touches a single shard. Large tenants can
+    be given a dedicated single-shard index behind the same alias name, which
+    keeps them from inflating the shared shards.
+
+    While an index is being rebuilt, each tenant also has a staging alias on
+    the new index and writes and deletes go to both.
+    """
+
+    def __init__(self, search_backend: SearchBackend, openai_client: "openai.AsyncOpenAI | None" = None):
+        self.search_backend: SearchBackend = search_backend
+        self.openai_client: "openai.AsyncOpenAI | None" = openai_client
+
+    def alias_actions(self, tenant: Tenant, index: str, alias: str | None = None) -> list[dict[str, Any]]:
+        """
+        Alias actions pointing a tenant at an index.
+
+        The workspace alias is only added for the live tenant alias, not for
+        staging aliases.
+        """
+        tenant_spec: dict[str, Any] = {"index": index, "alias": alias or tenant.alias, "filter": tenant.filter}
+        if is_shared_index(index):
+            tenant_spec["routing"] = tenant.routing
+        actions: list[dict[str, Any]] = [{"add": tenant_spec}]
+
+        if alias is None:
+            workspace_spec: dict[str, Any] = {
+                "index": index,
+                "alias": workspace_alias(tenant.workspace),
+                "filter": {"term": {"metadata.workspace": tenant.workspace.value}},
+            }
+            if is_shared_index(index):
+                workspace_spec["search_routing"] = ",".join(
+                    Tenant(tenant.workspace, connector).routing for connector in Connector
+                )
+            actions.append({"add": workspace_spec})
+        return actions
+
+    async def _shared_index(self, embedding_dimension: int) -> str:
+        indices = await self.search_backend.get_alias_indices(SHARED_ALIAS)
+        if indices:
+            return indices[0]
+        index = f"{SHARED_ALIAS}-v1"
+        await self.search_backend.create_index(
+            index, embedding_dimension, meta=embedding_meta(DEFAULT_EMBEDDING_MODEL, embedding_dimension)
+        )
+        await self.search_backend.update_aliases([{"add": {"index": index, "alias": SHARED_ALIAS}}])
+        return index
+
+    async def ensure_tenant(
+        self,
+        tenant: Tenant,
+        dedicated: bool = False,
+        embedding_dimension: int = DEFAULT_EMBEDDING_DIMENSION,
+    ) -> str:
+        """Make sure the tenant alias exists and return it."""
+        if tenant.alias in _ensured_aliases:
+            return tenant.alias
+
+        if not await self.search_backend.get_alias_indices(tenant.alias):
+            meta = embedding_meta(DEFAULT_EMBEDDING_MODEL, embedding_dimension)
+            if dedicated:
+                index = f"{tenant.alias}-v1"
+                await self.search_backend.create_index(index, embedding_dimension, number_of_shards=1, meta=meta)
+            else:
+                index = await self._shared_index(embedding_dimension)
+            actions = self.alias_actions(tenant, index)
+
+            # A new tenant on a shared index that is being rebuilt joins the rebuild
+            if not dedicated:
+                rebuilding = await self.search_backend.get_alias_indices(staging_alias(SHARED_ALIAS))
+                if rebuilding:
+                    actions += self.alias_actions(tenant, rebuilding[0], alias=staging_alias(tenant.alias))
+
+            await self.search_backend.update_aliases(actions)
+            logger.info(f"Created alias {tenant.alias} -> {index}")
+
+        _ensured_aliases.add(tenant.alias)
+        return tenant.alias
+
+    async def _staging_target(self, tenant: Tenant) -> str | None:
+        """Staging alias of the tenant if its index is being rebuilt."""
+        alias = staging_alias(tenant.alias)
+        checked_at, exists = _staging_cache.get(alias, (0.0, False))
+        if time.monotonic() - checked_at > STAGING_CACHE_TTL:
+            exists = bool(await self.search_backend.get_alias_indices(alias))
+            _staging_cache[alias] = (time.monotonic(), exists)
+        return alias if exists else None
+
+    async def embedding_meta_of(self, alias: str) -> dict[str, Any]:
+        """
+        Embedding model and dimension of the index behind an alias.
+
+        Lookups are cached for `STAGING_CACHE_TTL` and dropped in every
+        process when `announce_index_change` is called after an alias swap.
+        A workspace alias reports its first index; tenants of one workspace
+        are expected to share an embedding configuration.
+        """
+        checked_at, meta = _embedding_meta_cache.get(alias, (0.0, {}))
+        if time.monotonic() - checked_at > STAGING_CACHE_TTL:
+            try:
+                meta = await self.search_backend.get_index_meta(alias)
+            except IndexNotFoundError:
+                # No index yet; ensure_tenant will create one with the defaults
+                meta = {}
+            meta = {**embedding_meta(DEFAULT_EMBEDDING_MODEL, DEFAULT_EMBEDDING_DIMENSION), **meta}
+            _embedding_meta_cache[alias] = (time.monotonic(), meta)
+        return meta
+
+    async def embedder_for(self, alias: str, priority: Priority = Priority.BACKGROUND) -> EmbeddingService:
+        """Embedder whose vectors match the index behind an alias."""
+        return EmbeddingService.for_index(self.openai_client, await self.embedding_meta_of(alias), priority)
+
+    async def refreshed_embedder(self, alias: str, embedder: EmbeddingService) -> EmbeddingService | None:
+        """
+        After a failed search or write through `alias`, look its embedding
+        settings up again. Returns a new embedder if they no longer match
+        `embedder` (the alias was swapped meanwhile), else None.
+        """
+        _ = _embedding_meta_cache.pop(alias, None)
+        fresh = await self.embedder_for(alias, embedder.priority)
+        if (fresh.model, fresh.dimensions) == (embedder.model, embedder.dimensions):
+            return None
+        logger.info("Embedding settings of %s changed to %s/%s", alias, fresh.model, fresh.dimensions)
+        return fresh
+
+    async def _reembed_for(self, source_alias: str, target_alias: str, documents: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Re-embed documents when the target index uses a different embedding model or dimension."""
+        source_meta = await self.embedding_meta_of(source_alias)
+        target_meta = await self.embedding_meta_of(target_alias)
+        if source_meta == target_meta:
+            return documents
+
+        embedder = EmbeddingService.for_index(self.openai_client, target_meta)
+        vectors = await embedder.embed([document["text"] for document in documents])
+        return [{**document, "chunk_vector": vector} for document, vector in zip(documents, vectors)]
+
+    async def write_chunks(self, tenant: Tenant, chunks: Sequence[Mapping[str, Any]]) -> int:
+        """
+        Write chunks through the tenant alias, stamping the tenant and a
+        document version (ingestion time in ms, unless given) into metadata.
+
+        During a rebuild the chunks are also written to the staging alias,
+        re-embedded if the new index uses another embedding configuration.
+        Cached chat answers citing the documents are invalidated in every process.
+        """
+        alias = await self.ensure_tenant(tenant)
+        doc_version = int(time.time() * 1000)
+        documents = [
+            {
+                **chunk,
+                "metadata": {
+                    "doc_version": doc_version,
+                    **(chunk.get("metadata") or {}),
+                    "workspace": tenant.workspace.value,
+                    "connector": tenant.connector.value,
+                },
+            }
+            for chunk in chunks
+        ]
+        written = await self.search_backend.index_chunks(alias, documents)
+        _ = await invalidate_everywhere({document["doc_id"] for document in documents})
+
+        staging = await self._staging_target(tenant)
+        if staging:
+            _ = await self.search_backend.index_chunks(staging, await self._reembed_for(alias, staging, documents))
+        return written
+
+    async def delete_chunks(self, tenant: Tenant, doc_ids: Sequence[str]) -> int:
+        """Delete documents' chunks through the tenant alias (and staging alias during a rebuild)."""
+        alias = await self.ensure_tenant(tenant)
+        deleted = await self.search_backend.delete_by_doc_ids(alias, doc_ids)
+        _ = await invalidate_everywhere(doc_ids)
+
+        staging = await self._staging_target(tenant)
+        if staging:
+            _ = await self.search_backend.delete_by_doc_ids(staging, doc_ids)
+        return deleted
+
+    async def doc_versions(self, alias: str, doc_ids: Sequence[str]) -> dict[str, Any]:
+        """Version `write_chunks` stamped on each document's chunks; deleted documents are absent."""
+        return await self.search_backend.doc_versions(alias, doc_ids)
+
+    @staticmethod
+    def read_alias(workspace: Workspace, connector: Connector | None = None) -> str:
+        """Alias to search: the tenant alias when the connector is known."""
+        if connector is None:
+            return workspace_alias(workspace)
+        return Tenant(workspace, connector).alias
+
+    @staticmethod
+    def read_filters(workspace: Workspace, connector: Connector | None = None) -> dict[str, str]:
+        """
+        Tenant terms for queries through `read_alias`.
+
+        Alias filters are applied after the approximate kNN phase, so on the
+        shared index other tenants' chunks could fill the top k and leave
+        fewer hits than asked for. Passed as query filters, they restrict
+        the kNN search itself.
+        """
+        if connector is None:
+            return {"metadata.workspace": workspace.value}
+        return Tenant(workspace, connector).terms
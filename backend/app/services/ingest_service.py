@@ -0,0 +1,96 @@
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from app.config.lifespan import Context
+from app.config.logger import create_logger
+from app.enums.connector import Connector
+from app.enums.workspace import Workspace
+from app.services.embedding_service import EMBEDDING_BATCH_SIZE, EmbeddingService
+from app.services.index_service import IndexService, Tenant
+from app.services.suggest_service import SuggestService
+from app.utils.chunker import chunk_document
+
+logger = create_logger(__name__)
+
+# Called with the stage ("chunking", "embedding", "indexing") and, while embedding, the fraction done
+ProgressCallback = Callable[[str, float | None], Awaitable[None]]
+
+# Awaited right before a document's chunks are replaced; raising abandons the document
+WriteGuard = Callable[[], Awaitable[None]]
+
+
+class IngestService:
+    """Turns parsed documents into searchable chunks. Runs in job workers, never in request handlers."""
+
+    def __init__(self, ctx: Context):
+        self.ctx: Context = ctx
+        self.index_service: IndexService = IndexService(ctx.search_backend, ctx.openai_client)
+        self.suggest_service: SuggestService = SuggestService(ctx.search_backend)
+
+    async def index_document(
+        self,
+        payload: Mapping[str, Any],
+        progress: ProgressCallback | None = None,
+        before_write: WriteGuard | None = None,
+    ) -> int:
+        """
+        Chunk, embed and index one document, replacing its previous chunks.
+
+        Payload: `workspace`, `connector`, `doc_id`, `text` (parsed, pages
+        separated by form feeds), and optionally `name`, `url`,
+        `content_type` and `hard_page_breaks` (slides). `progress` is told
+        about each stage, and about each embedding request. `before_write`
+        is awaited before each write, after the last progress report.
+        """
+        async def report(stage: str, fraction: float | None = None) -> None:
+            if progress is not None:
+                await progress(stage, fraction)
+
+        tenant = Tenant(Workspace(payload["workspace"]), Connector(payload["connector"]))
+        doc_id: str = payload["doc_id"]
+        metadata = {key: payload[key] for key in ("name", "url", "content_type") if payload.get(key)}
+
+        await report("chunking")
+        chunks = chunk_document(
+            doc_id,
+            payload.get("text") or "",
+            hard_page_breaks=bool(payload.get("hard_page_breaks")),
+            metadata=metadata,
+        )
+        alias = await self.index_service.ensure_tenant(tenant)
+        texts = [chunk.text for chunk in chunks]
+
+        async def embed(embedder: EmbeddingService) -> list[dict[str, Any]]:
+            vectors: list[list[float]] = []
+            for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+                await report("embedding", start / len(texts))
+                vectors.extend(await embedder.embed(texts[start:start + EMBEDDING_BATCH_SIZE]))
+            return [{**chunk.to_document(), "chunk_vector": vector} for chunk, vector in zip(chunks, vectors)]
+
+        embedder = await self.index_service.embedder_for(alias)
+        documents = await embed(embedder)
+
+        await report("indexing")
+        if before_write is not None:
+            await before_write()
+
+        # Chunk IDs hash their text, so edited passages would otherwise linger
+        _ = await self.index_service.delete_chunks(tenant, [doc_id])
+        try:
+            written = await self.index_service.write_chunks(tenant, documents)
+        except Exception:
+            # The alias may have been swapped to an index with other embedding settings while embedding
+            refreshed = await self.index_service.refreshed_embedder(alias, embedder)
+            if refreshed is None:
+                raise
+            documents = await embed(refreshed)
+            await report("indexing")
+            if before_write is not None:
+                await before_write()
+            written = await self.index_service.write_chunks(tenant, documents)
+        if metadata.get("name"):
+            _ = await self.suggest_service.upsert_files(
+                [{"id": doc_id, "doc_id": doc_id, "workspace": tenant.workspace.value, "connector": tenant.connector.value, **metadata}]
+            )
+        logger.info("Indexed %s as %d chunks", doc_id, written)
+        return written
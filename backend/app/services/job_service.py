@@ -0,0 +1,110 @@
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.event_hub import publish
+from app.config.lifespan import Context
+from app.config.logger import create_logger
+from app.enums.connector import Connector
+from app.enums.job_kind import JobKind
+from app.enums.job_state import JobState
+from app.enums.sync_status import SyncStatus
+from app.enums.workspace import Workspace
+from app.models.job import Job
+from app.repositories.job import CreateJobData, JobRepository
+from app.services.delete_service import DELETE_JOB_SIZE
+
+logger = create_logger(__name__)
+
+# Dashboard status of an item per job kind and state; finished deletions have no item left to show
+_STATUSES: dict[JobKind, dict[JobState, SyncStatus]] = {
+    JobKind.INDEX_DOCUMENT: {
+        JobState.QUEUED: SyncStatus.SYNCING,
+        JobState.RUNNING: SyncStatus.SYNCING,
+        JobState.SUCCEEDED: SyncStatus.SYNCED,
+        JobState.DEAD: SyncStatus.SYNCING_FAILED,
+    },
+    JobKind.DELETE_DOCUMENTS: {
+        JobState.QUEUED: SyncStatus.DELETING,
+        JobState.RUNNING: SyncStatus.DELETING,
+        JobState.DEAD: SyncStatus.DELETING_FAILED,
+    },
+}
+
+
+def status_events(
+    job: Job,
+    state: JobState,
+    stage: str | None = None,
+    progress: float | None = None,
+    error: str | None = None,
+) -> list[dict[str, Any]]:
+    """Status stream events of the job's items in `state` (`StatusUpdate` in the frontend)."""
+    workspace = job.payload.get("workspace")
+    doc_ids: list[str] = job.payload.get("doc_ids") or [job.key]
+    if job.kind is JobKind.DELETE_DOCUMENTS and state is JobState.SUCCEEDED:
+        return [{"id": doc_id, "workspace": workspace, "deleted": True} for doc_id in doc_ids]
+
+    status = _STATUSES.get(job.kind, {}).get(state)
+    if status is None:
+        return []
+    event: dict[str, Any] = {"workspace": workspace, "status": status.value}
+    if stage is not None:
+        event["stage"] = stage
+    if progress is not None:
+        event["progress"] = round(progress, 3)
+    if error is not None:
+        event["error"] = error
+    return [{"id": doc_id, **event} for doc_id in doc_ids]
+
+
+async def publish_statuses(session: AsyncSession, events: Sequence[Mapping[str, Any]]) -> None:
+    """Notify status streams in every process; best effort, a missed event is fixed by the next one or a refetch."""
+    if not events:
+        return
+    try:
+        await publish(session, events)
+        await session.commit()
+    except Exception as _:
+        logger.warning(f"Failed to publish {len(events)} status events", exc_info=True)
+        await session.rollback()
+
+
+class JobService:
+    """Enqueues background work and keeps the job table bounded."""
+
+    def __init__(self, ctx: Context):
+        self.ctx: Context = ctx
+        self.job_repository: JobRepository = JobRepository(ctx.db_session)
+
+    async def enqueue_delete_documents(self, workspace: Workspace, connector: Connector, doc_ids: Sequence[str]) -> list[Job]:
+        """Queue documents for deletion, `DELETE_JOB_SIZE` per job (see `DeleteService.delete_documents`)."""
+        doc_ids = list(dict.fromkeys(doc_ids))
+        jobs = await self.job_repository.enqueue_many(
+            [
+                CreateJobData(
+                    kind=JobKind.DELETE_DOCUMENTS,
+                    key=f"delete:{doc_ids[start]}"[:255],
+                    payload={
+                        "workspace": workspace.value,
+                        "connector": connector.value,
+                        "doc_ids": doc_ids[start:start + DELETE_JOB_SIZE],
+                    },
+                )
+                for start in range(0, len(doc_ids), DELETE_JOB_SIZE)
+            ]
+        )
+        await publish_statuses(
+            self.ctx.db_session, [event for job in jobs for event in status_events(job, JobState.QUEUED, "queued")]
+        )
+        return jobs
+
+    async def purge_finished(self, older_than: float, batch_size: int) -> int:
+        """Delete old finished jobs in bounded batches so no statement holds many row locks."""
+        purged = 0
+        while True:
+            deleted = await self.job_repository.purge_finished(older_than, batch_size)
+            purged += deleted
+            if deleted < batch_size:
+                return purged
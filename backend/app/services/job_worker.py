@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from contextlib import asynccontextmanager
+from typing import Any
+from uuid import uuid4
+
+from app.config.lifespan import Context, InternalContext, open_context
+from app.config.logger import create_logger
+from app.config.request_context import RequestTrace, traced
+from app.enums.job_kind import JobKind
+from app.enums.job_state import JobState
+from app.models.job import Job
+from app.repositories.job import JobRepository
+from app.services.ingest_service import IngestService
+from app.services.delete_service import DeleteService
+from app.services.job_service import publish_statuses, status_events
+
+logger = create_logger(__name__)
+
+# Jobs run at once by one worker
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", "8"))
+
+# Jobs leased per claim query
+JOB_BATCH_SIZE = int(os.getenv("JOB_BATCH_SIZE", "8"))
+
+# Seconds between claims while the queue is empty
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+
+# A lease not renewed for this long is considered abandoned and the job runs again
+JOB_VISIBILITY_TIMEOUT = float(os.getenv("JOB_VISIBILITY_TIMEOUT", "300"))
+
+# Retry backoff: base * 2^(attempt - 1) seconds with jitter, capped
+JOB_RETRY_BASE = float(os.getenv("JOB_RETRY_BASE", "5"))
+JOB_RETRY_MAX = float(os.getenv("JOB_RETRY_MAX", "600"))
+
+# Seconds running jobs get to finish on shutdown before they are handed back
+JOB_SHUTDOWN_GRACE = float(os.getenv("JOB_SHUTDOWN_GRACE", "30"))
+
+JobHandler = Callable[[Context, Job], Awaitable[Any]]
+
+# Each job gets its own session (and rollback on failure), like a request
+job_context = asynccontextmanager(open_context)
+
+
+class JobCancelled(Exception):
+    """Raised by a handler whose job row was deleted while it ran; the job is dropped silently."""
+
+
+async def _index_document(ctx: Context, job: Job) -> None:
+    async def report(stage: str, progress: float | None = None) -> None:
+        await publish_statuses(ctx.db_session, status_events(job, JobState.RUNNING, stage, progress))
+
+    async def before_write() -> None:
+        # Deleting the document deletes this row first and waits for the lock, so its
+        # chunks are removed after this write, or the write does not happen
+        if not await JobRepository(ctx.db_session).lock_if_exists(job):
+            raise JobCancelled(f"Document {job.key} was deleted while it was being indexed")
+
+    _ = await IngestService(ctx).index_document(job.payload, progress=report, before_write=before_write)
+
+
+async def _delete_documents(ctx: Context, job: Job) -> None:
+    async def report(progress: float) -> None:
+        await publish_statuses(ctx.db_session, status_events(job, JobState.RUNNING, "deleting", progress))
+
+    _ = await DeleteService(ctx).delete_documents(job.payload, progress=report)
+
+
+def default_handlers() -> dict[JobKind, JobHandler]:
+    return {
+        JobKind.INDEX_DOCUMENT: _index_document,
+        JobKind.DELETE_DOCUMENTS: _delete_documents,
+    }
+
+
+class JobWorker:
+    """
+    Runs queued jobs from the `jobs` table.
+
+    Up to `batch_size` jobs are leased per claim query and at most
+    `concurrency` run at once. Workers never wait on each other's rows
+    (`SKIP LOCKED`), so throughput scales by adding workers. Leases of
+    running jobs are renewed every third of the visibility timeout; jobs of
+    a worker that died are requeued by any other worker once their lease
+    runs out. Failed jobs are retried with exponential backoff and
+    dead-lettered (`JobState.DEAD`) after `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        internal_ctx: InternalContext,
+        handlers: Mapping[JobKind, JobHandler] | None = None,
+        concurrency: int = JOB_CONCURRENCY,
+        batch_size: int = JOB_BATCH_SIZE,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        visibility_timeout: float = JOB_VISIBILITY_TIMEOUT,
+        worker_id: str | None = None,
+    ):
+        self.internal_ctx: InternalContext = internal_ctx
+        self.handlers: Mapping[JobKind, JobHandler] = handlers or default_handlers()
+        self.concurrency: int = max(concurrency, 1)
+        self.batch_size: int = max(batch_size, 1)
+        self.poll_interval: float = poll_interval
+        self.visibility_timeout: float = visibility_timeout
+        self.worker_id: str = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+        self._running: dict[asyncio.Task[None], Job] = {}
+        self._finished: list[Job] = []
+        self._wakeup: asyncio.Event = asyncio.Event()
+
+    @asynccontextmanager
+    async def _jobs(self) -> AsyncIterator[JobRepository]:
+        async with asynccontextmanager(self.internal_ctx.db_manager.get_session)() as session:
+            yield JobRepository(session)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Claim and run jobs until `stop` is set, then drain gracefully."""
+        logger.info(
+            f"Job worker {self.worker_id} started "
+            f"(concurrency={self.concurrency}, kinds={[kind.value for kind in self.handlers]})"
+        )
+        maintenance = asyncio.create_task(self._maintain(stop))
+        try:
+            while not stop.is_set():
+                await self._flush_finished()
+                free = self.concurrency - len(self._running)
+                want = min(free, self.batch_size)
+                claimed: list[Job] = []
+                if want > 0:
+                    try:
+                        async with self._jobs() as jobs:
+                            claimed = await jobs.claim(list(self.handlers), self.worker_id, want, self.visibility_timeout)
+                            await publish_statuses(jobs.db, [event for job in claimed for event in status_events(job, JobState.RUNNING, "started")])
+                    except Exception as _:
+                        logger.warning("Failed to claim jobs", exc_info=True)
+
+                for job in claimed:
+                    task = asyncio.create_task(self._execute(job))
+                    self._running[task] = job
+                    task.add_done_callback(self._on_done)
+
+                # A full batch means more work is likely waiting; otherwise sleep until a slot frees up
+                if want == 0 or len(claimed) < want:
+                    await self._sleep(stop, self.poll_interval)
+        finally:
+            _ = maintenance.cancel()
+            await self._shutdown()
+            logger.info(f"Job worker {self.worker_id} stopped")
+
+    async def _sleep(self, stop: asyncio.Event, timeout: float) -> None:
+        self._wakeup.clear()
+        waiters = [asyncio.ensure_future(stop.wait()), asyncio.ensure_future(self._wakeup.wait())]
+        try:
+            _ = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                _ = waiter.cancel()
+
+    def _on_done(self, task: asyncio.Task[None]) -> None:
+        _ = self._running.pop(task, None)
+        self._wakeup.set()
+
+    async def _execute(self, job: Job) -> None:
+        # Each job runs in its own task, so its logs and spans stay separate
+        with traced(RequestTrace(uuid4().hex, task_id=str(job.id))) as trace:
+            try:
+                async with job_context(self.internal_ctx) as ctx:
+                    await self.handlers[job.kind](ctx, job)
+            except asyncio.CancelledError:
+                raise
+            except JobCancelled as e:
+                logger.info("Job %s (%s) cancelled: %s", job.id, job.kind.value, e)
+                return
+            except Exception as e:
+                await self._fail(job, e)
+                return
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Job %s (%s) finished in %.2fs (%s)", job.id, job.kind.value, trace.elapsed(), trace.summary())
+        self._finished.append(job)
+
+    async def _flush_finished(self) -> None:
+        """Mark finished jobs succeeded, in one statement per loop iteration."""
+        if not self._finished:
+            return
+        finished, self._finished = self._finished, []
+        try:
+            async with self._jobs() as jobs:
+                completed = await jobs.complete(finished, self.worker_id)
+                await publish_statuses(jobs.db, [event for job in finished for event in status_events(job, JobState.SUCCEEDED)])
+            if completed < len(finished):
+                logger.warning(f"{len(finished) - completed} jobs finished after losing their lease")
+        except Exception as _:
+            # The leases run out and the jobs run again; handlers are idempotent
+            logger.warning(f"Failed to mark {len(finished)} jobs succeeded", exc_info=True)
+
+    async def _fail(self, job: Job, error: Exception) -> None:
+        delay = min(JOB_RETRY_BASE * 2 ** max(job.attempts - 1, 0), JOB_RETRY_MAX) * random.uniform(0.5, 1.0)
+        message = f"{type(error).__name__}: {error}"
+        try:
+            async with self._jobs() as jobs:
+                state = await jobs.fail(job, self.worker_id, message[:4000], delay)
+                if state is not None:
+                    stage = "retrying" if state is JobState.QUEUED else None
+                    await publish_statuses(jobs.db, status_events(job, state, stage, error=message[:500]))
+        except Exception as _:
+            logger.warning(f"Failed to record failure of job {job.id}", exc_info=True)
+            return
+        if state is JobState.DEAD:
+            logger.error(f"Job {job.id} ({job.kind.value}) dead-lettered after {job.attempts} attempts: {message}")
+        elif state is JobState.QUEUED:
+            logger.warning("Job %s (%s) attempt %d failed, retrying in %.0fs: %s", job.id, job.kind.value, job.attempts, delay, message)
+
+    async def _maintain(self, stop: asyncio.Event) -> None:
+        """Renew our leases and requeue jobs abandoned by other workers."""
+        interval = self.visibility_timeout / 3
+        while not stop.is_set():
+            await asyncio.sleep(interval)
+            try:
+                async with self._jobs() as jobs:
+                    running = list(self._running.values())
+                    held = await jobs.extend(running, self.worker_id, self.visibility_timeout)
+                    if held < len(running):
+                        logger.warning(f"{len(running) - held} running jobs lost their lease")
+                    requeued = await jobs.requeue_expired()
+                    await publish_statuses(
+                        jobs.db,
+                        [
+                            event
+                            for job in requeued
+                            for event in status_events(job, job.state, "queued" if job.state is JobState.QUEUED else None)
+                        ],
+                    )
+                if requeued:
+                    logger.warning(f"Requeued {len(requeued)} jobs with expired leases")
+            except Exception as _:
+                logger.warning("Job lease maintenance failed", exc_info=True)
+
+    async def _shutdown(self) -> None:
+        """Let running jobs finish within the grace period, hand the rest back to the queue."""
+        if self._running:
+            logger.info(f"Waiting up to {JOB_SHUTDOWN_GRACE}s for {len(self._running)} running jobs")
+            _, pending = await asyncio.wait(list(self._running), timeout=JOB_SHUTDOWN_GRACE)
+            unfinished = [self._running[task] for task in pending if task in self._running]
+            for task in pending:
+                _ = task.cancel()
+            _ = await asyncio.gather(*pending, return_exceptions=True)
+            if unfinished:
+                try:
+                    async with self._jobs() as jobs:
+                        released = await jobs.release(unfinished, self.worker_id)
+                        await publish_statuses(jobs.db, [event for job in unfinished for event in status_events(job, JobState.QUEUED, "queued")])
+                    logger.info(f"Released {released} unfinished jobs")
+                except Exception as _:
+                    logger.warning(f"Failed to release {len(unfinished)} jobs, they requeue when their lease expires", exc_info=True)
+        await self._flush_finished()
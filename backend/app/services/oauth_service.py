@@ -1,18 +1,35 @@
+import asyncio
 import os
-import aiohttp
 from datetime import datetime, timezone
 from typing import Optional
 
+import httpx
+
 from app.config.logger import create_logger
+from app.config.metrics import OAUTH_LATENCY, timed
 from app.enums.connector import Connector
 from app.dto.auth import TokenInfo
 
 logger = create_logger(__name__)
 
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+GOOGLE_REVOKE_URL = "https://oauth2.googleapis.com/revoke"
+GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+GOOGLE_DRIVE_ABOUT_URL = "https://www.googleapis.com/drive/v3/about?fields=user"
+
+# Seconds per Google call; the shared client's default is sized for long OpenAI requests
+OAUTH_TIMEOUT = float(os.getenv("OAUTH_TIMEOUT", "10"))
+
 class OAuthService:
-    """Handles OAuth provider-specific communication for different connectors"""
+    """
+    Handles OAuth provider-specific communication for different connectors
+
+    Calls go through the application's pooled httpx client, so
+    connections to Google are kept alive across requests.
+    """
 
-    def __init__(self):
+    def __init__(self, http_client: httpx.AsyncClient):
+        self.http_client: httpx.AsyncClient = http_client
         self.google_client_id: str | None = os.getenv("GOOGLE_CLIENT_ID")
         self.google_client_secret: str | None = os.getenv("GOOGLE_CLIENT_SECRET")
 
@@ -54,6 +71,7 @@ class OAuthService:
             logger.warning(f"Token revocation not implemented for {connector}")
             return False
 
+    @timed(OAUTH_LATENCY.labels("google", "exchange_code"), span="oauth")
     async def _exchange_google_auth_code(
         self, 
         auth_code: str,
@@ -72,46 +90,43 @@ class OAuthService:
             if code_verifier:
                 token_params["code_verifier"] = code_verifier
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://oauth2.googleapis.com/token", 
-                    data=token_params
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Google token exchange failed ({response.status}): {error_text}")
-                        raise Exception(f"Token exchange failed: {error_text}")
-
-                    tokens = await response.json()
-                    
-                    # Verify we got the tokens we need
-                    if not tokens.get("access_token"):
-                        raise Exception("No access token received from Google")
-
-                    # Calculate expiry timestamp
-                    expires_in = tokens.get("expires_in", 3600)
-                    access_token_expiry = int(datetime.now(timezone.utc).timestamp() + expires_in)
-
-                    # Get user info including email from Google
-                    user_email = await self._get_google_user_email(tokens["access_token"])
-                    
-                    # Verify Google Drive access
-                    await self._verify_google_drive_access(tokens["access_token"])
-
-                    return TokenInfo(
-                        access_token=tokens["access_token"],
-                        refresh_token=tokens.get("refresh_token"),
-                        access_token_expiry_date=access_token_expiry,
-                        refresh_token_expiry_date=None,  # Google doesn't provide this
-                        email=user_email,
-                        connected=True,
-                        expires_in=expires_in
-                    )
+            response = await self.http_client.post(GOOGLE_TOKEN_URL, data=token_params, timeout=OAUTH_TIMEOUT)
+            if response.status_code != 200:
+                error_text = response.text
+                logger.error(f"Google token exchange failed ({response.status_code}): {error_text}")
+                raise Exception(f"Token exchange failed: {error_text}")
+
+            tokens = response.json()
+
+            # Verify we got the tokens we need
+            if not tokens.get("access_token"):
+                raise Exception("No access token received from Google")
+
+            # Calculate expiry timestamp
+            expires_in = tokens.get("expires_in", 3600)
+            access_token_expiry = int(datetime.now(timezone.utc).timestamp() + expires_in)
+
+            # Get user info including email and verify Google Drive access, concurrently
+            user_email, _ = await asyncio.gather(
+                self._get_google_user_email(tokens["access_token"]),
+                self._verify_google_drive_access(tokens["access_token"]),
+            )
+
+            return TokenInfo(
+                access_token=tokens["access_token"],
+                refresh_token=tokens.get("refresh_token"),
+                access_token_expiry_date=access_token_expiry,
+                refresh_token_expiry_date=None,  # Google doesn't provide this
+                email=user_email,
+                connected=True,
+                expires_in=expires_in
+            )
 
         except Exception as e:
             logger.error(f"Google auth code exchange error: {e}")
             raise e
 
+    @timed(OAUTH_LATENCY.labels("google", "refresh_token"), span="oauth")
     async def _refresh_google_token(self, refresh_token: str) -> TokenInfo:
         """Refresh Google access token using refresh token"""
         try:
@@ -122,104 +137,94 @@ class OAuthService:
                 "grant_type": "refresh_token",
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://oauth2.googleapis.com/token", 
-                    data=refresh_params
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Google token refresh failed ({response.status}): {error_text}")
-                        
-                        # Check for invalid refresh token
-                        if "invalid_grant" in error_text.lower():
-                            raise Exception("Invalid refresh token - reconnection required")
-                        
-                        raise Exception(f"Token refresh failed: {error_text}")
-
-                    tokens = await response.json()
-                    
-                    if not tokens.get("access_token"):
-                        raise Exception("No access token received from refresh")
-
-                    expires_in = tokens.get("expires_in", 3600)
-                    access_token_expiry = int(datetime.now(timezone.utc).timestamp() + expires_in)
-                    
-                    # Get user email from the new access token
-                    user_email = await self._get_google_user_email(tokens["access_token"])
-
-                    return TokenInfo(
-                        access_token=tokens["access_token"],
-                        refresh_token=tokens.get("refresh_token") or refresh_token,  # Keep old if not provided
-                        access_token_expiry_date=access_token_expiry,
-                        refresh_token_expiry_date=None,
-                        email=user_email,
-                        connected=True,
-                        expires_in=expires_in
-                    )
+            response = await self.http_client.post(GOOGLE_TOKEN_URL, data=refresh_params, timeout=OAUTH_TIMEOUT)
+            if response.status_code != 200:
+                error_text = response.text
+                logger.error(f"Google token refresh failed ({response.status_code}): {error_text}")
+
+                # Check for invalid refresh token
+                if "invalid_grant" in error_text.lower():
+                    raise Exception("Invalid refresh token - reconnection required")
+
+                raise Exception(f"Token refresh failed: {error_text}")
+
+            tokens = response.json()
+
+            if not tokens.get("access_token"):
+                raise Exception("No access token received from refresh")
+
+            expires_in = tokens.get("expires_in", 3600)
+            access_token_expiry = int(datetime.now(timezone.utc).timestamp() + expires_in)
+
+            # Get user email from the new access token
+            user_email = await self._get_google_user_email(tokens["access_token"])
+
+            return TokenInfo(
+                access_token=tokens["access_token"],
+                refresh_token=tokens.get("refresh_token") or refresh_token,  # Keep old if not provided
+                access_token_expiry_date=access_token_expiry,
+                refresh_token_expiry_date=None,
+                email=user_email,
+                connected=True,
+                expires_in=expires_in
+            )
 
         except Exception as e:
             logger.error(f"Google token refresh error: {e}")
             raise e
 
+    @timed(OAUTH_LATENCY.labels("google", "revoke_token"), span="oauth")
     async def _revoke_google_token(self, access_token: str) -> bool:
         """Revoke Google access token"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://oauth2.googleapis.com/revoke",
-                    params={"token": access_token},
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                ) as response:
-                    if response.status == 200:
-                        logger.info("Google token revoked successfully")
-                        return True
-                    else:
-                        error_text = await response.text()
-                        logger.warning(f"Google token revocation failed: {error_text}")
-                        return False
+            response = await self.http_client.post(
+                GOOGLE_REVOKE_URL,
+                params={"token": access_token},
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=OAUTH_TIMEOUT,
+            )
+            if response.status_code == 200:
+                logger.info("Google token revoked successfully")
+                return True
+            else:
+                logger.warning(f"Google token revocation failed: {response.text}")
+                return False
         except Exception as e:
             logger.error(f"Google token revocation error: {e}")
             return False
 
+    @timed(OAUTH_LATENCY.labels("google", "userinfo"), span="oauth")
     async def _get_google_user_email(self, access_token: str) -> str:
         """Get user email from Google OAuth token"""
         try:
             headers = {"Authorization": f"Bearer {access_token}"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://www.googleapis.com/oauth2/v2/userinfo",
-                    headers=headers,
-                ) as response:
-                    if response.status != 200:
-                        raise Exception("Failed to get user info from Google")
-                    
-                    user_info = await response.json()
-                    user_email = user_info.get("email")
-                    
-                    if not user_email:
-                        raise Exception("Email not found in Google user info")
-                    
-                    logger.info(f"Retrieved user email from Google: {user_email}")
-                    return user_email
-                    
+            response = await self.http_client.get(GOOGLE_USERINFO_URL, headers=headers, timeout=OAUTH_TIMEOUT)
+            if response.status_code != 200:
+                raise Exception("Failed to get user info from Google")
+
+            user_info = response.json()
+            user_email = user_info.get("email")
+
+            if not user_email:
+                raise Exception("Email not found in Google user info")
+
+            logger.info(f"Retrieved user email from Google: {user_email}")
+            return user_email
+
         except Exception as e:
             logger.error(f"Error getting Google user email: {e}")
             raise Exception("Failed to retrieve user email from Google")
 
+    @timed(OAUTH_LATENCY.labels("google", "drive_access"), span="oauth")
     async def _verify_google_drive_access(self, access_token: str) -> None:
         """Verify that the access token has Google Drive access"""
         try:
             headers = {"Authorization": f"Bearer {access_token}"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://www.googleapis.com/drive/v3/about?fields=user",
-                    headers=headers,
-                ) as response:
-                    if response.status != 200:
-                        raise Exception("Google Drive access verification failed - insufficient permissions")
-                    
-                    logger.info("Google Drive access verified successfully")
+            response = await self.http_client.get(GOOGLE_DRIVE_ABOUT_URL, headers=headers, timeout=OAUTH_TIMEOUT)
+            if response.status_code != 200:
+                raise Exception("Google Drive access verification failed - insufficient permissions")
+
+            logger.info("Google Drive access verified successfully")
         except Exception as e:
             logger.error(f"Google Drive access verification failed: {e}")
             raise Exception("Google Drive access not available - please ensure proper scope is granted")
\ No newline at end of file
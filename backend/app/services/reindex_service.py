@@ -0,0 +1,222 @@
+import asyncio
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import openai
+
+from app.config.logger import create_logger
+from app.config.search_backend import DEFAULT_NUMBER_OF_SHARDS, SearchBackend, SearchHit
+from app.enums.connector import Connector
+from app.enums.workspace import Workspace
+from app.services.embedding_service import EmbeddingService
+from app.services.index_service import (
+    SHARED_ALIAS,
+    STAGING_CACHE_TTL,
+    IndexService,
+    Tenant,
+    announce_index_change,
+    embedding_meta,
+    is_shared_index,
+    next_index_version,
+    staging_alias,
+    workspace_alias,
+)
+
+logger = create_logger(__name__)
+
+REINDEX_BATCH_SIZE = int(os.getenv("REINDEX_BATCH_SIZE", "200"))
+
+# Upper bound on re-embedding throughput so backfills leave headroom for live traffic
+REINDEX_MAX_CHUNKS_PER_SECOND = float(os.getenv("REINDEX_MAX_CHUNKS_PER_SECOND", "100"))
+
+
+class ReindexService:
+    """
+    Zero-downtime rebuild of a chunk index with a new embedding configuration.
+
+    1. Create the next versioned index (`...-v2` -> `...-v3`) with the new
+       embedding model/dimension recorded in its metadata.
+    2. Point a staging alias per tenant at it. From then on
+       `IndexService.write_chunks`/`delete_chunks` dual-write to both indexes.
+    3. Back-fill from the stored chunk text, re-embedding at a throttled
+       rate. Back-filled chunks never overwrite dual-written ones.
+    4. Drop chunks the back-fill copied after they were deleted or replaced
+       in the old index.
+    5. Swap every read alias to the new index in one atomic alias update.
+
+    Reads keep hitting the old index until step 5, so search latency is
+    unaffected by the rebuild. Operators start it with
+    `python -m app.worker reindex`.
+    """
+
+    def __init__(
+        self,
+        search_backend: SearchBackend,
+        openai_client: "openai.AsyncOpenAI | None",
+        batch_size: int = REINDEX_BATCH_SIZE,
+        max_chunks_per_second: float = REINDEX_MAX_CHUNKS_PER_SECOND,
+    ):
+        self.search_backend: SearchBackend = search_backend
+        self.index_service: IndexService = IndexService(search_backend, openai_client)
+        self.openai_client: "openai.AsyncOpenAI | None" = openai_client
+        self.batch_size: int = batch_size
+        self.max_chunks_per_second: float = max_chunks_per_second
+
+    async def _tenants_on(self, index: str) -> list[Tenant]:
+        return [
+            tenant for tenant in Tenant.all()
+            if index in await self.search_backend.get_alias_indices(tenant.alias)
+        ]
+
+    async def reindex(
+        self,
+        source_alias: str,
+        embedding_model: str,
+        embedding_dimension: int,
+        delete_old: bool = False,
+    ) -> str:
+        """
+        Rebuild the index behind `source_alias` and return the new index name.
+
+        Args:
+            source_alias: `SHARED_ALIAS` or the alias of a tenant with a dedicated index
+            embedding_model: Embedding model of the new index
+            embedding_dimension: Vector dimension of the new index
+            delete_old: Drop the old index once the aliases are swapped
+        """
+        indices = await self.search_backend.get_alias_indices(source_alias)
+        if len(indices) != 1:
+            raise Exception(f"Alias {source_alias} must point to exactly one index, found {indices}")
+        old_index = indices[0]
+        new_index = next_index_version(old_index)
+        shared = is_shared_index(old_index)
+
+        await self.search_backend.create_index(
+            new_index,
+            embedding_dimension,
+            number_of_shards=DEFAULT_NUMBER_OF_SHARDS if shared else 1,
+            meta=embedding_meta(embedding_model, embedding_dimension),
+        )
+
+        # Start dual writes
+        tenants = await self._tenants_on(old_index)
+        staging_actions: list[dict[str, Any]] = []
+        for tenant in tenants:
+            staging_actions += self.index_service.alias_actions(tenant, new_index, alias=staging_alias(tenant.alias))
+        if shared:
+            staging_actions.append({"add": {"index": new_index, "alias": staging_alias(SHARED_ALIAS)}})
+        await self.search_backend.update_aliases(staging_actions)
+        await announce_index_change()
+        logger.info(f"Reindexing {old_index} -> {new_index} for {len(tenants)} tenants")
+
+        # Processes that missed the announcement notice the staging aliases once their lookup expires
+        await asyncio.sleep(STAGING_CACHE_TTL)
+        copied = await self._backfill(old_index, embedding_model, embedding_dimension)
+        dropped = await self._drop_stale(old_index, new_index)
+
+        # Tenants created during the backfill joined the rebuild through ensure_tenant
+        tenants = await self._tenants_on(old_index)
+        swap_actions: list[dict[str, Any]] = []
+        for tenant in tenants:
+            swap_actions.append({"remove": {"index": old_index, "alias": tenant.alias}})
+            swap_actions += self.index_service.alias_actions(tenant, new_index)
+        for workspace in {tenant.workspace for tenant in tenants}:
+            swap_actions.append({"remove": {"index": old_index, "alias": workspace_alias(workspace)}})
+        if shared:
+            swap_actions.append({"remove": {"index": old_index, "alias": SHARED_ALIAS}})
+            swap_actions.append({"add": {"index": new_index, "alias": SHARED_ALIAS}})
+        await self.search_backend.update_aliases(swap_actions)
+        # Queries must be embedded for the new index from now on
+        await announce_index_change()
+        logger.info(f"Swapped aliases to {new_index} after copying {copied} chunks ({dropped} stale copies dropped)")
+
+        # Writers may still hold a cached staging lookup, keep the alias until it expires
+        await asyncio.sleep(STAGING_CACHE_TTL * 2)
+        cleanup_actions = [
+            {"remove": {"index": new_index, "alias": staging_alias(tenant.alias)}} for tenant in tenants
+        ]
+        if shared:
+            cleanup_actions.append({"remove": {"index": new_index, "alias": staging_alias(SHARED_ALIAS)}})
+        await self.search_backend.update_aliases(cleanup_actions)
+
+        if delete_old:
+            await self.search_backend.delete_index(old_index)
+        return new_index
+
+    async def _backfill(self, old_index: str, embedding_model: str, embedding_dimension: int) -> int:
+        """Copy chunks into the tenants' staging aliases with freshly computed embeddings."""
+        embedder = EmbeddingService(self.openai_client, model=embedding_model, dimensions=embedding_dimension)
+        min_batch_seconds = self.batch_size / self.max_chunks_per_second
+        copied = 0
+
+        async for batch in self.search_backend.scan(old_index, batch_size=self.batch_size):
+            started = time.monotonic()
+            vectors = await embedder.embed([hit.text for hit in batch])
+
+            by_tenant: dict[Tenant, list[dict[str, Any]]] = {}
+            for hit, vector in zip(batch, vectors):
+                tenant = self._tenant_of(hit)
+                if tenant is None:
+                    logger.warning(f"Skipping chunk {hit.id} without tenant metadata")
+                    continue
+                by_tenant.setdefault(tenant, []).append(self._to_document(hit, vector))
+
+            for tenant, documents in by_tenant.items():
+                copied += await self.search_backend.index_chunks(
+                    staging_alias(tenant.alias), documents, overwrite=False
+                )
+
+            # Throttle re-embedding
+            elapsed = time.monotonic() - started
+            if elapsed < min_batch_seconds:
+                await asyncio.sleep(min_batch_seconds - elapsed)
+
+        return copied
+
+    async def _drop_stale(self, old_index: str, new_index: str) -> int:
+        """
+        Delete chunks of the new index that are no longer in the old one.
+
+        The back-fill writes a snapshot create-only, so a chunk deleted after
+        the snapshot was read (its document deleted or re-indexed) is written
+        again after the dual-write delete removed it. With the back-fill done,
+        every later delete reaches both indexes, and writes reach the old
+        index first, so one pass over the new index before the swap finds
+        all such chunks.
+        """
+        shared = is_shared_index(old_index)
+        dropped = 0
+        async for batch in self.search_backend.scan(new_index, batch_size=self.batch_size):
+            # Chunks of the shared index are routed by tenant, real-time lookups need the routing value
+            by_routing: dict[str | None, list[str]] = {}
+            for hit in batch:
+                tenant = self._tenant_of(hit)
+                by_routing.setdefault(tenant.routing if shared and tenant else None, []).append(hit.id)
+
+            stale: list[str] = []
+            for routing, ids in by_routing.items():
+                live = await self.search_backend.existing_ids(old_index, ids, routing=routing)
+                stale += [chunk_id for chunk_id in ids if chunk_id not in live]
+            if stale:
+                dropped += await self.search_backend.delete_by_ids(new_index, stale)
+        return dropped
+
+    @staticmethod
+    def _tenant_of(hit: SearchHit) -> Tenant | None:
+        try:
+            return Tenant(Workspace(hit.metadata["workspace"]), Connector(hit.metadata["connector"]))
+        except (KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def _to_document(hit: SearchHit, vector: list[float]) -> dict[str, Any]:
+        return {
+            "id": hit.id,
+            "doc_id": hit.doc_id,
+            "text": hit.text,
+            "metadata": hit.metadata,
+            "created_at": hit.created_at,
+            "chunk_vector": vector,
+        }
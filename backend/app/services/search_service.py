@@ -0,0 +1,63 @@
+import os
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from app.config.lifespan import Context
+from app.config.logger import create_logger
+from app.config.search_backend import SearchHit
+from app.enums.connector import Connector
+from app.enums.workspace import Workspace
+from app.services.index_service import IndexService
+from app.utils.mmr import mmr_diversify
+
+logger = create_logger(__name__)
+
+# Candidates fetched per requested hit before diversification
+MMR_FETCH_MULTIPLIER = 4
+MMR_LAMBDA = float(os.getenv("SEARCH_MMR_LAMBDA", "0.7"))
+# Hits kept per document after diversification; 0 for no cap
+MMR_MAX_PER_DOC = int(os.getenv("SEARCH_MMR_MAX_PER_DOC", "3"))
+
+
+class SearchService:
+    """Chunk retrieval on top of the configured search backend."""
+
+    def __init__(self, ctx: Context):
+        self.ctx: Context = ctx
+
+    async def search_chunks(
+        self,
+        query_vector: Sequence[float],
+        workspace: Workspace,
+        connector: Connector | None = None,
+        k: int = 10,
+        filters: Mapping[str, Any] | None = None,
+        diversify: bool = True,
+        lambda_mult: float = MMR_LAMBDA,
+        max_per_doc: int | None = MMR_MAX_PER_DOC,
+    ) -> list[SearchHit]:
+        """
+        kNN search followed by an optional MMR diversification stage.
+
+        Searches go through the workspace/connector alias, so with custom
+        routing only the tenant's shard is queried, and carry the tenant terms
+        as kNN filters so other tenants cannot crowd out its hits.
+        """
+        index = IndexService.read_alias(workspace, connector)
+        filters = {**IndexService.read_filters(workspace, connector), **(filters or {})}
+        if not diversify:
+            return await self.ctx.search_backend.knn_search(index, query_vector, k=k, filters=filters)
+
+        candidates = await self.ctx.search_backend.knn_search(
+            index,
+            query_vector,
+            k=k * MMR_FETCH_MULTIPLIER,
+            filters=filters,
+            include_vectors=True,
+        )
+        hits = mmr_diversify(candidates, query_vector, k, lambda_mult=lambda_mult, max_per_doc=max_per_doc)
+
+        # Vectors were only needed for diversification
+        for hit in hits:
+            hit.vector = None
+        return hits
@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from app.config.logger import create_logger
+from app.config.search_backend import SearchBackend
+from app.enums.workspace import Workspace
+from app.services.index_service import CHUNK_INDEX
+
+logger = create_logger(__name__)
+
+SUGGEST_INDEX = f"{CHUNK_INDEX}-suggest"
+
+SUGGEST_CACHE_TTL = 30.0
+SUGGEST_CACHE_SIZE = 2048
+
+# (workspace, normalized prefix, limit) -> (expires at, entries)
+_cache: OrderedDict[tuple[str, str, int], tuple[float, list[dict[str, Any]]]] = OrderedDict()
+_suggest_index_ready: bool = False
+
+
+class SuggestService:
+    """Search-as-you-type completions on file names and titles."""
+
+    def __init__(self, search_backend: SearchBackend):
+        self.search_backend: SearchBackend = search_backend
+
+    async def _ensure_index(self) -> None:
+        global _suggest_index_ready
+        if not _suggest_index_ready:
+            await self.search_backend.create_suggest_index(SUGGEST_INDEX)
+            _suggest_index_ready = True
+
+    async def suggest(self, workspace: Workspace, prefix: str, limit: int = 8) -> list[dict[str, Any]]:
+        """Top completions for a prefix, served from a short-lived in-process cache."""
+        normalized = " ".join(prefix.lower().split())
+        if not normalized:
+            return []
+
+        key = (workspace.value, normalized, limit)
+        cached = _cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            _cache.move_to_end(key)
+            return cached[1]
+
+        await self._ensure_index()
+        entries = await self.search_backend.suggest(
+            SUGGEST_INDEX, normalized, k=limit, filters={"workspace": workspace.value}
+        )
+
+        _cache[key] = (time.monotonic() + SUGGEST_CACHE_TTL, entries)
+        if len(_cache) > SUGGEST_CACHE_SIZE:
+            _ = _cache.popitem(last=False)
+        return entries
+
+    async def upsert_files(self, files: Sequence[Mapping[str, Any]]) -> int:
+        """Add or rename files; each needs `id`, `name` and `workspace`."""
+        await self._ensure_index()
+        written = await self.search_backend.upsert_suggestions(SUGGEST_INDEX, files)
+        _cache.clear()
+        return written
+
+    async def delete_files(self, ids: Sequence[str]) -> int:
+        await self._ensure_index()
+        deleted = await self.search_backend.delete_suggestions(SUGGEST_INDEX, ids)
+        _cache.clear()
+        return deleted
@@ -0,0 +1,246 @@
+import os
+import re
+from bisect import bisect_right
+from collections.abc import Mapping
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Any
+
+from app.utils.tokens import CHARS_PER_TOKEN
+
+CHUNK_SIZE_TOKENS = int(os.getenv("CHUNK_SIZE_TOKENS", "400"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "60"))
+
+# Parsers separate pages (PDF) and slides (PPTX) with a form feed
+PAGE_BREAK = "\f"
+
+# Blank lines end a block; the match swallows the whitespace around it
+_BLOCK_BOUNDARY = re.compile(r"\n\s*\n\s*")
+
+# With hard page breaks every page break ends a block too. The alternation
+# defeats the regex engine's literal prefix scan (~8x slower), so it is only
+# used when needed.
+_BLOCK_OR_PAGE_BOUNDARY = re.compile(r"\n\s*\n\s*|\f\s*")
+
+_TRAILING_WHITESPACE = " \t\r\n"
+
+_SENTENCE_END = (". ", "? ", "! ", ".\n", "。")
+
+
+@dataclass(slots=True)
+class Chunk:
+    id: str
+    doc_id: str
+    text: str
+    metadata: dict[str, Any]
+
+    def to_document(self) -> dict[str, Any]:
+        """Chunk as an index document; `chunk_vector` is added once embedded."""
+        return {"id": self.id, "doc_id": self.doc_id, "text": self.text, "metadata": self.metadata}
+
+
+class _Builder:
+    """Packs block spans into chunk spans over the original text."""
+
+    def __init__(self, doc_id: str, text: str, max_chars: int, overlap_chars: int, base_metadata: Mapping[str, Any]):
+        self.doc_id: str = doc_id
+        self.text: str = text
+        self.max_chars: int = max_chars
+        self.overlap_chars: int = overlap_chars
+        self.base_metadata: Mapping[str, Any] = base_metadata
+        self.page_starts: list[int] = [0]
+        self.chunks: list[Chunk] = []
+        self.seen_ids: dict[str, int] = {}
+        self.section: str = ""
+        self.start: int = -1
+        self.end: int = -1
+        self.has_table: bool = False
+        self.heading_only: bool = False
+
+    def _emit(self, start: int, end: int, table: bool) -> None:
+        text = self.text[start:end]
+        digest = blake2b(text.encode(), digest_size=8).hexdigest()
+        # Identical text repeated in a document gets an occurrence suffix
+        occurrence = self.seen_ids.get(digest, 0)
+        self.seen_ids[digest] = occurrence + 1
+        chunk_id = f"{self.doc_id}:{digest}" if occurrence == 0 else f"{self.doc_id}:{digest}-{occurrence}"
+
+        metadata = {
+            **self.base_metadata,
+            "chunk_index": len(self.chunks),
+            "char_start": start,
+            "char_end": end,
+            "page_start": bisect_right(self.page_starts, start),
+            "page_end": bisect_right(self.page_starts, end - 1),
+            "kind": "table" if table else "text",
+        }
+        if self.section:
+            metadata["section"] = self.section
+        self.chunks.append(Chunk(chunk_id, self.doc_id, text, metadata))
+
+    def flush(self) -> None:
+        if self.start >= 0:
+            self._emit(self.start, self.end, self.has_table)
+        self.start = self.end = -1
+        self.has_table = False
+        self.heading_only = False
+
+    def _overlap_start(self, end: int, floor: int, separator: str = " ") -> int:
+        """Start of the overlap carried into the next chunk, on a word (or table row) boundary."""
+        if self.overlap_chars <= 0:
+            return end
+        lo = max(floor, end - self.overlap_chars)
+        found = self.text.find(separator, lo, end)
+        return found + 1 if found >= 0 else lo
+
+    def add(self, start: int, end: int, table: bool) -> None:
+        # A heading stays attached to the block that follows it
+        if self.heading_only:
+            start = self.start
+            self.start = self.end = -1
+            self.heading_only = False
+
+        if end - start > self.max_chars:
+            self.flush()
+            self._split(start, end, table)
+            return
+
+        if self.start >= 0 and end - self.start > self.max_chars:
+            previous_end, previous_table = self.end, self.has_table
+            self.flush()
+            # Carry an overlap only as far as the new chunk still fits
+            floor = max(previous_end - self.max_chars // 2, end - self.max_chars)
+            separator = "\n" if previous_table and table else " "
+            self.start = self._overlap_start(previous_end, floor, separator) if floor < previous_end else start
+        elif self.start < 0:
+            self.start = start
+        self.end = end
+        self.has_table = self.has_table or table
+
+    def _split(self, start: int, end: int, table: bool) -> None:
+        """Cut an oversized block at row, sentence or word boundaries."""
+        text = self.text
+        position = start
+        while position < end:
+            limit = position + self.max_chars
+            if limit >= end:
+                self.start, self.end, self.has_table = position, end, table
+                return
+
+            floor = position + self.max_chars // 2
+            cut = -1
+            if table:
+                cut = text.rfind("\n", floor, limit)
+            else:
+                for marker in _SENTENCE_END:
+                    found = text.rfind(marker, floor, limit)
+                    if found > cut:
+                        cut = found + 1
+            if cut <= floor:
+                cut = text.rfind(" ", floor, limit)
+            if cut <= floor:
+                cut = limit
+
+            self._emit(position, cut, table)
+            position = max(self._overlap_start(cut, position + 1, "\n" if table else " "), position + 1)
+            # Skip the whitespace the cut landed on
+            while position < end and text[position] in " \n":
+                position += 1
+
+    def heading(self, start: int, end: int, level: int) -> None:
+        self.flush()
+        title = self.text[start + level:end].strip()
+        parts = self.section.split(" > ") if self.section else []
+        self.section = " > ".join([*parts[:level - 1], title])
+        # The heading opens the next chunk so its text is embedded with the section
+        self.start = start
+        self.end = end
+        self.heading_only = True
+
+
+def _heading_level(line: str) -> int:
+    """Markdown ATX heading level of a line, 0 if it is not a heading."""
+    level = len(line) - len(line.lstrip("#"))
+    if level > 6 or line[level:level + 1] not in (" ", ""):
+        return 0
+    return level
+
+
+def chunk_document(
+    doc_id: str,
+    text: str,
+    chunk_size: int = CHUNK_SIZE_TOKENS,
+    overlap: int = CHUNK_OVERLAP_TOKENS,
+    hard_page_breaks: bool = False,
+    metadata: Mapping[str, Any] | None = None,
+) -> list[Chunk]:
+    """
+    Split parsed document text into chunks that follow its structure.
+
+    Blocks are separated by blank lines. Page breaks (`\\f`) set page
+    offsets and, with `hard_page_breaks` (slides), also end blocks. Markdown
+    headings (`#`) start a new chunk and set the `section` path. Table
+    blocks (lines starting with `|`) are split only between rows. Other
+    blocks are packed together up to `chunk_size`, and oversized blocks are
+    cut at sentence or word boundaries. Consecutive chunks of a section
+    share about `overlap` tokens. With `hard_page_breaks`, no chunk spans
+    two pages.
+
+    Every chunk's text is the slice `text[char_start:char_end]`. Sizes are
+    measured in estimated tokens (`CHARS_PER_TOKEN` characters each) so
+    chunking never has to tokenize. IDs hash the chunk text, so unchanged
+    passages keep their ID when a document is re-ingested.
+
+    Returns:
+        Chunks in document order, each with `char_start`, `char_end`,
+        `page_start`, `page_end` (1-based), `chunk_index`, `kind` and
+        `section` metadata
+    """
+    builder = _Builder(
+        doc_id,
+        text,
+        max_chars=max(chunk_size, 1) * CHARS_PER_TOKEN,
+        overlap_chars=max(min(overlap, chunk_size // 2), 0) * CHARS_PER_TOKEN,
+        base_metadata=metadata or {},
+    )
+
+    page_break = text.find(PAGE_BREAK)
+    while page_break >= 0:
+        builder.page_starts.append(page_break + 1)
+        page_break = text.find(PAGE_BREAK, page_break + 1)
+
+    # Blocks are located by offsets only; slicing every block would copy the document twice
+    position = len(text) - len(text.lstrip())
+    length = len(text)
+    boundaries = (_BLOCK_OR_PAGE_BOUNDARY if hard_page_breaks else _BLOCK_BOUNDARY).finditer(text, position)
+    for boundary in [*boundaries, None]:
+        end = boundary.start() if boundary else length
+        while end > position and text[end - 1] in _TRAILING_WHITESPACE:
+            end -= 1
+
+        if end > position:
+            first = text[position]
+            level = 0
+            line_end = -1
+            if first == "#":
+                line_end = text.find("\n", position, end)
+                level = _heading_level(text[position:line_end if line_end >= 0 else end])
+            if level == 0:
+                builder.add(position, end, first == "|")
+            elif line_end < 0:
+                builder.heading(position, end, level)
+            else:
+                builder.heading(position, line_end, level)
+                body_start = line_end + 1
+                while text[body_start] in _TRAILING_WHITESPACE:
+                    body_start += 1
+                builder.add(body_start, end, text[body_start] == "|")
+
+        if boundary is None:
+            break
+        position = boundary.end()
+        if hard_page_breaks and PAGE_BREAK in boundary.group():
+            builder.flush()
+
+    builder.flush()
+    return builder.chunks
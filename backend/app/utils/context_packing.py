@@ -0,0 +1,129 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.config.search_backend import SearchHit
+from app.utils.tokens import count_tokens, truncate_tokens
+
+# Blocks cut down to fewer tokens than this are dropped instead
+MIN_TRUNCATED_TOKENS = 64
+
+
+@dataclass
+class ContextBlock:
+    """Contiguous text from one document, merged from one or more chunks."""
+    doc_id: str
+    text: str
+    score: float
+    chunk_ids: list[str]
+    metadata: dict[str, Any]
+    start: int | None = None
+    end: int | None = None
+    tokens: int = 0
+    truncated: bool = False
+    index: int = 0  # 1-based source number in the prompt
+
+
+@dataclass
+class PackedContext:
+    blocks: list[ContextBlock] = field(default_factory=list)
+    tokens: int = 0
+    dropped: int = 0
+
+
+def _offsets(hit: SearchHit) -> tuple[int, int] | None:
+    start, end = hit.metadata.get("char_start"), hit.metadata.get("char_end")
+    if isinstance(start, int) and isinstance(end, int) and end >= start:
+        return start, end
+    return None
+
+
+def merge_chunks(hits: Sequence[SearchHit]) -> list[ContextBlock]:
+    """
+    Merge adjacent or overlapping chunks of the same document and drop duplicates.
+
+    Chunks carrying `char_start`/`char_end` metadata are stitched together
+    when their ranges touch, keeping the overlapping text once. Chunks
+    without offsets are only de-duplicated by exact text. A merged block
+    scores as its best chunk.
+
+    Returns:
+        Blocks in descending score order
+    """
+    blocks: list[ContextBlock] = []
+    seen_text: set[tuple[str, str]] = set()
+    by_doc: dict[str, list[tuple[int, int, SearchHit]]] = {}
+
+    for hit in hits:
+        key = (hit.doc_id, hit.text)
+        if key in seen_text:
+            continue
+        seen_text.add(key)
+
+        offsets = _offsets(hit)
+        if offsets is None:
+            blocks.append(ContextBlock(hit.doc_id, hit.text, hit.score, [hit.id], dict(hit.metadata)))
+        else:
+            by_doc.setdefault(hit.doc_id, []).append((*offsets, hit))
+
+    for doc_id, spans in by_doc.items():
+        spans.sort(key=lambda span: span[0])
+        current: ContextBlock | None = None
+        for start, end, hit in spans:
+            if current is not None and current.end is not None and start <= current.end:
+                if end > current.end:
+                    current.text += hit.text[current.end - start:]
+                    current.end = end
+                current.score = max(current.score, hit.score)
+                current.chunk_ids.append(hit.id)
+                continue
+            current = ContextBlock(doc_id, hit.text, hit.score, [hit.id], dict(hit.metadata), start, end)
+            blocks.append(current)
+
+    blocks.sort(key=lambda block: block.score, reverse=True)
+    return blocks
+
+
+def pack_context(
+    hits: Sequence[SearchHit],
+    budget: int,
+    render: Callable[[ContextBlock], str],
+) -> PackedContext:
+    """
+    Fill a token budget with the best merged blocks.
+
+    Blocks are taken in score order, each costing the tokens of its rendered
+    form (text plus source header). A block that does not fit is truncated to
+    the remaining budget when enough room is left, otherwise skipped so a
+    smaller lower-ranked block can still fit.
+
+    Args:
+        hits: Retrieved chunks
+        budget: Maximum tokens of the packed context
+        render: Formats a numbered block as it will appear in the prompt
+    """
+    packed = PackedContext()
+    for block in merge_chunks(hits):
+        remaining = budget - packed.tokens
+        if remaining < MIN_TRUNCATED_TOKENS:
+            packed.dropped += 1
+            continue
+
+        block.index = len(packed.blocks) + 1
+        block.tokens = count_tokens(render(block))
+        if block.tokens > remaining:
+            overhead = block.tokens - count_tokens(block.text)
+            if remaining - overhead < MIN_TRUNCATED_TOKENS:
+                packed.dropped += 1
+                continue
+            block.text = truncate_tokens(block.text, remaining - overhead)
+            block.truncated = True
+            block.tokens = count_tokens(render(block))
+            # Token boundaries may shift when the rendered text is re-encoded
+            while block.tokens > remaining and block.text:
+                block.text = truncate_tokens(block.text, count_tokens(block.text) - (block.tokens - remaining))
+                block.tokens = count_tokens(render(block))
+
+        packed.blocks.append(block)
+        packed.tokens += block.tokens
+    return packed
@@ -3,13 +3,12 @@ import sqlalchemy as sa
 from dotenv import load_dotenv
 from sqlalchemy.exc import OperationalError, ProgrammingError
 from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy_utils.functions.database import _set_url_database, make_url
-from sqlalchemy_utils.functions.orm import quote
 from sqlmodel import create_engine
 
 load_dotenv()
 
 # https://github.com/kvesteri/sqlalchemy-utils/issues/611
+# sqlalchemy_utils is imported by the helpers below: the app only needs db_url at startup
 
 
 def db_url():
@@ -30,6 +29,8 @@ async def _get_scalar_result(engine, sql):
 
 
 async def database_exists(url):
+    from sqlalchemy_utils.functions.database import _set_url_database, make_url
+
     url = make_url(url)
     database = url.database
     engine = None
@@ -49,6 +50,9 @@ async def database_exists(url):
 
 
 async def create_database(url, encoding="utf8", template=None):
+    from sqlalchemy_utils.functions.database import _set_url_database, make_url
+    from sqlalchemy_utils.functions.orm import quote
+
     url = make_url(url)
     database = url.database
 
@@ -67,6 +71,9 @@ async def create_database(url, encoding="utf8", template=None):
 
 
 async def drop_database(url):
+    from sqlalchemy_utils.functions.database import _set_url_database, make_url
+    from sqlalchemy_utils.functions.orm import quote
+
     url = make_url(url)
     database = url.database
 
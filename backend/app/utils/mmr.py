@@ -0,0 +1,89 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from app.config.search_backend import SearchHit
+
+
+def _cap_per_doc(hits: Sequence[SearchHit], k: int, max_per_doc: int | None) -> list[SearchHit]:
+    if max_per_doc is None:
+        return list(hits[:k])
+    counts: dict[str, int] = {}
+    selected: list[SearchHit] = []
+    for hit in hits:
+        if counts.get(hit.doc_id, 0) >= max_per_doc:
+            continue
+        counts[hit.doc_id] = counts.get(hit.doc_id, 0) + 1
+        selected.append(hit)
+        if len(selected) == k:
+            break
+    return selected
+
+
+def mmr_diversify(
+    hits: Sequence[SearchHit],
+    query_vector: Sequence[float],
+    k: int,
+    lambda_mult: float = 0.5,
+    max_per_doc: int | None = None,
+) -> list[SearchHit]:
+    """
+    Re-rank hits with maximal marginal relevance.
+
+    Each step picks the candidate maximizing
+    `lambda_mult * sim(query, c) - (1 - lambda_mult) * max(sim(c, selected))`
+    using cosine similarity. The candidate-candidate similarity matrix is
+    computed once, so every step is a handful of O(n) array operations.
+
+    Args:
+        hits: Candidates in relevance order, with `vector` populated
+        query_vector: Query embedding the candidates were retrieved with
+        k: Number of hits to return
+        lambda_mult: 1.0 ranks purely by relevance, 0.0 purely by novelty
+        max_per_doc: Maximum number of hits kept from the same `doc_id`; None or 0 for no cap
+
+    Returns:
+        Up to k hits in MMR selection order
+    """
+    if k <= 0 or not hits:
+        return []
+    if max_per_doc is not None and max_per_doc < 1:
+        max_per_doc = None
+    if any(hit.vector is None for hit in hits):
+        # Nothing to diversify on, keep relevance order
+        return _cap_per_doc(hits, k, max_per_doc)
+
+    vectors = np.stack([np.asarray(hit.vector, dtype=np.float32) for hit in hits])
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    # Not in place: query_vector may be the caller's float32 array
+    query = np.asarray(query_vector, dtype=np.float32)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = vectors @ query
+    similarity = vectors @ vectors.T
+
+    n = len(hits)
+    available = np.ones(n, dtype=bool)
+    max_similarity = np.full(n, -1.0, dtype=np.float32)
+    doc_codes = np.unique([hit.doc_id for hit in hits], return_inverse=True)[1]
+    doc_counts = np.zeros(int(doc_codes.max()) + 1, dtype=np.int64)
+
+    selected: list[int] = []
+    weighted_relevance = lambda_mult * relevance
+    while len(selected) < k and available.any():
+        # Before anything is selected there is no redundancy penalty
+        penalty = (1.0 - lambda_mult) * max_similarity if selected else 0.0
+        scores = np.where(available, weighted_relevance - penalty, -np.inf)
+        best = int(np.argmax(scores))
+
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+
+        if max_per_doc is not None:
+            code = doc_codes[best]
+            doc_counts[code] += 1
+            if doc_counts[code] >= max_per_doc:
+                available &= doc_codes != code
+
+    return [hits[i] for i in selected]
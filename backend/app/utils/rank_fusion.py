@@ -0,0 +1,35 @@
+from collections.abc import Sequence
+
+from app.config.search_backend import SearchHit
+
+# Standard RRF constant, dampens the weight of top ranks
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Sequence[Sequence[SearchHit]],
+    k: int = RRF_K,
+    limit: int | None = None,
+) -> list[SearchHit]:
+    """
+    Fuse ranked hit lists with reciprocal rank fusion.
+
+    A chunk scores `sum(1 / (k + rank))` over the lists it appears in, so
+    chunks found by several queries rise to the top regardless of the raw
+    score scales. The returned hits carry the fused score.
+    """
+    fused: dict[str, float] = {}
+    best: dict[str, SearchHit] = {}
+    for hits in ranked_lists:
+        for rank, hit in enumerate(hits, start=1):
+            fused[hit.id] = fused.get(hit.id, 0.0) + 1.0 / (k + rank)
+            if hit.id not in best:
+                best[hit.id] = hit
+
+    order = sorted(fused, key=fused.__getitem__, reverse=True)[:limit]
+    results: list[SearchHit] = []
+    for chunk_id in order:
+        hit = best[chunk_id]
+        hit.score = fused[chunk_id]
+        results.append(hit)
+    return results
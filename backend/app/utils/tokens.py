@@ -0,0 +1,57 @@
+import os
+from functools import lru_cache
+from typing import Any
+
+from app.config.logger import create_logger
+
+logger = create_logger(__name__)
+
+TOKENIZER_MODEL = os.getenv("CHAT_MODEL", "gpt-4o-mini")
+
+# Rough characters per token for English text, used when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Any:
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken not installed, estimating token counts from text length")
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(TOKENIZER_MODEL)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as _:
+        # Encodings are downloaded on first use
+        logger.warning("Failed to load tiktoken encoding, estimating token counts from text length", exc_info=True)
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Token estimate from text length, for budgeting without tokenizing."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+@lru_cache(maxsize=16384)
+def count_tokens(text: str) -> int:
+    """Token count of text for the chat model, cached by text."""
+    encoding = _encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Longest prefix of text that is at most max_tokens tokens."""
+    if max_tokens <= 0:
+        return ""
+    encoding = _encoding()
+    if encoding is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
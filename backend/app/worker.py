@@ -0,0 +1,141 @@
+"""
+Standalone background worker.
+
+    cd backend && python -m app.worker [--concurrency 8] [--batch-size 8] [--kinds index_document]
+
+Opens the same Postgres, search backend, httpx and OpenAI resources as the
+API (`app_resources`) but serves no HTTP. It runs queued jobs and periodic
+maintenance until SIGTERM/SIGINT, then stops claiming, lets running jobs
+finish within `JOB_SHUTDOWN_GRACE` and hands the rest back to the queue.
+A second signal stops immediately.
+
+The API does not run jobs unless `JOB_WORKER_IN_API=true` (single-process
+development), so at least one worker must run; scale workers separately.
+
+    cd backend && python -m app.worker reindex --model text-embedding-3-small --dimension 512 [--alias ...] [--delete-old]
+
+Rebuilds a chunk index with new embedding settings (see `ReindexService`)
+in the foreground and exits once the aliases are swapped; API and workers
+keep serving meanwhile. An interrupted rebuild is resumed by running the
+same command again.
+"""
+import argparse
+import asyncio
+import os
+import signal
+
+from app.config.lifespan import InternalContext, app_resources
+from app.config.logger import create_logger
+from app.config.rate_governor import WORKER_BACKGROUND_RESERVE, rate_governor
+from app.config.search_backend import DEFAULT_EMBEDDING_DIMENSION
+from app.enums.job_kind import JobKind
+from app.services.embedding_service import DEFAULT_EMBEDDING_MODEL
+from app.services.index_service import SHARED_ALIAS
+from app.services.job_service import JobService
+from app.services.job_worker import (
+    JOB_BATCH_SIZE,
+    JOB_CONCURRENCY,
+    JobWorker,
+    default_handlers,
+    job_context,
+)
+
+logger = create_logger(__name__)
+
+# Seconds between maintenance runs
+WORKER_MAINTENANCE_INTERVAL = float(os.getenv("WORKER_MAINTENANCE_INTERVAL", "3600"))
+
+# Finished jobs are kept this long
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+JOB_PURGE_BATCH_SIZE = 1000
+
+
+async def maintain(ctx: InternalContext, stop: asyncio.Event) -> None:
+    """Periodic housekeeping; safe to run in every worker at once."""
+    while not stop.is_set():
+        try:
+            async with job_context(ctx) as job_ctx:
+                purged = await JobService(job_ctx).purge_finished(JOB_RETENTION_SECONDS, JOB_PURGE_BATCH_SIZE)
+            if purged:
+                logger.info(f"Purged {purged} finished jobs")
+        except Exception as _:
+            logger.warning("Worker maintenance failed", exc_info=True)
+        try:
+            _ = await asyncio.wait_for(stop.wait(), timeout=WORKER_MAINTENANCE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run(concurrency: int, batch_size: int, kinds: list[JobKind] | None) -> None:
+    stop = asyncio.Event()
+    current = asyncio.current_task()
+
+    def on_signal(signum: int) -> None:
+        if stop.is_set():
+            logger.warning(f"Received {signal.Signals(signum).name} again, stopping immediately")
+            if current is not None:
+                _ = current.cancel()
+            return
+        logger.info(f"Received {signal.Signals(signum).name}, shutting down gracefully")
+        stop.set()
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, on_signal, signum)
+
+    handlers = default_handlers()
+    if kinds:
+        handlers = {kind: handler for kind, handler in handlers.items() if kind in kinds}
+
+    async with app_resources() as ctx:
+        worker = JobWorker(ctx, handlers=handlers, concurrency=concurrency, batch_size=batch_size)
+        _ = await asyncio.gather(worker.run(stop), maintain(ctx, stop))
+
+
+async def reindex(alias: str, embedding_model: str, embedding_dimension: int, delete_old: bool) -> None:
+    # Imported here, only this command needs it
+    from app.services.reindex_service import ReindexService
+
+    async with app_resources() as ctx:
+        new_index = await ReindexService(ctx.os_manager, ctx.openai_client).reindex(
+            alias, embedding_model, embedding_dimension, delete_old=delete_old
+        )
+    logger.info(f"Rebuilt {alias} as {new_index} ({embedding_model}, {embedding_dimension} dimensions)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background jobs without the HTTP server")
+    _ = parser.add_argument("--concurrency", type=int, default=JOB_CONCURRENCY, help="Jobs run at once")
+    _ = parser.add_argument("--batch-size", type=int, default=JOB_BATCH_SIZE, help="Jobs leased per claim")
+    _ = parser.add_argument(
+        "--kinds",
+        type=lambda value: [JobKind(kind) for kind in value.split(",")],
+        help=f"Comma-separated job kinds to run (default: all of {', '.join(kind.value for kind in JobKind)})",
+    )
+    commands = parser.add_subparsers(dest="command")
+    reindex_parser = commands.add_parser("reindex", help="Rebuild a chunk index with new embedding settings")
+    _ = reindex_parser.add_argument(
+        "--alias", default=SHARED_ALIAS, help=f"Alias of the index to rebuild: {SHARED_ALIAS} or a dedicated tenant's alias"
+    )
+    _ = reindex_parser.add_argument("--model", default=DEFAULT_EMBEDDING_MODEL, help="Embedding model of the new index")
+    _ = reindex_parser.add_argument(
+        "--dimension", type=int, default=DEFAULT_EMBEDDING_DIMENSION, help="Vector dimension of the new index"
+    )
+    _ = reindex_parser.add_argument("--delete-old", action="store_true", help="Drop the old index after the swap")
+    args = parser.parse_args()
+
+    # Jobs and rebuilds only send background requests; leave the rest of this process's OpenAI share to the API
+    rate_governor.background_reserve = WORKER_BACKGROUND_RESERVE
+
+    try:
+        if args.command == "reindex":
+            asyncio.run(reindex(args.alias, args.model, args.dimension, args.delete_old))
+        else:
+            asyncio.run(run(args.concurrency, args.batch_size, args.kinds))
+    except asyncio.CancelledError:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Chunker throughput on synthetic parsed documents.
+
+    cd backend && python -m benchmarks.chunker_benchmark [--mb 64] [--chunk-size 400] [--overlap 60] [--hard-page-breaks]
+
+Reports MB/s of input text on a single core; the target is at least 50 MB/s.
+"""
+import argparse
+import random
+import time
+
+from app.utils.chunker import chunk_document
+
+WORDS = (
+    "policy employee revenue quarter forecast contract renewal budget customer product "
+    "launch review security compliance onboarding pipeline migration latency storage "
+    "vendor invoice approval deadline roadmap milestone hiring benefits travel expense"
+).split()
+
+
+def make_document(target_bytes: int, seed: int = 0) -> str:
+    """Markdown-like text with headings, paragraphs, tables and page breaks."""
+    rng = random.Random(seed)
+    parts: list[str] = []
+    size = 0
+    page = 0
+    while size < target_bytes:
+        block_kind = rng.random()
+        if block_kind < 0.08:
+            part = f"{'#' * rng.randint(1, 3)} {' '.join(rng.choices(WORDS, k=4)).title()}"
+        elif block_kind < 0.15:
+            rows = [f"| {' | '.join(rng.choices(WORDS, k=4))} |" for _ in range(rng.randint(3, 40))]
+            part = "| A | B | C | D |\n|---|---|---|---|\n" + "\n".join(rows)
+        else:
+            sentences = [
+                " ".join(rng.choices(WORDS, k=rng.randint(6, 24))).capitalize() + "."
+                for _ in range(rng.randint(1, 12))
+            ]
+            part = " ".join(sentences)
+        parts.append(part)
+        size += len(part) + 2
+        if size // 3000 > page:
+            page = size // 3000
+            parts.append("\f")
+    return "\n\n".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    _ = parser.add_argument("--mb", type=int, default=64, help="Total input size")
+    _ = parser.add_argument("--doc-kb", type=int, default=256, help="Size of each document")
+    _ = parser.add_argument("--chunk-size", type=int, default=400)
+    _ = parser.add_argument("--overlap", type=int, default=60)
+    _ = parser.add_argument("--repeat", type=int, default=3)
+    _ = parser.add_argument("--hard-page-breaks", action="store_true", help="Chunk as slides")
+    args = parser.parse_args()
+
+    documents = [make_document(args.doc_kb * 1024, seed=i) for i in range(max(1, args.mb * 1024 // args.doc_kb))]
+    total_mb = sum(len(document.encode()) for document in documents) / 1e6
+
+    best = float("inf")
+    chunks = 0
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        chunks = sum(
+            len(chunk_document(f"doc-{i}", document, args.chunk_size, args.overlap, args.hard_page_breaks))
+            for i, document in enumerate(documents)
+        )
+        best = min(best, time.perf_counter() - started)
+
+    print(f"documents={len(documents)} input={total_mb:.1f}MB chunks={chunks}")
+    print(f"best of {args.repeat}: {best:.3f}s -> {total_mb / best:.1f} MB/s per core")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Cost and recall of shortened embeddings.
+
+    cd backend && python -m benchmarks.embedding_dimension_benchmark [--corpus DIR] [--dims 1536,1024,768,512,256]
+
+With `--corpus` (a directory of .txt/.md files) and OPENAI_API_KEY set, the
+files are chunked and embedded once at full size. Shortened text-embedding-3
+vectors are the leading components of the full vector, renormalized, so every
+smaller dimension is derived by truncation instead of another API call.
+Without a corpus, clustered synthetic vectors with a decaying spectrum are
+used; their recall column is only indicative.
+
+For each dimension it reports:
+  - index memory: raw float32 vectors and the OpenSearch HNSW estimate for
+    the settings of `get_vector_index_settings` (m, compression level)
+  - indexing throughput into the local backend and bulk payload per chunk
+  - exact kNN latency (p50/p95) on the local backend
+  - recall@k against the full-dimension top k
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.config.local_search_backend import LocalSearchBackend
+from app.config.opensearch_manager import OpenSearchManager
+from app.services.embedding_service import NATIVE_DIMENSIONS
+from app.utils.chunker import chunk_document
+
+MODEL = "text-embedding-3-small"
+
+# Overhead factor of the OpenSearch k-NN memory estimate
+HNSW_OVERHEAD = 1.1
+
+COMPRESSION_FACTORS = {"1x": 1, "2x": 2, "4x": 4, "8x": 8, "16x": 16, "32x": 32}
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def synthetic(n: int, queries: int, dimension: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Clustered vectors whose variance decays with the component index, like Matryoshka embeddings."""
+    rng = np.random.default_rng(seed)
+    scale = (np.arange(dimension, dtype=np.float32) + 1.0) ** -0.5
+    centers = rng.standard_normal((max(n // 100, 1), dimension), dtype=np.float32) * scale
+    assignment = rng.integers(0, centers.shape[0], size=n)
+    corpus = centers[assignment] + 0.6 * rng.standard_normal((n, dimension), dtype=np.float32) * scale
+    picked = rng.integers(0, n, size=queries)
+    probes = corpus[picked] + 0.4 * rng.standard_normal((queries, dimension), dtype=np.float32) * scale
+    return normalize(corpus), normalize(probes)
+
+
+async def embed_corpus(directory: str, queries: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Chunk and embed a directory of text files; queries are sentences sampled from the chunks."""
+    import openai
+
+    from app.services.embedding_service import EmbeddingService
+
+    texts: list[str] = []
+    for path in sorted(Path(directory).rglob("*")):
+        if path.suffix in (".txt", ".md") and path.is_file():
+            texts += [chunk.text for chunk in chunk_document(path.name, path.read_text(errors="ignore"))]
+    if not texts:
+        raise SystemExit(f"No .txt/.md files found in {directory}")
+
+    rng = random.Random(seed)
+    probes = []
+    for text in rng.sample(texts, min(queries, len(texts))):
+        sentences = [sentence.strip() for sentence in text.split(". ") if len(sentence.split()) >= 4]
+        probes.append(rng.choice(sentences) if sentences else text[:200])
+
+    embedder = EmbeddingService(openai.AsyncOpenAI(), model=MODEL)
+    print(f"Embedding {len(texts)} chunks and {len(probes)} queries with {MODEL}...")
+    corpus = np.asarray(await embedder.embed(texts), dtype=np.float32)
+    probe_vectors = np.asarray(await embedder.embed(probes), dtype=np.float32)
+    return normalize(corpus), normalize(probe_vectors)
+
+
+def hnsw_bytes(dimension: int, count: int) -> tuple[float, str]:
+    """OpenSearch estimate for the configured faiss HNSW index: 1.1 * (bytes per vector + 8 * m) per vector."""
+    field = OpenSearchManager().get_vector_index_settings(dimension)["mappings"]["properties"]["chunk_vector"]
+    m = field["method"]["parameters"]["m"]
+    compression = field.get("compression_level", "1x")
+    vector_bytes = 4 * dimension / COMPRESSION_FACTORS.get(compression, 1)
+    return HNSW_OVERHEAD * (vector_bytes + 8 * m) * count, compression
+
+
+async def measure(
+    dimension: int, corpus: np.ndarray, probes: np.ndarray, k: int, batch_size: int
+) -> tuple[dict[str, float], list[list[str]]]:
+    backend = LocalSearchBackend()
+    await backend.initialize()
+    index = f"bench-{dimension}"
+    await backend.create_index(index, dimension)
+
+    vectors = normalize(corpus[:, :dimension])
+    queries = normalize(probes[:, :dimension])
+    documents = [
+        {"id": str(i), "doc_id": f"doc-{i // 20}", "text": "", "metadata": {}, "chunk_vector": vector.tolist()}
+        for i, vector in enumerate(vectors)
+    ]
+    payload = sum(len(json.dumps(document["chunk_vector"])) for document in documents[:1000]) / min(len(documents), 1000)
+
+    started = time.perf_counter()
+    for start in range(0, len(documents), batch_size):
+        _ = await backend.index_chunks(index, documents[start:start + batch_size])
+    indexing = time.perf_counter() - started
+
+    latencies: list[float] = []
+    results: list[list[str]] = []
+    for query in queries:
+        started = time.perf_counter()
+        hits = await backend.knn_search(index, query.tolist(), k=k)
+        latencies.append(time.perf_counter() - started)
+        results.append([hit.id for hit in hits])
+    await backend.close()
+
+    latencies.sort()
+    estimate, compression = hnsw_bytes(dimension, len(documents))
+    return {
+        "raw_mb": vectors.nbytes / 1e6,
+        "hnsw_mb": estimate / 1e6,
+        "compression": compression,
+        "chunks_per_second": len(documents) / indexing,
+        "payload_kb": payload / 1024,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+    }, results
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    _ = parser.add_argument("--corpus", help="Directory of .txt/.md files to embed (needs OPENAI_API_KEY)")
+    _ = parser.add_argument("--dims", default="1536,1024,768,512,256")
+    _ = parser.add_argument("--chunks", type=int, default=20000, help="Synthetic corpus size")
+    _ = parser.add_argument("--queries", type=int, default=200)
+    _ = parser.add_argument("-k", type=int, default=10)
+    _ = parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    native = NATIVE_DIMENSIONS[MODEL]
+    dims = sorted({int(value) for value in args.dims.split(",")} | {native}, reverse=True)
+    if args.corpus:
+        if not os.getenv("OPENAI_API_KEY"):
+            raise SystemExit("--corpus needs OPENAI_API_KEY")
+        corpus, probes = await embed_corpus(args.corpus, args.queries)
+        source = args.corpus
+    else:
+        corpus, probes = synthetic(args.chunks, args.queries, native)
+        source = "synthetic (recall is indicative only)"
+    print(f"corpus={source} chunks={corpus.shape[0]} queries={probes.shape[0]} k={args.k}")
+
+    baseline: list[list[str]] | None = None
+    rows: list[tuple[int, dict[str, float], float]] = []
+    for dimension in dims:
+        stats, results = await measure(dimension, corpus, probes, args.k, args.batch_size)
+        if baseline is None:
+            baseline = results
+        recall = float(np.mean([len(set(got) & set(want)) / len(want) for got, want in zip(results, baseline) if want]))
+        rows.append((dimension, stats, recall))
+
+    full = rows[0][1]
+    print(
+        f"{'dim':>5} {'raw MB':>8} {'hnsw MB':>8} {'chunks/s':>9} {'bulk KB':>8} "
+        f"{'p50 ms':>7} {'p95 ms':>7} {'recall@' + str(args.k):>10}"
+    )
+    for dimension, stats, recall in rows:
+        print(
+            f"{dimension:>5} {stats['raw_mb']:>8.1f} {stats['hnsw_mb']:>8.1f} {stats['chunks_per_second']:>9.0f} "
+            f"{stats['payload_kb']:>8.1f} {stats['p50_ms']:>7.2f} {stats['p95_ms']:>7.2f} {recall:>10.3f}"
+        )
+    print(f"hnsw estimate uses compression_level={full['compression']} from get_vector_index_settings")
+    for dimension, stats, recall in rows[1:]:
+        print(
+            f"{dimension}d vs {dims[0]}d: memory -{1 - stats['raw_mb'] / full['raw_mb']:.0%} raw / "
+            f"-{1 - stats['hnsw_mb'] / full['hnsw_mb']:.0%} hnsw, "
+            f"indexing x{stats['chunks_per_second'] / full['chunks_per_second']:.2f}, "
+            f"p50 x{full['p50_ms'] / stats['p50_ms']:.2f} faster, recall {recall:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+"""
+Cost of a log call on the calling thread, for the JSON log pipeline.
+
+    cd backend && python -m benchmarks.logging_benchmark [--records 50000]
+
+Compares the previous path (Pydantic schema per record, written
+synchronously) with the plain-dict formatter written synchronously,
+the queued handler with its background writer, and the queued handler
+sampling a repeated message. Also times a disabled debug call with an
+f-string against %-style arguments. Output goes to /dev/null so only
+the logging cost is measured.
+"""
+import argparse
+import logging
+import os
+import time
+
+from app.config.logger import (
+    LEVEL_TO_NAME,
+    BaseJsonLogSchema,
+    JSONLogFormatter,
+    LogWriter,
+    QueueLogHandler,
+    SamplingFilter,
+    host_name,
+)
+
+
+class PydanticJSONLogFormatter(JSONLogFormatter):
+    """The formatter as it was: a validated schema per record, dumped to a dict."""
+
+    @staticmethod
+    def _format_log_object(record: logging.LogRecord) -> dict:
+        fields = BaseJsonLogSchema(
+            time=logging.Formatter().formatTime(record),
+            level=LEVEL_TO_NAME[record.levelno],
+            message=record.getMessage(),
+            source_log=record.name,
+            duration=getattr(record, "duration", None),
+            app="linq-search",
+            component="fastapi_boilerplate",
+            env="production",
+            request_id=getattr(record, "request_id", ""),
+            path=getattr(record, "path", None),
+            task_id=getattr(record, "task_id", ""),
+            host_name=host_name,
+        )
+        return fields.model_dump(exclude_unset=True, by_alias=True)
+
+
+def make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"benchmark.{name.replace(' ', '_')}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def run(logger: logging.Logger, records: int, repeated: bool) -> float:
+    """Seconds per call on the calling thread."""
+    started = time.perf_counter()
+    for i in range(records):
+        if repeated:
+            logger.warning("Shed %s %s with %d (%s lane saturated)", "GET", "/rms/search", 429, "search")
+        else:
+            logger.info("Indexed %s as %d chunks", f"doc-{i}", i % 40)
+    return (time.perf_counter() - started) / records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    _ = parser.add_argument("--records", type=int, default=50000)
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+
+    def synchronous(formatter: logging.Formatter) -> tuple[logging.Handler, LogWriter | None]:
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(formatter)
+        return handler, None
+
+    def queued(sample: bool) -> tuple[logging.Handler, LogWriter | None]:
+        writer = LogWriter(JSONLogFormatter(), devnull, size=args.records * 2)
+        handler = QueueLogHandler(writer)
+        if sample:
+            handler.addFilter(SamplingFilter())
+        return handler, writer
+
+    cases = [
+        ("pydantic, synchronous", lambda: synchronous(PydanticJSONLogFormatter()), False),
+        ("dict, synchronous", lambda: synchronous(JSONLogFormatter()), False),
+        ("dict, queued", lambda: queued(False), False),
+        ("repeated message, sampled", lambda: queued(True), True),
+    ]
+    print(f"{'':28s} {'caller':>12s} {'incl. write':>14s}")
+    for label, build, repeated in cases:
+        handler, writer = build()
+        started = time.perf_counter()
+        per_call = run(make_logger(label, handler), args.records, repeated)
+        # Let the writer finish before the next case so it does not compete for the GIL
+        if writer is not None:
+            writer.stop(timeout=60)
+        total = (time.perf_counter() - started) / args.records
+        print(f"{label:28s} {per_call * 1e6:7.2f} us/call {total * 1e6:7.2f} us/record")
+
+    fast, _ = synchronous(JSONLogFormatter())
+    debug = make_logger("debug", fast)
+    similarity = 0.93712
+    started = time.perf_counter()
+    for _ in range(args.records):
+        debug.debug(f"Answer cache hit (similarity={similarity:.3f})")
+    eager = (time.perf_counter() - started) / args.records
+    started = time.perf_counter()
+    for _ in range(args.records):
+        debug.debug("Answer cache hit (similarity=%.3f)", similarity)
+    lazy = (time.perf_counter() - started) / args.records
+    print(f"{'disabled debug, f-string':28s} {eager * 1e6:7.2f} us/call")
+    print(f"{'disabled debug, %-style':28s} {lazy * 1e6:7.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Cost of the Prometheus instrumentation on hot paths.
+
+    cd backend && python -m benchmarks.metrics_overhead_benchmark [--requests 20000] [--handler-ms 2]
+
+Drives a minimal route through the ASGI stack with and without
+`MetricsMiddleware`, and times a repository-style coroutine with and
+without `timed`. Overheads are reported per call and relative to a
+handler taking `--handler-ms`, the fastest a route touching Postgres
+gets; the target is under 1%.
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from app.config.metrics import REPOSITORY_LATENCY, MetricsMiddleware, timed
+
+
+def make_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/rms/items/{item_id}")
+    async def get_item(item_id: str) -> dict[str, str]:
+        return {"id": item_id}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def drive(app: FastAPI, requests: int) -> float:
+    """Seconds per request, calling the ASGI app directly so no network time is included."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/rms/items/42",
+        "raw_path": b"/rms/items/42",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("bench", 80),
+        "client": ("bench", 1),
+    }
+
+    async def receive() -> dict[str, object]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, object]) -> None:
+        pass
+
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+async def call(func, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        await func()
+    return (time.perf_counter() - started) / calls
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    _ = parser.add_argument("--requests", type=int, default=20000)
+    _ = parser.add_argument("--calls", type=int, default=200000)
+    _ = parser.add_argument("--handler-ms", type=float, default=2.0)
+    _ = parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    async def find_by_id() -> None:
+        pass
+
+    timed_find = timed(REPOSITORY_LATENCY.labels("BenchRepository", "find_by_id"))(find_by_id)
+    plain_app, metered_app = make_app(False), make_app(True)
+
+    request_overhead = repository_overhead = float("inf")
+    for _ in range(args.repeat):
+        plain = await drive(plain_app, args.requests)
+        metered = await drive(metered_app, args.requests)
+        request_overhead = min(request_overhead, metered - plain)
+        bare = await call(find_by_id, args.calls)
+        wrapped = await call(timed_find, args.calls)
+        repository_overhead = min(repository_overhead, wrapped - bare)
+
+    handler = args.handler_ms / 1000
+    print(f"request middleware:  {request_overhead * 1e6:6.2f} us/request  ({request_overhead / handler:.3%} of {args.handler_ms} ms)")
+    print(f"repository timing:   {repository_overhead * 1e6:6.2f} us/call     ({repository_overhead / handler:.3%} of {args.handler_ms} ms)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
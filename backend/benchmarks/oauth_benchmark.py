@@ -0,0 +1,161 @@
+"""
+Google sign-in flow against a local fake OAuth server.
+
+    cd backend && python -m benchmarks.oauth_benchmark [--flows 200] [--concurrency 10] [--latency-ms 30] [--tls]
+
+Each flow is a code exchange followed by the userinfo and Drive checks.
+The previous client (a new aiohttp session per call, checks one after
+the other) is compared with `OAuthService` on a pooled httpx client
+(kept-alive connections, checks concurrent). The fake server answers
+every endpoint after `--latency-ms`; with `--tls` it uses a throwaway
+self-signed certificate so new connections pay for a handshake as they
+do against Google.
+"""
+import argparse
+import asyncio
+import datetime
+import logging
+import ssl
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+import httpx
+from aiohttp import web
+
+from app.config.http_client import ObservedTransport
+from app.services import oauth_service
+from app.services.oauth_service import OAuthService
+
+
+def make_app(latency: float) -> web.Application:
+    async def token(_: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.json_response({"access_token": "access", "refresh_token": "refresh", "expires_in": 3600})
+
+    async def userinfo(_: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.json_response({"email": "user@example.com"})
+
+    async def drive(_: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.json_response({"user": {"displayName": "User"}})
+
+    app = web.Application()
+    _ = app.router.add_post("/token", token)
+    _ = app.router.add_get("/userinfo", userinfo)
+    _ = app.router.add_get("/drive", drive)
+    return app
+
+
+def self_signed(directory: Path) -> tuple[ssl.SSLContext, ssl.SSLContext]:
+    """Server and client contexts for a localhost certificate."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = directory / "cert.pem", directory / "key.pem"
+    _ = cert_path.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    _ = key_path.write_bytes(
+        key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    )
+    server = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server.load_cert_chain(cert_path, key_path)
+    client = ssl.create_default_context(cafile=str(cert_path))
+    return server, client
+
+
+async def legacy_flow(base: str, client_ssl: ssl.SSLContext | bool) -> None:
+    """The previous client: a session per call, userinfo then Drive."""
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f"{base}/token", data={"code": "code"}, ssl=client_ssl) as response:
+            tokens = await response.json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base}/userinfo", headers=headers, ssl=client_ssl) as response:
+            _ = await response.json()
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base}/drive", headers=headers, ssl=client_ssl) as response:
+            _ = response.status
+
+
+async def run(flow, flows: int, concurrency: int) -> tuple[list[float], float]:
+    """Per-flow latencies and total seconds for `flows` flows, `concurrency` at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await flow()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    _ = await asyncio.gather(*(one() for _ in range(flows)))
+    return latencies, time.perf_counter() - started
+
+
+def report(label: str, latencies: list[float], total: float) -> None:
+    latencies.sort()
+    print(
+        f"{label:32s} p50 {statistics.median(latencies) * 1000:6.1f} ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:6.1f} ms  {len(latencies) / total:7.1f} flows/s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    _ = parser.add_argument("--flows", type=int, default=200)
+    _ = parser.add_argument("--concurrency", type=int, default=10)
+    _ = parser.add_argument("--latency-ms", type=float, default=30.0)
+    _ = parser.add_argument("--tls", action="store_true")
+    args = parser.parse_args()
+    # One line per call otherwise
+    for name in (oauth_service.__name__, "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        server_ssl, client_ssl = self_signed(Path(directory)) if args.tls else (None, None)
+        runner = web.AppRunner(make_app(args.latency_ms / 1000), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "localhost", 0, ssl_context=server_ssl)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # pyright: ignore
+        base = f"{'https' if args.tls else 'http'}://localhost:{port}"
+
+        oauth_service.GOOGLE_TOKEN_URL = f"{base}/token"
+        oauth_service.GOOGLE_USERINFO_URL = f"{base}/userinfo"
+        oauth_service.GOOGLE_DRIVE_ABOUT_URL = f"{base}/drive"
+
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=100, keepalive_expiry=60)
+        transport = ObservedTransport(limits=limits, verify=client_ssl or True)
+        async with httpx.AsyncClient(limits=limits, transport=transport) as http_client:
+            service = OAuthService(http_client)
+            try:
+                latencies, total = await run(lambda: legacy_flow(base, client_ssl or False), args.flows, args.concurrency)
+                report("session per call, sequential", latencies, total)
+                latencies, total = await run(lambda: service._exchange_google_auth_code("code"), args.flows, args.concurrency)
+                report("pooled client, concurrent", latencies, total)
+            finally:
+                await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+Cold import time of the API and the cost of creating loggers.
+
+    cd backend && python -m benchmarks.startup_benchmark [--runs 5] [--top 12]
+
+Imports `app.main` in fresh interpreters and reports the median wall
+time, the slowest top-level packages from `-X importtime`, and which
+heavy optional modules were loaded without being used (with
+ENV=development the console handler needs loguru). Then times
+`create_logger`, which every module calls at import.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("openai", "opensearchpy", "loguru", "stackprinter")
+
+PROBE = f"""
+import sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print("elapsed=" + str(elapsed))
+print("loaded=" + ",".join(name for name in {HEAVY_MODULES!r} if name in sys.modules))
+"""
+
+
+def import_once(importtime: bool) -> tuple[float, list[str], str]:
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", PROBE]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    # Startup logs may be on stdout too
+    fields = dict(line.split("=", 1) for line in result.stdout.splitlines() if line.startswith(("elapsed=", "loaded=")))
+    return float(fields["elapsed"]), [name for name in fields["loaded"].split(",") if name], result.stderr
+
+
+def slowest_packages(importtime_output: str, top: int) -> list[tuple[str, int]]:
+    """Cumulative microseconds of each third-party top-level package, including what it imports."""
+    totals: dict[str, int] = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        if "." in name or name == "app":
+            continue
+        totals[name] = max(totals.get(name, 0), int(cumulative))
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    _ = parser.add_argument("--runs", type=int, default=5)
+    _ = parser.add_argument("--top", type=int, default=12)
+    _ = parser.add_argument("--loggers", type=int, default=200)
+    args = parser.parse_args()
+
+    timings = []
+    loaded: list[str] = []
+    for _ in range(args.runs):
+        elapsed, loaded, _ = import_once(importtime=False)
+        timings.append(elapsed)
+    print(f"import app.main: median {statistics.median(timings) * 1000:.0f} ms over {args.runs} runs")
+    print(f"heavy modules loaded at import: {', '.join(loaded) or 'none'}")
+
+    _, _, importtime_output = import_once(importtime=True)
+    print("slowest packages (cumulative ms):")
+    for package, micros in slowest_packages(importtime_output, args.top):
+        print(f"  {package:28s} {micros / 1000:8.1f}")
+
+    from app.config.logger import create_logger
+
+    started = time.perf_counter()
+    _ = create_logger("benchmark.startup")
+    first = time.perf_counter() - started
+    started = time.perf_counter()
+    for i in range(args.loggers):
+        _ = create_logger(f"benchmark.startup.{i}")
+    per_call = (time.perf_counter() - started) / args.loggers
+    print(f"create_logger: first call {first * 1000:.1f} ms, then {per_call * 1e6:.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import asyncio
+
+from app.config.admission_control import AdmissionController
+
+
+def test_thousand_status_streams_are_admitted():
+    async def scenario() -> None:
+        controller = AdmissionController()
+        lane = controller.lanes["stream"]
+        waits = await asyncio.gather(*(controller.acquire(lane) for _ in range(1000)))
+
+        assert waits == [0.0] * 1000
+        assert lane.in_flight == 1000
+        assert lane.rejected_queue_full == 0
+        # Streams hold no database session, so they leave the pooled lanes untouched
+        assert controller.pooled_in_flight == 0
+        assert controller._can_enter(controller.lanes["default"])
+
+        for _ in range(1000):
+            controller.release(lane, 0.0)
+        assert lane.in_flight == 0
+
+    asyncio.run(scenario())
@@ -5,7 +5,9 @@ import API, { responseWrapper, rmsPath } from './config'
 import type {
   BrowseParams,
   BrowseResponse,
+  SuggestResponse,
   UserConnectors,
+  Workspace,
 } from '@/types/rms.type'
 
 // Get connector information
@@ -21,6 +23,15 @@ export const healthCheck = async (): Promise<{ status: string }> => {
   return responseWrapper(() => API.get(`${rmsPath}/health`))
 }
 
+// Filename suggestions for search-as-you-type (responses are browser-cacheable)
+export const getSuggestions = async (params: {
+  q: string
+  workspace: Workspace
+  limit?: number
+}): Promise<SuggestResponse> => {
+  return responseWrapper(() => API.get(`${rmsPath}/suggest`, { params }), false)
+}
+
 // Note: Browse files is primarily a POST operation in the existing API
 // This provides a GET wrapper for simple cases, but the main browse
 // functionality should use the POST method from mutate.ts
@@ -0,0 +1,55 @@
+// Server-Sent Events over fetch - EventSource cannot send a POST body
+
+import { rmsPath } from './config'
+import type { ChatRequest, ChatStreamEvent } from '@/types/rms.type'
+
+const parseEvent = (raw: string): ChatStreamEvent | null => {
+  let event = 'message'
+  const data: string[] = []
+  for (const line of raw.split('\n')) {
+    if (line.startsWith('event:')) event = line.slice(6).trim()
+    else if (line.startsWith('data:')) data.push(line.slice(5).trimStart())
+  }
+  // Comment-only blocks are keep-alives
+  if (data.length === 0) return null
+  return { event, data: JSON.parse(data.join('\n')) } as ChatStreamEvent
+}
+
+export async function* streamChat(
+  request: ChatRequest,
+  signal?: AbortSignal
+): AsyncGenerator<ChatStreamEvent> {
+  const res = await fetch(`${process.env.BACKEND_API_URL}${rmsPath}/chat`, {
+    method: 'POST',
+    headers: {
+      Accept: 'text/event-stream',
+      'Content-Type': 'application/json',
+    },
+    credentials: 'include',
+    body: JSON.stringify(request),
+    signal,
+  })
+  if (!res.ok || !res.body) {
+    throw new Error(`Chat request failed: ${res.status}`)
+  }
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader()
+  let buffer = ''
+  try {
+    while (true) {
+      const { value, done } = await reader.read()
+      if (done) break
+      buffer += value
+
+      let boundary = buffer.indexOf('\n\n')
+      while (boundary !== -1) {
+        const parsed = parseEvent(buffer.slice(0, boundary))
+        buffer = buffer.slice(boundary + 2)
+        if (parsed) yield parsed
+        boundary = buffer.indexOf('\n\n')
+      }
+    }
+  } finally {
+    reader.releaseLock()
+  }
+}
@@ -0,0 +1,139 @@
+import React, { useState } from 'react'
+
+import { useChatSelectedFiles, useWorkspace } from '@/store/fileStore'
+import { useChatStream } from '@/hooks/useChatStream'
+
+const ChatPanel: React.FC = () => {
+  const [inputText, setInputText] = useState('')
+  const workspace = useWorkspace()
+  const chatSelectedFiles = useChatSelectedFiles()
+  const { turns, isStreaming, send, stop, reset } = useChatStream()
+
+  const canSend = inputText.trim().length > 0 && !isStreaming
+
+  const handleSubmit = (e?: React.FormEvent) => {
+    e?.preventDefault()
+    if (!canSend) return
+    send({
+      message: inputText.trim(),
+      workspace,
+      doc_ids: chatSelectedFiles.length > 0 ? chatSelectedFiles.map((file) => file.id) : undefined,
+    })
+    setInputText('')
+  }
+
+  const handleKeyDown = (e: React.KeyboardEvent<HTMLTextAreaElement>) => {
+    if (e.key === 'Enter' && !e.shiftKey && !e.nativeEvent.isComposing) {
+      e.preventDefault()
+      handleSubmit()
+    }
+  }
+
+  return (
+    <div className="w-full inline-flex flex-col items-start rounded-xl lg:min-h-14">
+      {/* Conversation */}
+      {turns.length > 0 && (
+        <div className="w-full mb-4 space-y-6">
+          {turns.map((turn, i) => (
+            <div key={i} className="space-y-2">
+              <div className="text-[15px] font-medium text-gray-900">{turn.question}</div>
+
+              {turn.citations.length > 0 && (
+                <div className="flex flex-wrap gap-2">
+                  {turn.citations.map((citation) => (
+                    <a
+                      key={citation.chunk_id}
+                      href={citation.url}
+                      target="_blank"
+                      rel="noreferrer"
+                      title={citation.snippet}
+                      className="px-2 py-1 text-xs bg-gray-100 text-gray-700 rounded-md hover:bg-gray-200 max-w-[220px] truncate"
+                    >
+                      [{citation.index}] {citation.name || citation.doc_id}
+                    </a>
+                  ))}
+                </div>
+              )}
+
+              <div className="text-[15px] text-gray-800 whitespace-pre-wrap">
+                {turn.answer}
+                {isStreaming && i === turns.length - 1 && !turn.error && (
+                  <span className="inline-block w-2 h-4 ml-0.5 align-middle bg-gray-400 animate-pulse" />
+                )}
+              </div>
+
+              {turn.error && <div className="text-sm text-red-600">{turn.error}</div>}
+            </div>
+          ))}
+        </div>
+      )}
+
+      <form onSubmit={handleSubmit} className="w-full lg:min-h-12 group select-none">
+        <div className="relative bg-white border border-gray-300 rounded-lg px-4 pt-4 pb-3 lg:min-h-[56px]">
+          {/* Main textarea area */}
+          <div>
+            <textarea
+              value={inputText}
+              onChange={(e) => setInputText(e.target.value)}
+              onKeyDown={handleKeyDown}
+              placeholder="Ask about your files..."
+              className="pl-3 pr-20 m-0 w-full resize-none bg-transparent py-[10px] text-[15px] placeholder:text-gray-500 outline-none lg:leading-[19px] lg:px-0 lg:py-0"
+              rows={2}
+            />
+          </div>
+
+          {/* Bottom action bar */}
+          <div className="flex items-center justify-between gap-3 mt-2">
+            <div className="flex-1 select-none text-xs text-gray-500">
+              {chatSelectedFiles.length > 0
+                ? `Searching ${chatSelectedFiles.length} selected file${chatSelectedFiles.length > 1 ? 's' : ''}`
+                : `Searching all ${workspace} files`}
+            </div>
+
+            <div className="flex flex-row gap-4">
+              {turns.length > 0 && (
+                <button
+                  type="button"
+                  onClick={reset}
+                  className="px-3 py-1.5 text-sm bg-gray-100 text-gray-700 rounded-md hover:bg-gray-200"
+                >
+                  New chat
+                </button>
+              )}
+              {isStreaming ? (
+                <button
+                  type="button"
+                  onClick={stop}
+                  className="rounded-full p-1.5 w-8 h-8 bg-gray-800 hover:bg-gray-700"
+                  aria-label="Stop"
+                >
+                  <span className="block mx-auto w-3 h-3 bg-white rounded-sm" />
+                </button>
+              ) : (
+                <button
+                  type="submit"
+                  disabled={!canSend}
+                  className={`rounded-full p-1.5 w-8 h-8 ${
+                    canSend ? 'bg-gray-800 hover:bg-gray-700' : 'bg-gray-200 cursor-not-allowed'
+                  }`}
+                  aria-label="Send"
+                >
+                  <svg
+                    className={`mx-auto ${canSend ? 'fill-white' : 'fill-gray-400'}`}
+                    height={18}
+                    width={18}
+                    viewBox="0 0 24 24"
+                  >
+                    <path d="M2.01 21L23 12 2.01 3 2 10l15 2-15 2z" />
+                  </svg>
+                </button>
+              )}
+            </div>
+          </div>
+        </div>
+      </form>
+    </div>
+  )
+}
+
+export default ChatPanel
@@ -8,6 +8,7 @@ import SearchBar from '@/components/SearchBar'
 
 import { Workspace, FileInfo, BreadcrumbItem } from '@/types/rms.type'
 import { useRmsFiles } from '@/hooks/useRmsFiles'
+import { useStatusStream } from '@/hooks/useStatusStream'
 import { useFileStore } from '@/store/fileStore'
 
 const Dashboard: React.FC = () => {
@@ -41,6 +42,9 @@ const Dashboard: React.FC = () => {
   // Store actions
   const { setActiveTab, setCurrentFolderId, setBreadcrumbs, setSearchText } = useFileStore(state => state.actions)
 
+  // Live file status for the listed workspace
+  useStatusStream(currentWorkspace)
+
   // Selection state
   const [selectedItemsMap, setSelectedItemsMap] = useState<{[key: string]: {
     item: FileInfo
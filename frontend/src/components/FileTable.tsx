@@ -139,8 +139,11 @@ const FileRow = ({
             : item.status === 'Syncing...'
             ? 'bg-yellow-100 text-yellow-800' 
             : 'bg-red-100 text-red-800'
-        }`}>
+        }`} title={item.error ?? item.stage}>
           {item.status}
+          {(item.status === 'Syncing...' || item.status === 'Deleting...') &&
+            item.progress !== undefined &&
+            ` ${Math.round(item.progress * 100)}%`}
         </span>
       </td>
     </tr>
@@ -1,5 +1,10 @@
 import React, { useState } from 'react'
 
+import { useWorkspace } from '@/store/fileStore'
+import { useDebouncedValue } from '@/hooks/useDebouncedValue'
+import useSuggest from '@/queries/useSuggest'
+import { SuggestionItem } from '@/types/rms.type'
+
 interface SearchBarProps {
   onSearch: (query: string) => void
   placeholder?: string
@@ -10,10 +15,45 @@ const SearchBar: React.FC<SearchBarProps> = ({
   placeholder = "Search files..." 
 }) => {
   const [query, setQuery] = useState('')
+  const [showSuggestions, setShowSuggestions] = useState(false)
+  const [activeIndex, setActiveIndex] = useState(-1)
+
+  const workspace = useWorkspace()
+  const debouncedQuery = useDebouncedValue(query)
+  const { data: suggestData } = useSuggest(workspace, debouncedQuery)
+  const suggestions = query.trim() ? suggestData?.items ?? [] : []
+
+  const submit = (value: string) => {
+    setShowSuggestions(false)
+    setActiveIndex(-1)
+    onSearch(value)
+  }
 
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault()
-    onSearch(query)
+    submit(query)
+  }
+
+  const handleSelect = (suggestion: SuggestionItem) => {
+    setQuery(suggestion.name)
+    submit(suggestion.name)
+  }
+
+  const handleKeyDown = (e: React.KeyboardEvent<HTMLInputElement>) => {
+    if (!showSuggestions || suggestions.length === 0) return
+
+    if (e.key === 'ArrowDown') {
+      e.preventDefault()
+      setActiveIndex((index) => (index + 1) % suggestions.length)
+    } else if (e.key === 'ArrowUp') {
+      e.preventDefault()
+      setActiveIndex((index) => (index <= 0 ? suggestions.length - 1 : index - 1))
+    } else if (e.key === 'Enter' && activeIndex >= 0) {
+      e.preventDefault()
+      handleSelect(suggestions[activeIndex])
+    } else if (e.key === 'Escape') {
+      setShowSuggestions(false)
+    }
   }
 
   return (
@@ -22,8 +62,16 @@ const SearchBar: React.FC<SearchBarProps> = ({
         <input
           type="text"
           value={query}
-          onChange={(e) => setQuery(e.target.value)}
+          onChange={(e) => {
+            setQuery(e.target.value)
+            setShowSuggestions(true)
+            setActiveIndex(-1)
+          }}
+          onKeyDown={handleKeyDown}
+          onFocus={() => setShowSuggestions(true)}
+          onBlur={() => setShowSuggestions(false)}
           placeholder={placeholder}
+          autoComplete="off"
           className="w-full px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
         />
         <button
@@ -32,9 +80,31 @@ const SearchBar: React.FC<SearchBarProps> = ({
         >
           Search
         </button>
+
+        {/* Suggestions dropdown */}
+        {showSuggestions && suggestions.length > 0 && (
+          <ul className="absolute z-10 mt-1 w-full bg-white border border-gray-200 rounded-lg shadow-lg overflow-hidden">
+            {suggestions.map((suggestion, index) => (
+              <li
+                key={suggestion.id}
+                // Prevent the input blur from closing the list before the click lands
+                onMouseDown={(e) => e.preventDefault()}
+                onClick={() => handleSelect(suggestion)}
+                className={`px-4 py-2 text-sm cursor-pointer ${
+                  index === activeIndex ? 'bg-blue-50 text-blue-700' : 'text-gray-700 hover:bg-gray-50'
+                }`}
+              >
+                <span className="block truncate">{suggestion.name}</span>
+                {suggestion.title && suggestion.title !== suggestion.name && (
+                  <span className="block truncate text-xs text-gray-400">{suggestion.title}</span>
+                )}
+              </li>
+            ))}
+          </ul>
+        )}
       </div>
     </form>
   )
 }
 
-export default SearchBar
\ No newline at end of file
+export default SearchBar
@@ -0,0 +1,79 @@
+// Chat stream hook - accumulates streamed tokens and citations for one answer at a time
+
+import { useCallback, useEffect, useRef, useState } from 'react'
+
+import { streamChat } from '@/api/stream'
+import type { ChatCitation, ChatRequest } from '@/types/rms.type'
+
+export interface ChatTurn {
+  question: string
+  answer: string
+  citations: ChatCitation[]
+  error?: string
+}
+
+export const useChatStream = () => {
+  const [turns, setTurns] = useState<ChatTurn[]>([])
+  const [isStreaming, setIsStreaming] = useState(false)
+  const [conversationId, setConversationId] = useState<string | undefined>()
+  const controllerRef = useRef<AbortController | null>(null)
+
+  const updateLast = (update: (turn: ChatTurn) => ChatTurn) =>
+    setTurns((prev) => [...prev.slice(0, -1), update(prev[prev.length - 1])])
+
+  const stop = useCallback(() => {
+    controllerRef.current?.abort()
+    controllerRef.current = null
+    setIsStreaming(false)
+  }, [])
+
+  const send = useCallback(
+    async (request: ChatRequest) => {
+      stop()
+      const controller = new AbortController()
+      controllerRef.current = controller
+
+      setTurns((prev) => [...prev, { question: request.message, answer: '', citations: [] }])
+      setIsStreaming(true)
+      try {
+        const stream = streamChat({ ...request, conversation_id: conversationId }, controller.signal)
+        for await (const message of stream) {
+          if (message.event === 'conversation') {
+            setConversationId(message.data.id)
+          } else if (message.event === 'citations') {
+            updateLast((turn) => ({ ...turn, citations: message.data }))
+          } else if (message.event === 'token') {
+            updateLast((turn) => ({ ...turn, answer: turn.answer + message.data.text }))
+          } else if (message.event === 'error') {
+            updateLast((turn) => ({ ...turn, error: message.data.message }))
+          } else if (message.event === 'done') {
+            // The server may keep the stream open to compact history
+            setIsStreaming(false)
+          }
+        }
+      } catch (error) {
+        if (!controller.signal.aborted) {
+          console.error('Chat stream failed:', error)
+          updateLast((turn) => ({ ...turn, error: 'Failed to generate an answer.' }))
+        }
+      } finally {
+        if (controllerRef.current === controller) {
+          controllerRef.current = null
+          setIsStreaming(false)
+        }
+      }
+    },
+    [stop, conversationId]
+  )
+
+  const reset = useCallback(() => {
+    stop()
+    setTurns([])
+    setConversationId(undefined)
+  }, [stop])
+
+  // Abort the request when the component unmounts
+  useEffect(() => stop, [stop])
+
+  return { turns, isStreaming, conversationId, send, stop, reset }
+}
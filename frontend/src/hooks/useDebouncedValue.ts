@@ -0,0 +1,14 @@
+// Debounced value hook - delays fast-changing input such as keystrokes
+
+import { useEffect, useState } from 'react'
+
+export const useDebouncedValue = <T>(value: T, delay = 150): T => {
+  const [debounced, setDebounced] = useState(value)
+
+  useEffect(() => {
+    const timer = setTimeout(() => setDebounced(value), delay)
+    return () => clearTimeout(timer)
+  }, [value, delay])
+
+  return debounced
+}
@@ -0,0 +1,70 @@
+// Status stream hook - patches cached listings with live file status from the backend
+
+import { useQueryClient } from '@tanstack/react-query'
+import { useEffect } from 'react'
+
+import { rmsPath } from '@/api/config'
+import { FileInfo, StatusUpdate, Workspace } from '@/types/rms.type'
+
+export const useStatusStream = (workspace: Workspace) => {
+  const queryClient = useQueryClient()
+
+  useEffect(() => {
+    // Every browse query of the workspace, whatever page, folder or filter
+    const browseKey = ['rms_mvp', 'browse', workspace]
+    let source: EventSource | null = null
+    let connectedBefore = false
+
+    const applyUpdates = (updates: StatusUpdate[]) => {
+      const byId = new Map(updates.map((update) => [update.id, update]))
+      queryClient.setQueriesData({ queryKey: browseKey }, (old: any) => {
+        if (!old?.items?.some((item: FileInfo) => byId.has(item.id))) return old
+        const items = old.items
+          .filter((item: FileInfo) => !byId.get(item.id)?.deleted)
+          .map((item: FileInfo) => {
+            const update = byId.get(item.id)
+            return update?.status
+              ? { ...item, status: update.status, stage: update.stage, progress: update.progress, error: update.error }
+              : item
+          })
+        return { ...old, items, total: old.total - (old.items.length - items.length) }
+      })
+    }
+
+    const open = () => {
+      source = new EventSource(
+        `${process.env.BACKEND_API_URL}${rmsPath}/status/stream?workspace=${workspace}`,
+        { withCredentials: true }
+      )
+      source.onopen = () => {
+        // Events sent while disconnected are lost; refetch instead
+        if (connectedBefore) queryClient.invalidateQueries({ queryKey: browseKey })
+        connectedBefore = true
+      }
+      source.addEventListener('status', (event) => {
+        applyUpdates([JSON.parse((event as MessageEvent).data)])
+      })
+      source.addEventListener('resync', () => {
+        queryClient.invalidateQueries({ queryKey: browseKey })
+      })
+    }
+
+    const close = () => {
+      source?.close()
+      source = null
+    }
+
+    // Hidden tabs give their connection back; the listing is refetched when they return
+    const onVisibilityChange = () => {
+      if (document.hidden) close()
+      else if (!source) open()
+    }
+
+    if (!document.hidden) open()
+    document.addEventListener('visibilitychange', onVisibilityChange)
+    return () => {
+      document.removeEventListener('visibilitychange', onVisibilityChange)
+      close()
+    }
+  }, [workspace, queryClient])
+}
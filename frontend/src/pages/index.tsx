@@ -3,7 +3,7 @@ import { QueryClient, QueryClientProvider } from '@tanstack/react-query'
 import { GoogleOAuthProvider } from '@react-oauth/google'
 
 import Dashboard from '@/components/Dashboard'
-import ChatPlaceholder from '@/components/ChatPlaceholder'
+import ChatPanel from '@/components/ChatPanel'
 
 // Create a query client for React Query
 const queryClient = new QueryClient({
@@ -28,7 +28,7 @@ const RmsMvpLanding: React.FC = () => {
 
       {/* Chat Section */}
       <div className="mt-6 w-full max-w-4xl">
-        <ChatPlaceholder />
+        <ChatPanel />
       </div>
 
       {/* Dashboard Section */}
@@ -32,6 +32,11 @@ export default {
     return ['rms_mvp', 'connectors', scope] as const
   },
   
+  // Suggestion query key - normalized so "Rep" and "rep " share a cache entry
+  suggest: (workspace: string, q: string) => {
+    return ['rms_mvp', 'suggest', workspace, q.trim().toLowerCase()] as const
+  },
+
   // Document query key
   document: (documentId: string, workspace: string, source: string) => {
     return ['rms_mvp', 'document', documentId, workspace, source] as const
@@ -0,0 +1,21 @@
+// Filename suggestion query hook - search-as-you-type
+
+import { keepPreviousData, useQuery } from '@tanstack/react-query'
+
+import QueryKeyGenerator from './QueryKeyGenerator'
+import { getSuggestions } from '@/api/query'
+import { SuggestResponse, Workspace } from '@/types/rms.type'
+
+function useSuggest(workspace: Workspace, q: string, limit = 8) {
+  return useQuery<SuggestResponse>({
+    queryKey: QueryKeyGenerator.suggest(workspace, q),
+    queryFn: () => getSuggestions({ q: q.trim(), workspace, limit }),
+    enabled: q.trim().length > 0,
+    placeholderData: keepPreviousData, // avoid flicker between keystrokes
+    staleTime: 30 * 1000, // matches the endpoint's Cache-Control max-age
+    refetchOnWindowFocus: false,
+    refetchOnReconnect: false,
+  })
+}
+
+export default useSuggest
@@ -64,6 +64,10 @@ export interface FileInfo {
   
   // Error information
   error?: string
+
+  // Live sync progress from the status stream
+  stage?: StatusUpdate['stage']
+  progress?: number
 }
 
 // Breadcrumb navigation
@@ -143,6 +147,17 @@ export interface BrowseResponse {
   connector?: UserConnectors
 }
 
+export interface SuggestionItem {
+  id: string
+  name: string
+  title?: string
+  contentType?: ContentType | string
+}
+
+export interface SuggestResponse {
+  items: SuggestionItem[]
+}
+
 export interface OperationResult {
   id: string
   status: string
@@ -285,4 +300,40 @@ export interface FileStoreActions {
   
   // Reset actions
   resetState: (keys?: Array<keyof FileStoreState>) => void
-}
\ No newline at end of file
+}
+// Chat types
+export interface ChatCitation {
+  index: number
+  chunk_id: string
+  doc_id: string
+  name?: string
+  url?: string
+  score: number
+  snippet: string
+}
+
+export interface ChatRequest {
+  message: string
+  workspace: Workspace
+  doc_ids?: string[]
+  conversation_id?: string
+}
+
+export type ChatStreamEvent =
+  | { event: 'conversation'; data: { id: string } }
+  | { event: 'citations'; data: ChatCitation[] }
+  | { event: 'token'; data: { text: string } }
+  | { event: 'done'; data: { cached?: boolean } }
+  | { event: 'error'; data: { message: string } }
+
+// Status stream events (GET /rms/status/stream)
+export interface StatusUpdate {
+  id: string
+  workspace: Workspace
+  status?: StatusType
+  stage?: 'queued' | 'started' | 'retrying' | 'chunking' | 'embedding' | 'indexing' | 'deleting'
+  progress?: number
+  error?: string
+  // Set once the item is gone
+  deleted?: boolean
+}